@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""
+Time method classification on a generated corpus against ordering tables of growing size.
+
+The table is the builtin ordering plus this repository's custom rules, padded with rules that
+never match, so that an unmatched signature has to try every one of them. Each timing is a
+first pass over the corpus with a freshly compiled classifier: signatures are mostly unique,
+so the per-signature memo plays no part in it.
+
+Usage: python scripts/bench_classifier.py [n_methods]
+"""
+
+import re
+import sys
+import time
+from collections.abc import Callable
+
+from structlint.configuration import MethodsConfig
+from structlint.logic import compile_method_classifier
+
+CUSTOM_ORDER = {
+    "@model_validator|model_validate": 0,
+    "_pydantic_": 0.01,
+    " adapter\\(": 0.011,
+    "@field_validator": 0.1,
+    "model_serializ|model_dump": 0.00001,
+    "@field_serializer": 0.3,
+    "@cached_property": 0.041,
+    "__call__": 0.99,
+    "check_.+": 9,
+    " read[^ ]+\\(": 3.98,
+    " write[^ ]+\\(": 3.99,
+    "[^_][a-z_]+_hook$": 9,
+}
+TEMPLATES = (
+    "def __init__(self, x: int) -> None:",
+    "@property\n    def value_{i}(self) -> int:",
+    "def method_{i}(self, a: int, b: str = ':') -> None:",
+    "def _helper_{i}(self) -> None:",
+    "@classmethod\n    def from_{i}(cls, raw: dict) -> Self:",
+    "def __eq__(self, other: object) -> bool:",
+    "@staticmethod\n    def make_{i}(x: int) -> int:",
+    "def method_{i}(self) -> None:",
+)
+
+
+def make_corpus(n: int) -> list[str]:
+    """`n` signatures, mostly unique, as in real code bases; `__init__` and `__eq__` repeat."""
+    return [TEMPLATES[i % len(TEMPLATES)].format(i=i // len(TEMPLATES)) for i in range(n)]
+
+
+def make_ordering(n_rules: int) -> tuple[tuple[re.Pattern, float], ...]:
+    ordering = MethodsConfig.from_dict({"custom_order": CUSTOM_ORDER}).ordering
+    padding = tuple((re.compile(f"@never_{i}\\b"), 7.0) for i in range(n_rules - len(ordering)))
+    return padding + ordering
+
+
+def per_rule_search(ordering: tuple[tuple[re.Pattern, float], ...]) -> Callable[[str], float]:
+    """Classification as `sort_methods` did it before: `re.search` for every rule, no memo."""
+
+    def classify(s: str) -> float:
+        for regexp, value in ordering:
+            if re.search(regexp, s):
+                return value
+        return 10.0
+
+    return classify
+
+
+def timed(classify: Callable[[str], float], corpus: list[str]) -> float:
+    start = time.perf_counter()
+    for signature in corpus:
+        classify(signature)
+    return time.perf_counter() - start
+
+
+def bench(n_methods: int) -> None:
+    corpus = make_corpus(n_methods)
+    print(f"{n_methods} methods")
+    print(f"{'rules':>6}{'per-rule (s)':>15}{'alternation (s)':>18}")
+    for n_rules in (28, 56, 112, 224):
+        ordering = make_ordering(n_rules)
+        before = timed(per_rule_search(ordering), corpus)
+        compile_method_classifier.cache_clear()
+        cold = timed(compile_method_classifier(ordering, 10.0), corpus)
+        print(f"{n_rules:>6}{before:>15.3f}{cold:>18.3f}")
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
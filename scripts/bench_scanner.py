@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Compare the regex and tokenize object scanners on generated worst-case modules.
+
+Usage: python scripts/bench_scanner.py [max_size]
+"""
+
+import sys
+import timeit
+
+from structlint.collection import collect_object_texts, scan_object_texts
+
+SCANNERS = {"regex": collect_object_texts, "tokenize": scan_object_texts}
+
+
+def many_small_objects(n: int) -> str:
+    return "".join(
+        f"@decorator\ndef function_{i}(a: int, b: str = ':') -> None:\n    pass\n\n\n"
+        f"class Class_{i}(Base, metaclass=Meta):\n    x: int = {i}\n\n\n"
+        for i in range(n)
+    )
+
+
+def colon_heavy_header(n: int) -> str:
+    """A class header with `n` colons and a body without a blank-line triple after it."""
+    body = "".join(f"    def method_{i}(self) -> None:\n        pass\n\n" for i in range(n))
+    return f"class Header(Base):  # {'a: ' * n}\n{body}"
+
+
+def one_huge_class(n: int) -> str:
+    methods = "".join(
+        f"    def method_{i}(self, x: int) -> int:\n        return x + {i}\n\n" for i in range(n)
+    )
+    return f"class Huge:\n{methods}"
+
+
+def bench(max_size: int) -> None:
+    generators = (many_small_objects, colon_heavy_header, one_huge_class)
+    print(f"{'input':<22}{'size':>8}{'regex (s)':>12}{'tokenize (s)':>14}")
+    size = 100
+    while size <= max_size:
+        for generate in generators:
+            source = generate(size)
+            timings = [
+                min(timeit.repeat(lambda: scan(source), number=1, repeat=3))
+                for scan in SCANNERS.values()
+            ]
+            print(f"{generate.__name__:<22}{size:>8}{timings[0]:>12.4f}{timings[1]:>14.4f}")
+        size *= 10
+
+
+if __name__ == "__main__":
+    bench(int(sys.argv[1]) if len(sys.argv) > 1 else 1_000)
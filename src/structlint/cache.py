@@ -0,0 +1,165 @@
+"""
+Persistent on-disk caches: per-file parse results, upstream import closures and the parsed
+configuration.
+"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+from . import __version__
+
+CACHE_VERSION = 2
+DEFAULT_CACHE_DIR = ".structlint_cache"
+CACHE_FILENAME = "parse.json"
+CLOSURES_FILENAME = "closures.json"
+CONFIG_FILENAME = "config.json"
+INDEX_FILENAME = "index.json"
+SYNTAX_FILENAME = "syntax.json"
+
+
+def file_digest(path: Path) -> str:
+    with path.open("rb") as f:
+        return hashlib.file_digest(f, lambda: hashlib.blake2b(digest_size=16)).hexdigest()
+
+
+class JsonFileCache:
+    """
+    Entries kept in one JSON file under a header of the structlint and cache versions and a
+    `salt`; a file with another header, or that cannot be read, loads as empty. Without a
+    `path`, nothing is read or written.
+    """
+
+    def __init__(self, path: Path | None, salt: str = ""):
+        self.path = path
+        self.salt = salt
+        self._entries: dict[str, Any] = self._load()
+        self._dirty = False
+
+    @property
+    def header(self) -> dict[str, Any]:
+        return {"version": CACHE_VERSION, "structlint": __version__, "salt": self.salt}
+
+    def save(self) -> None:
+        if not (self.path and self._dirty):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        tmp_path.write_text(json.dumps(self.header | {"entries": self._entries}))
+        tmp_path.replace(self.path)
+        self._dirty = False
+
+    def _load(self) -> dict[str, Any]:
+        if not (self.path and self.path.exists()):
+            return {}
+        try:
+            raw = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(raw, dict) or any(raw.get(k) != v for k, v in self.header.items()):
+            return {}
+        return raw.get("entries", {})
+
+
+class ParseCache(JsonFileCache):
+    """
+    Parse results keyed by file path and validated against the file's content hash; with
+    another `filename`, any other result derived from a single file.
+
+    A file whose size and modification time are unchanged costs a single `stat`; otherwise
+    the content hash decides whether the stored result is still valid. Entries written by a
+    different structlint version, cache version or salt are discarded on load. Without a
+    `cache_dir`, entries are kept in memory only, for as long as the cache itself.
+    """
+
+    def __init__(self, cache_dir: Path | None, salt: str = "", filename: str = CACHE_FILENAME):
+        super().__init__((cache_dir / filename) if cache_dir else None, salt)
+
+    def get(self, path: Path) -> Any:
+        if (entry := self._entries.get(str(path))) is None:
+            return None
+        stat = path.stat()
+        if (entry["mtime_ns"], entry["size"]) == (stat.st_mtime_ns, stat.st_size):
+            return entry["data"]
+        if entry["digest"] != file_digest(path):
+            return None
+        entry["mtime_ns"], entry["size"] = stat.st_mtime_ns, stat.st_size
+        self._dirty = True
+        return entry["data"]
+
+    def put(self, path: Path, data: Any) -> None:
+        stat = path.stat()
+        self._entries[str(path)] = {
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "digest": file_digest(path),
+            "data": data,
+        }
+        self._dirty = True
+
+    def digest(self, path: Path) -> str | None:
+        """The content digest `path` had when its entry was last stored or validated."""
+        entry = self._entries.get(str(path))
+        return None if entry is None else entry["digest"]
+
+    def save(self) -> None:
+        if self.path and self._dirty:  # entries of deleted files are dropped
+            self._entries = {k: v for k, v in self._entries.items() if Path(k).exists()}
+        super().save()
+
+
+class ClosureCache(JsonFileCache):
+    """
+    Upstream closures of modules, each stored with the file digests of the package modules it
+    spans, itself included: while those files are unchanged, so is the closure. `digests`
+    maps every module of the package to the digest of its file, as the parse cache holds it,
+    so validating an entry compares strings and never walks the import graph.
+
+    Which module `from a import b` resolves to depends on which modules exist, so entries
+    written for another set of modules are discarded on load.
+    """
+
+    def __init__(self, cache_dir: Path | None, digests: dict[str, str]):
+        self.digests = digests
+        names = "\n".join(sorted(digests)).encode()
+        salt = hashlib.blake2b(names, digest_size=16).hexdigest()
+        super().__init__((cache_dir / CLOSURES_FILENAME) if cache_dir else None, salt)
+
+    def get(self, module: str) -> set[str] | None:
+        if (entry := self._entries.get(module)) is None:
+            return None
+        if any(self.digests.get(m) != digest for m, digest in entry["digests"].items()):
+            return None
+        return set(entry["closure"])
+
+    def put(self, module: str, closure: set[str]) -> None:
+        spanned = sorted({module, *closure} & self.digests.keys())
+        self._entries[module] = {
+            "closure": sorted(closure),
+            "digests": {m: self.digests[m] for m in spanned},
+        }
+        self._dirty = True
+
+
+class ConfigCache(JsonFileCache):
+    """
+    The parsed configuration source of the project, stored with the digest of the pyproject
+    file it was read from, so that runs with an unchanged file skip TOML parsing. Only the
+    source of the last file read is kept.
+    """
+
+    def __init__(self, cache_dir: Path | None):
+        super().__init__((cache_dir / CONFIG_FILENAME) if cache_dir else None)
+
+    def get(self, digest: str) -> dict[str, Any] | None:
+        if self._entries.get("digest") != digest:
+            return None
+        return self._entries["source"]
+
+    def put(self, digest: str, source: dict[str, Any]) -> None:
+        if self.path is None:
+            return
+        self._entries = {"digest": digest, "source": source}
+        self._dirty = True
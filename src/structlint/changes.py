@@ -0,0 +1,156 @@
+"""
+Incremental runs: the index linking source files to their test and doc files, the files a git
+diff touches, and the files whose checks they can change.
+"""
+
+import subprocess
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Self
+
+from .cache import ParseCache
+from .collection import Objects
+from .configuration import Configuration
+from .keys import ObjectKey
+from .logic import map_to_doc, map_to_test, mapper_to_docs, mapper_to_tests
+
+
+@dataclass(frozen=True)
+class AffectedFiles:
+    """
+    Source, test and doc files to check, relative to the project root, and which of them
+    changed.
+    """
+
+    sources: frozenset[str]
+    tests: frozenset[str]
+    docs: frozenset[str]
+    changed: frozenset[str] = frozenset()
+
+    @property
+    def package_changed(self) -> bool:
+        """Whether a source file changed, which may change the imports of the package."""
+        return not self.changed.isdisjoint(self.sources)
+
+
+class FileIndex:
+    """
+    Links between the source files and the test and doc files their objects map to, both ways.
+
+    The targets of the objects defined in a source file only depend on the file, so with a
+    cache they are stored per file and reused while the file is unchanged; only edited files
+    are mapped. Methods a class inherits depend on the files of its bases too, so theirs are
+    mapped again on every build.
+    """
+
+    def __init__(self, targets: dict[str, tuple[list[str], list[str]]]):
+        self.targets = targets
+        """ The test files and the doc files of each source file. """
+        self.sources_of: dict[str, set[str]] = {}
+        for source, (tests, docs) in targets.items():
+            for target in (*tests, *docs):
+                self.sources_of.setdefault(target, set()).add(source)
+
+    @classmethod
+    def build(
+        cls, cfg: Configuration, source_objects: Objects, cache: ParseCache | None = None
+    ) -> Self:
+        own_keys = source_objects.keys(include_inherited=False)
+        keys_of: dict[str, list[ObjectKey]] = {}
+        for key in own_keys:
+            keys_of.setdefault(key.path, []).append(key)
+        inherited_keys_of: dict[str, list[ObjectKey]] = {}
+        for key in set(source_objects.keys(include_inherited=True)).difference(own_keys):
+            inherited_keys_of.setdefault(key.path, []).append(key)
+        doc_keys_of: dict[str, list[ObjectKey]] = {}
+        for key in source_objects.keys_without_methods:
+            doc_keys_of.setdefault(key.path, []).append(key)
+
+        targets: dict[str, tuple[list[str], list[str]]] = {}
+        for path in sorted(keys_of.keys() | inherited_keys_of.keys() | doc_keys_of.keys()):
+            if cache and (entry := cache.get(cfg.root_dir / path)) is not None:
+                tests, docs = set(entry[0]), entry[1]
+            else:
+                tests = {t.path for k in keys_of.get(path, ()) if (t := map_to_test(k, cfg))}
+                docs = sorted({map_to_doc(k, cfg).path for k in doc_keys_of.get(path, ())})
+                if cache:
+                    cache.put(cfg.root_dir / path, [sorted(tests), docs])
+            inherited = inherited_keys_of.get(path, ())
+            tests.update(t.path for k in inherited if (t := map_to_test(k, cfg)))
+            targets[path] = (sorted(tests), docs)
+        return cls(targets)
+
+    def linked(self, path: str) -> set[str]:
+        """The test and doc files of a source file, or the source files of a test or doc file."""
+        if path in self.targets:
+            tests, docs = self.targets[path]
+            return {*tests, *docs}
+        return self.sources_of.get(path, set())
+
+
+def run_git(args: list[str], cwd: Path) -> list[str]:
+    """The NUL-separated paths git prints for `args`."""
+    result = subprocess.run(["git", *args], capture_output=True, text=True, cwd=cwd, check=False)
+    if result.returncode:
+        raise RuntimeError(f"'git {' '.join(args)}' failed: {result.stderr.strip()}")
+    return [p for p in result.stdout.split("\0") if p]
+
+
+def changed_paths(root_dir: Path, since: str | None = None, staged: bool = False) -> list[str]:
+    """
+    Paths below `root_dir`, relative to it, that changed since `since` or else `HEAD`: in the
+    index with `staged`, otherwise in the working tree, where untracked files count too.
+    Deleted files are included, and renamed files under both names.
+    """
+    diff = ["diff", "--name-only", "--relative", "--no-renames", "-z"]
+    paths = run_git(diff + ["--cached"] * staged + ([since] if since else ["HEAD"]), root_dir)
+    if not staged:
+        paths += run_git(["ls-files", "--others", "--exclude-standard", "-z"], root_dir)
+    return sorted(set(paths))
+
+
+def affected_files(cfg: Configuration, index: FileIndex, changed: Iterable[str]) -> AffectedFiles:
+    """
+    The changed source, test and doc files, with all files whose checks involve them.
+
+    The whole group of files connected to a changed file in `index` is taken: a test or doc
+    file shared by several source files is only checked against all of them. Source files
+    missing from the index, as when deleted, are linked to the files they would map to.
+    """
+
+    def is_below(p: str, directory: Path, suffix: str) -> bool:
+        return p.endswith(suffix) and Path(p).is_relative_to(directory)
+
+    changed_sources = {p for p in changed if is_below(p, cfg.module_root_dir, ".py")}
+    changed_targets = {
+        p
+        for p in changed
+        if is_below(p, cfg.tests.unit_dir, ".py") or is_below(p, cfg.docs.md_dir, ".md")
+    }
+    unindexed = {
+        p: {mapper_to_tests(cfg)(p, ""), mapper_to_docs(cfg)(p, "")}
+        for p in changed_sources - index.targets.keys()
+    }
+
+    def linked(p: str) -> set[str]:
+        if p in unindexed:
+            return unindexed[p]
+        return index.linked(p) | {s for s, targets in unindexed.items() if p in targets}
+
+    reached = changed_sources | changed_targets
+    frontier = list(reached)
+    while frontier:
+        for p in linked(frontier.pop()):
+            if p not in reached:
+                reached.add(p)
+                frontier.append(p)
+
+    sources = index.targets.keys() | changed_sources
+    targets = reached - sources
+    return AffectedFiles(
+        frozenset(reached & sources),
+        frozenset(p for p in targets if p.endswith(".py")),
+        frozenset(p for p in targets if p.endswith(".md")),
+        frozenset(changed_sources | changed_targets),
+    )
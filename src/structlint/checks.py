@@ -2,24 +2,46 @@
 Top-level functions performing each check end-to-end.
 """
 
+import sys
 from functools import partial
+from typing import TYPE_CHECKING
 
 from structlint.logic import sort_methods
 from structlint.utils import deduplicate_ordered, sort_on_path
 
-from .collection import Objects
+from .collection import Objects, collect_source_syntax
 from .configuration import Configuration, ImportsConfig
+from .footprint import (
+    compute_footprint,
+    exceeded_limits,
+    module_source_bytes,
+    package_source_bytes,
+    script_modules,
+)
+from .keys import ObjectKey
 from .logic import (
     analyze_discrepancies,
+    build_import_graph,
+    find_import_cycles,
     get_disallowed_imports,
+    load_import_graph,
     map_to_doc,
     map_to_test,
 )
 from .reporting import (
+    make_cycles_report,
     make_discrepancy_report,
+    make_footprint_report,
+    make_import_time_report,
     make_imports_report,
     make_methods_report,
 )
+from .syntax import ModuleSyntax
+
+if TYPE_CHECKING:
+    import grimp
+
+    from .cache import ClosureCache
 
 
 def check_method_order(cfg: Configuration, source_objects: Objects) -> tuple[str, bool]:
@@ -36,12 +58,12 @@ def check_method_order(cfg: Configuration, source_objects: Objects) -> tuple[str
 def check_docs_structure(
     cfg: Configuration, source_objects: Objects, docs_objects: Objects
 ) -> tuple[str, bool]:
-    actual: list[str] = sort_on_path(docs_objects.strings_without_methods)
+    actual: list[ObjectKey] = sort_on_path(docs_objects.keys_without_methods)
     duplicated = source_objects.apply(
         partial(map_to_doc, cfg=cfg), cfg.docs.ignore, classes_only=True
     )
-    expected: list[str] = sort_on_path(deduplicate_ordered(duplicated))
-    missing, unexpected, overlap = analyze_discrepancies(
+    expected: list[ObjectKey] = sort_on_path(deduplicate_ordered(duplicated))
+    missing, unexpected, overlap, moved = analyze_discrepancies(
         expected, actual, allow_additional=cfg.docs.allow_additional
     )
 
@@ -56,8 +78,9 @@ def check_docs_structure(
             cfg.docs.md_dir,
             cfg.root_dir,
             cfg.docs.order_ignore,
+            moved,
         ),
-        any((missing, unexpected)),
+        any((missing, unexpected, moved)),
     )
 
 
@@ -65,11 +88,11 @@ def check_tests_structure(
     cfg: Configuration, source_objects: Objects, tests_objects: Objects
 ) -> tuple[str, bool]:
     tests_objects = tests_objects.test_only
-    actual: list[str] = sort_on_path(tests_objects.strings(include_inherited=True))
-    expected: list[str] = sort_on_path(
+    actual: list[ObjectKey] = sort_on_path(tests_objects.keys(include_inherited=True))
+    expected: list[ObjectKey] = sort_on_path(
         source_objects.apply(partial(map_to_test, cfg=cfg), cfg.tests.ignore)
     )
-    missing, unexpected, overlap = analyze_discrepancies(
+    missing, unexpected, overlap, moved = analyze_discrepancies(
         expected, actual, allow_additional=cfg.tests.allow_additional
     )
 
@@ -84,15 +107,82 @@ def check_tests_structure(
             cfg.tests.unit_dir,
             cfg.root_dir,
             cfg.tests.order_ignore,
+            moved,
         ),
-        any((missing, unexpected)),
+        any((missing, unexpected, moved)),
     )
 
 
-def check_imports(icfg: ImportsConfig, module_name: str) -> tuple[str, bool]:
-    internal, external = get_disallowed_imports(icfg, module_name)
+def check_imports(
+    icfg: ImportsConfig,
+    module_name: str,
+    source_syntax: list[ModuleSyntax] | None = None,
+    graph: "grimp.ImportGraph | None" = None,
+    closure_cache: "ClosureCache | None" = None,
+) -> tuple[str, bool]:
+    internal, external = get_disallowed_imports(
+        icfg, module_name, source_syntax, graph, closure_cache
+    )
 
     return (
         make_imports_report(internal, external),
         any((internal, external)),
     )
+
+
+def check_cycles(
+    icfg: ImportsConfig,
+    module_name: str,
+    source_syntax: list[ModuleSyntax] | None = None,
+    graph: "grimp.ImportGraph | None" = None,
+) -> tuple[str, bool]:
+    if graph is None:
+        graph = load_import_graph(icfg, module_name, source_syntax)
+    cycles = find_import_cycles(graph, icfg.allowed_cycles)
+
+    return make_cycles_report(cycles), bool(cycles)
+
+
+def check_import_time(cfg: Configuration) -> tuple[str, bool]:
+    from .importtime import entry_modules, median_import_times  # runs subprocesses, rarely used
+
+    budgets = cfg.import_time.budgets
+    results = []
+    failures = {}
+    for module in entry_modules(cfg):
+        try:
+            results.append(
+                (module, median_import_times(module, cfg.import_time.repeat, cfg.root_dir))
+            )
+        except ImportError as e:
+            failures[module] = str(e)
+    problems = bool(failures) or any(
+        times[m] > budgets[m] for _, times in results for m in budgets if m in times
+    )
+
+    return make_import_time_report(results, budgets, failures=failures), problems
+
+
+def check_footprint(
+    cfg: Configuration, source_syntax: list[ModuleSyntax] | None = None
+) -> tuple[str, bool]:
+    if source_syntax is None:
+        source_syntax = collect_source_syntax(cfg.module_root_dir, cfg.root_dir, cfg.jobs)
+    graph = build_import_graph(source_syntax, include_external_packages=True, eager_only=True)
+    sizes = module_source_bytes(source_syntax, cfg.root_dir)
+
+    def size_of(module: str) -> int:
+        return sizes[module] if module in sizes else package_source_bytes(module)
+
+    footprints = []
+    for entry in script_modules(cfg):
+        if entry not in graph.modules:
+            print(
+                f"    '{entry}' is not a module of '{cfg.module_name}'; skipping its footprint.",
+                file=sys.stderr,
+            )
+            continue
+        footprint = compute_footprint(graph, entry, size_of)
+        footprints.append((footprint, exceeded_limits(footprint, cfg.footprint)))
+
+    return make_footprint_report(footprints), any(exceeded for _, exceeded in footprints)
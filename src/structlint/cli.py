@@ -1,38 +1,139 @@
 """
 Simple and intuitive command-line interface for structlint.
+
+Checks, and the packages they need, are imported inside the subcommands running them, so that
+`structlint version` or `structlint methods` do not pay for grimp or process pools.
 """
 
 import sys
+from typing import TYPE_CHECKING
 
 import click
 
 from . import __version__
-from .checks import (
-    check_docs_structure,
-    check_imports,
-    check_method_order,
-    check_tests_structure,
-)
-from .collection import (
-    collect_docs_objects,
-    collect_source_objects,
-)
-from .configuration import Configuration
+
+if TYPE_CHECKING:
+    from .cache import ParseCache
+    from .changes import AffectedFiles, FileIndex
+    from .collection import Objects
+    from .configuration import Configuration
+    from .workspace import Workspace
 
 
 def main():
-    problems = structlint_cli(standalone_mode=False)
+    try:
+        problems = structlint_cli(standalone_mode=False)
+    except click.ClickException as e:
+        e.show()
+        sys.exit(e.exit_code)
     sys.exit(int(problems))
 
 
-@click.group(invoke_without_command=True)
+@click.group(chain=True, invoke_without_command=True)
 @click.version_option(__version__)
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=None,
+    help="Number of processes used to parse source files (0: one per CPU).",
+)
+@click.option("--no-cache", is_flag=True, help="Neither read nor write the parse cache.")
+@click.option(
+    "--changed-since",
+    metavar="REV",
+    default=None,
+    help="Only check the files changed since the git revision REV, and the files mapped to or "
+    "from them.",
+)
+@click.option(
+    "--staged",
+    is_flag=True,
+    help="Only check the files staged for commit, and the files mapped to or from them.",
+)
 @click.pass_context
-def structlint_cli(ctx: click.Context):
-    ctx.ensure_object(dict)["CFG"] = Configuration.read()  # TODO: support passing explicit config
+def structlint_cli(
+    ctx: click.Context, jobs: int | None, no_cache: bool, changed_since: str | None, staged: bool
+):
+    ctx.ensure_object(dict).update(
+        JOBS=jobs, NO_CACHE=no_cache, CHANGED_SINCE=changed_since, STAGED=staged
+    )
 
+
+@structlint_cli.result_callback()
+@click.pass_context
+def combine_results(ctx: click.Context, results: list[bool], **_: object) -> bool:
+    """Whether any of the chained subcommands found problems; without any, all checks run."""
     if ctx.invoked_subcommand is None:
         return ctx.invoke(run_all)
+    return any(results)
+
+
+def load_workspace(ctx: click.Context) -> "Workspace":
+    """
+    The workspace of this invocation, created on first use and shared by the chained
+    subcommands, so that the configuration is read, each kind of objects collected and the
+    import graph built at most once; the parse cache is saved when the command line is done.
+
+    Run by a daemon, it is the workspace of the daemon, which saves it itself.
+    """
+    obj = ctx.ensure_object(dict)
+    if "WORKSPACE" not in obj:
+        from .workspace import Workspace
+
+        workspace = Workspace(use_cache=not obj.get("NO_CACHE"), jobs=obj.get("JOBS"))
+        ctx.find_root().call_on_close(workspace.save)
+        obj["WORKSPACE"] = workspace
+    return obj["WORKSPACE"]
+
+
+def load_context(ctx: click.Context) -> tuple["Configuration", "ParseCache"]:
+    """The configuration and parse cache of the workspace of this invocation."""
+    workspace = load_workspace(ctx)
+    return workspace.cfg, workspace.cache
+
+
+def load_affected(
+    ctx: click.Context, cfg: "Configuration", source_objects: "Objects"
+) -> "AffectedFiles | None":
+    """
+    The files to check with `--changed-since` or `--staged`, asked of git once per invocation;
+    `None` when every file is to be checked, as when `pyproject.toml` itself changed.
+    """
+    obj = ctx.ensure_object(dict)
+    if obj.get("CHANGED_SINCE") is None and not obj.get("STAGED"):
+        return None
+    if "AFFECTED" not in obj:
+        from .changes import affected_files, changed_paths
+
+        try:
+            changed = changed_paths(
+                cfg.root_dir, obj.get("CHANGED_SINCE"), obj.get("STAGED", False)
+            )
+        except (OSError, RuntimeError) as e:
+            raise click.ClickException(str(e)) from e
+        if "pyproject.toml" in changed:
+            obj["AFFECTED"] = None
+        else:
+            obj["AFFECTED"] = affected_files(cfg, load_index(ctx, cfg, source_objects), changed)
+    return obj["AFFECTED"]
+
+
+def load_index(ctx: click.Context, cfg: "Configuration", source_objects: "Objects") -> "FileIndex":
+    """
+    The index between source, test and doc files, brought up to date once per invocation from
+    its cache, which is keyed by the digest of the configuration.
+    """
+    obj = ctx.ensure_object(dict)
+    if "INDEX" not in obj:
+        from .cache import INDEX_FILENAME, ParseCache
+        from .changes import FileIndex
+
+        cache_dir = cfg.root_dir / cfg.cache_dir if cfg.cache_dir else None
+        cache = ParseCache(cache_dir, f"{cfg.digest}:{cfg.parser}", INDEX_FILENAME)
+        ctx.find_root().call_on_close(cache.save)
+        obj["INDEX"] = FileIndex.build(cfg, source_objects, cache)
+    return obj["INDEX"]
 
 
 @structlint_cli.command(name="version")
@@ -42,35 +143,76 @@ def version() -> bool:
     return False
 
 
-@structlint_cli.command(name="all", help="Run all checks: methods, docs, tests, imports.")
+@structlint_cli.command(
+    name="all",
+    help="Run all checks: methods, docs, tests, imports, cycles; footprint if limits are set.",
+)
 @click.pass_context
 def run_all(ctx: click.Context) -> bool:
-    cfg: Configuration = ctx.obj["CFG"]
-
-    source_objects = collect_source_objects(cfg.module_root_dir, cfg.root_dir)
-    tests_objects = collect_source_objects(cfg.tests.unit_dir, cfg.root_dir)
-    docs_objects = collect_docs_objects(cfg.docs.md_dir, cfg.root_dir)
-
-    mo_report, mo_problems = check_method_order(cfg, source_objects)
-    docs_report, docs_problems = check_docs_structure(cfg, source_objects, docs_objects)
-    tests_report, tests_problems = check_tests_structure(cfg, source_objects, tests_objects)
-    imports_report, imports_problems = check_imports(cfg.imports, cfg.module_name)
-
-    click.echo(mo_report)
-    click.echo(docs_report)
-    click.echo(tests_report)
-    click.echo(imports_report)
+    from concurrent.futures import ThreadPoolExecutor
+
+    from .checks import (
+        check_cycles,
+        check_docs_structure,
+        check_footprint,
+        check_imports,
+        check_method_order,
+        check_tests_structure,
+    )
+    from .configuration import FootprintConfig
+
+    workspace = load_workspace(ctx)
+    cfg = workspace.cfg
+
+    def check_import_graph() -> tuple[tuple[str, bool], tuple[str, bool]]:
+        graph, source_syntax = workspace.graph, workspace.source_syntax
+        closure_cache = workspace.closure_cache
+        return (
+            check_imports(cfg.imports, cfg.module_name, source_syntax, graph, closure_cache),
+            check_cycles(cfg.imports, cfg.module_name, source_syntax, graph),
+        )
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="structlint-imports") as worker:
+        source_objects = workspace.source_objects
+        affected = load_affected(ctx, cfg, source_objects)
+        whole_package = affected is None or affected.package_changed
+        if whole_package:  # the graph is built only for the checks that read it
+            graph_checks = worker.submit(check_import_graph)
+        tests_objects = workspace.tests_objects
+        docs_objects = workspace.docs_objects
+        if affected is not None:
+            source_objects = source_objects.restricted_to(affected.sources)
+            tests_objects = tests_objects.restricted_to(affected.tests)
+            docs_objects = docs_objects.restricted_to(affected.docs)
+
+        results = [
+            check_method_order(cfg, source_objects),
+            check_docs_structure(cfg, source_objects, docs_objects),
+            check_tests_structure(cfg, source_objects, tests_objects),
+        ]
+        if whole_package:  # imports, cycles and footprints depend on no other file
+            results += graph_checks.result()
+            if cfg.footprint != FootprintConfig():  # opt-in: without limits it cannot fail
+                results.append(check_footprint(cfg, workspace.module_syntax))
+
+    for report, _ in results:
+        click.echo(report)
     click.echo()
 
-    return any((mo_problems, docs_problems, tests_problems, imports_problems))
+    return any(problems for _, problems in results)
 
 
 @structlint_cli.command(help="Verify documentation presence and formatting.")
 @click.pass_context
 def docs(ctx: click.Context) -> bool:
-    cfg: Configuration = ctx.obj["CFG"]
-    source_objects = collect_source_objects(cfg.module_root_dir, cfg.root_dir)
-    docs_objects = collect_docs_objects(cfg.docs.md_dir, cfg.root_dir)
+    from .checks import check_docs_structure
+
+    workspace = load_workspace(ctx)
+    cfg = workspace.cfg
+    source_objects, docs_objects = workspace.source_objects, workspace.docs_objects
+    if affected := load_affected(ctx, cfg, source_objects):
+        source_objects = source_objects.restricted_to(affected.sources)
+        docs_objects = docs_objects.restricted_to(affected.docs)
 
     report, problems = check_docs_structure(cfg, source_objects, docs_objects)
     click.echo(report)
@@ -82,8 +224,62 @@ def docs(ctx: click.Context) -> bool:
 @structlint_cli.command(help="Inspect import structures and dependencies.")
 @click.pass_context
 def imports(ctx: click.Context) -> bool:
-    cfg = ctx.obj["CFG"]
-    report, problems = check_imports(cfg.imports, cfg.module_name)
+    from .checks import check_imports
+
+    workspace = load_workspace(ctx)
+    cfg = workspace.cfg
+    report, problems = check_imports(
+        cfg.imports,
+        cfg.module_name,
+        workspace.source_syntax,
+        workspace.graph,
+        workspace.closure_cache,
+    )
+    click.echo(report)
+    click.echo()
+
+    return problems
+
+
+@structlint_cli.command(help="Detect import cycles between the modules of the package.")
+@click.pass_context
+def cycles(ctx: click.Context) -> bool:
+    from .checks import check_cycles
+
+    workspace = load_workspace(ctx)
+    cfg = workspace.cfg
+    report, problems = check_cycles(
+        cfg.imports, cfg.module_name, workspace.source_syntax, workspace.graph
+    )
+    click.echo(report)
+    click.echo()
+
+    return problems
+
+
+@structlint_cli.command(help="Measure the modules and source loaded by each entry point.")
+@click.pass_context
+def footprint(ctx: click.Context) -> bool:
+    from .checks import check_footprint
+
+    workspace = load_workspace(ctx)
+    report, problems = check_footprint(workspace.cfg, workspace.module_syntax)
+    click.echo(report)
+    click.echo()
+
+    return problems
+
+
+@structlint_cli.command(
+    name="import-time", help="Time the imports of entry modules against configured budgets."
+)
+@click.pass_context
+def import_time(ctx: click.Context) -> bool:
+    from .checks import check_import_time
+
+    cfg, _ = load_context(ctx)
+
+    report, problems = check_import_time(cfg)
     click.echo(report)
     click.echo()
 
@@ -93,8 +289,12 @@ def imports(ctx: click.Context) -> bool:
 @structlint_cli.command(help="Check method structure and naming conventions.")
 @click.pass_context
 def methods(ctx: click.Context) -> bool:
-    cfg: Configuration = ctx.obj["CFG"]
-    source_objects = collect_source_objects(cfg.module_root_dir, cfg.root_dir)
+    from .checks import check_method_order
+
+    workspace = load_workspace(ctx)
+    cfg, source_objects = workspace.cfg, workspace.source_objects
+    if affected := load_affected(ctx, cfg, source_objects):
+        source_objects = source_objects.restricted_to(affected.sources)
     report, problems = check_method_order(cfg, source_objects)
     click.echo(report)
     click.echo()
@@ -105,9 +305,14 @@ def methods(ctx: click.Context) -> bool:
 @structlint_cli.command(name="tests", help="Check test organization and conventions.")
 @click.pass_context
 def tsts(ctx: click.Context) -> bool:
-    cfg: Configuration = ctx.obj["CFG"]
-    source_objects = collect_source_objects(cfg.module_root_dir, cfg.root_dir)
-    tests_objects = collect_source_objects(cfg.tests.unit_dir, cfg.root_dir)
+    from .checks import check_tests_structure
+
+    workspace = load_workspace(ctx)
+    cfg = workspace.cfg
+    source_objects, tests_objects = workspace.source_objects, workspace.tests_objects
+    if affected := load_affected(ctx, cfg, source_objects):
+        source_objects = source_objects.restricted_to(affected.sources)
+        tests_objects = tests_objects.restricted_to(affected.tests)
 
     report, problems = check_tests_structure(cfg, source_objects, tests_objects)
     click.echo(report)
@@ -116,10 +321,106 @@ def tsts(ctx: click.Context) -> bool:
     return problems
 
 
+@structlint_cli.command(
+    help="Show the test and doc files of a source file, or the source files of a test or doc file."
+)
+@click.argument("path", type=click.Path())
+@click.pass_context
+def which(ctx: click.Context, path: str) -> bool:
+    from pathlib import Path
+
+    from .reporting import make_which_report
+
+    workspace = load_workspace(ctx)
+    cfg = workspace.cfg
+    index = load_index(ctx, cfg, workspace.source_objects)
+    resolved, root_dir = Path(path).resolve(), cfg.root_dir.resolve()
+    if not resolved.is_relative_to(root_dir):
+        raise click.BadParameter(f"'{path}' is outside of the project.", param_hint="PATH")
+    relative = str(resolved.relative_to(root_dir))
+
+    linked = sorted(index.linked(relative))
+    click.echo(make_which_report(relative, linked, is_source=relative in index.targets))
+    click.echo()
+
+    return not linked
+
+
+@structlint_cli.command(
+    help="Check again, whenever files change, what the changes affect; stop with Ctrl-C."
+)
+@click.option(
+    "--interval",
+    type=click.FloatRange(min=0.05),
+    default=1.0,
+    show_default=True,
+    help="Seconds between two polls of the files.",
+)
+@click.pass_context
+def watch(ctx: click.Context, interval: float) -> bool:
+    from .watch import watch as watch_files
+
+    workspace = load_workspace(ctx)
+    click.echo(f"Watching '{workspace.cfg.root_dir}' every {interval:g}s; stop with Ctrl-C.")
+
+    return watch_files(workspace, click.echo, interval)
+
+
+@structlint_cli.command(
+    help="Serve the other commands from memory to 'structlint client', until stopped."
+)
+@click.option("--stop", is_flag=True, help="Stop the daemon of this project instead.")
+@click.pass_context
+def daemon(ctx: click.Context, stop: bool) -> bool:
+    from .daemon import Daemon, is_running, send_request, socket_path
+    from .utils import get_project_root
+
+    path = socket_path(get_project_root())
+    if stop:
+        if not is_running(path):
+            raise click.ClickException(f"No structlint daemon is listening at '{path}'.")
+        send_request(path, {"stop": True})
+        click.echo(f"Stopped the structlint daemon listening at '{path}'.")
+        return False
+    if is_running(path):
+        raise click.ClickException(f"A structlint daemon is already listening at '{path}'.")
+
+    workspace = load_workspace(ctx)
+    click.echo(f"Listening at '{path}'; stop with 'structlint daemon --stop' or Ctrl-C.")
+    try:
+        Daemon(workspace, structlint_cli).serve(path)
+    except KeyboardInterrupt:
+        pass
+
+    return False
+
+
+@structlint_cli.command(
+    context_settings={"ignore_unknown_options": True, "allow_interspersed_args": False},
+    help="Run a structlint command line through the daemon of this project.",
+)
+@click.argument("args", nargs=-1, type=click.UNPROCESSED)
+@click.pass_context
+def client(ctx: click.Context, args: tuple[str, ...]) -> bool:
+    from .daemon import send_request, socket_path
+    from .utils import get_project_root
+
+    path = socket_path(get_project_root())
+    try:
+        response = send_request(path, {"args": list(args), "color": sys.stdout.isatty()})
+    except (FileNotFoundError, ConnectionRefusedError) as e:
+        raise click.ClickException(
+            f"No structlint daemon is listening at '{path}'; start one with 'structlint daemon'."
+        ) from e
+    click.echo(response["stdout"], nl=False)
+    click.echo(response["stderr"], nl=False, err=True)
+    ctx.exit(response["exit_code"])
+
+
 @structlint_cli.command(name="show-config", help="Display current configuration.")
 @click.pass_context
 def show_config(ctx: click.Context) -> bool:
-    cfg: Configuration = ctx.obj["CFG"]
+    cfg, _ = load_context(ctx)
 
     click.echo(str(cfg))
     click.echo()
@@ -130,6 +431,8 @@ def show_config(ctx: click.Context) -> bool:
 @structlint_cli.command(name="show-default-config", help="Display default configuration.")
 @click.pass_context
 def show_default_config(ctx: click.Context) -> bool:
+    from .configuration import Configuration
+
     click.echo(str(Configuration()))
     click.echo()
 
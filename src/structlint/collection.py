@@ -2,92 +2,183 @@
 Class and functions tasked with finding and processing code objects in the source files.
 """
 
+import io
 import re
-from collections.abc import Callable
-from functools import partial
-from itertools import chain
+import sys
+import tokenize
+from bisect import bisect_left
+from collections.abc import Callable, Collection, Iterable
+from functools import cached_property, partial
+from itertools import accumulate, chain, takewhile
+from operator import attrgetter
 from pathlib import Path
+from typing import Any
 
+from .cache import ParseCache
+from .keys import ObjectKey
 from .regexes import Regex
+from .syntax import ModuleSyntax, parse_module
 from .utils import (
     always_true,
     deduplicate_ordered,
     get_method_name,
+    parallel_map,
     path_matches_not,
     remove_body,
     safe_search,
 )
 
+FSTRING_START = getattr(tokenize, "FSTRING_START", -1)  # f-strings are STRING tokens before 3.12
+FSTRING_END = getattr(tokenize, "FSTRING_END", -1)
+SKIPPED_TOKENS = {
+    tokenize.COMMENT,
+    tokenize.DEDENT,
+    tokenize.ENDMARKER,
+    tokenize.INDENT,
+    tokenize.NEWLINE,
+    tokenize.NL,
+}
+TRIPLE_QUOTES = {'"' * 3, "'" * 3}  # spelled out, the regex engine would misread this module
+
 ClassInfo = tuple[Path, int, str, list[str], dict[str, str], list[str]]
 ClassInfoBase = tuple[str, list[str], dict[str, str], list[str]]
+FileObjects = tuple[list[tuple[Path, int, str]], list[ClassInfo]]
 
 
 class Objects:
     """
-    Dataclass to hold information collected on objects.
+    Immutable container for information collected on objects.
 
     Used with source, test, and documentation objects, but only one of these per instance.
+    Derived views are computed on first access and cached.
     """
 
-    def __init__(self, functions: list[tuple[Path, int, str]], classes: list[ClassInfo]):
-        self.functions = functions
-        self._classes = classes
-        self._all_classes = add_inherited_methods(classes)
-
-    @property
-    def function_strings(self) -> list[str]:
-        return [f"{p}:{i:0>3}:{func}" for p, i, func in self.functions]
-
-    @property
-    def strings_without_methods(self) -> list[str]:
-        return self.classes_only + self.function_strings
-
-    @property
-    def classes_only(self) -> list[str]:
-        return list(set([f"{p}:{i:0>3}:{cl}" for p, i, cl, _, __, ___ in self._classes]))
-
-    @property
-    def methodless(self) -> list[str]:
-        return [f"{p}:{i:0>3}:{cl}" for p, i, cl, methods, _, __ in self._classes if not methods]
-
-    @property
+    def __init__(
+        self,
+        functions: Iterable[tuple[Path, int, str]],
+        classes: Iterable[ClassInfo],
+        syntax: list[ModuleSyntax] | None = None,
+        all_classes: Iterable[ClassInfo] | None = None,
+    ):
+        self.functions = tuple(functions)
+        self._classes = tuple(classes)
+        self._all_classes = tuple(
+            add_inherited_methods(list(self._classes)) if all_classes is None else all_classes
+        )
+        self.syntax = syntax
+        self._frozen = True
+
+    @cached_property
+    def function_keys(self) -> tuple[ObjectKey, ...]:
+        return tuple(ObjectKey(p, i, "", func) for p, i, func in self.functions)
+
+    @cached_property
+    def keys_without_methods(self) -> tuple[ObjectKey, ...]:
+        return self.classes_only + self.function_keys
+
+    @cached_property
+    def classes_only(self) -> tuple[ObjectKey, ...]:
+        keys = {ObjectKey(p, i, "", cl) for p, i, cl, _, __, ___ in self._classes}
+        return tuple(sorted(keys, key=attrgetter("path", "ordinal", "member")))
+
+    @cached_property
+    def methodless(self) -> tuple[ObjectKey, ...]:
+        return tuple(
+            ObjectKey(p, i, "", cl) for p, i, cl, methods, _, __ in self._classes if not methods
+        )
+
+    @cached_property
     def test_only(self) -> "Objects":
-        _functions = list(filter(lambda t: "test" in t[-1], self.functions))
-        _classes = list(filter(lambda t: "Test" in t[2], self._classes))
-
-        return Objects(functions=_functions, classes=_classes)
-
-    def strings(self, include_inherited: bool = True) -> list[str]:
-        return self.method_strings(include_inherited) + self.function_strings
-
-    def classes(self, include_inherited: bool = True) -> list[ClassInfo]:
+        def is_test_class(class_info: ClassInfo) -> bool:
+            return "Test" in class_info[2]
+
+        return Objects(
+            functions=filter(lambda t: "test" in t[-1], self.functions),
+            classes=filter(is_test_class, self._classes),
+            all_classes=filter(is_test_class, self._all_classes),
+        )
+
+    @cached_property
+    def _method_key_views(self) -> dict[bool, tuple[ObjectKey, ...]]:
+        return {
+            include_inherited: tuple(
+                ObjectKey(p, i, c, m)
+                for p, i, c, methods, _, __ in self.classes(include_inherited)
+                for m in methods
+            )
+            for include_inherited in (False, True)
+        }
+
+    @cached_property
+    def _key_views(self) -> dict[bool, tuple[ObjectKey, ...]]:
+        return {k: v + self.function_keys for k, v in self._method_key_views.items()}
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"'Objects' is immutable; cannot set '{name}'.")
+        super().__setattr__(name, value)
+
+    @classmethod
+    def from_syntax(cls, modules: list[ModuleSyntax]) -> "Objects":
+        functions = [(m.path, f.index, f.name) for m in modules for f in m.functions]
+        classes: list[ClassInfo] = [
+            (
+                m.path,
+                c.index,
+                c.name,
+                [method.name for method in c.methods],
+                {method.name: method.text for method in c.methods},
+                list(c.bases),
+            )
+            for m in modules
+            for c in m.classes
+        ]
+        return cls(functions=functions, classes=classes, syntax=modules)
+
+    def keys(self, include_inherited: bool = True) -> tuple[ObjectKey, ...]:
+        return self._key_views[include_inherited]
+
+    def classes(self, include_inherited: bool = True) -> tuple[ClassInfo, ...]:
         if include_inherited:
             return self._all_classes
         return self._classes
 
-    def method_strings(self, include_inherited: bool = True) -> list[str]:
-        def _chain(_l: list[list]) -> list:
-            return list(chain.from_iterable(_l))
-
-        _classes = self.classes(include_inherited)
-        quads = _chain([[(p, i, c, m) for m in methods] for p, i, c, methods, _, __ in _classes])
-        return [f"{p}:{i:0>3}:{c}.{m}" for p, i, c, m in quads]
+    def method_keys(self, include_inherited: bool = True) -> tuple[ObjectKey, ...]:
+        return self._method_key_views[include_inherited]
 
     def apply(
         self,
-        processor: Callable[[str], str],
+        processor: Callable[[ObjectKey], ObjectKey | None],
         ignore: re.Pattern | None = None,
         classes_only: bool = False,
         include_inherited: bool = True,
-    ) -> list[str]:
-        _strings: list[str]
-        if classes_only:
-            _strings = self.classes_only + self.function_strings
-        else:
-            _strings = self.strings(include_inherited)
-        if ignore:
-            _strings = list(filter(partial(path_matches_not, path_pattern=ignore), _strings))
-        return list(filter(bool, map(processor, _strings)))
+    ) -> list[ObjectKey]:
+        """
+        Map every key through `processor`, dropping the `None` results; `ignore` is searched in
+        the `path:NNN:name` form of each key, which is only formatted when it could match.
+        """
+        keys = self.keys_without_methods if classes_only else self.keys(include_inherited)
+        if ignore and ignore.pattern != Regex.MATCH_NOTHING.pattern:
+            keys = tuple(k for k in keys if path_matches_not(str(k), path_pattern=ignore))
+        return list(filter(None, map(processor, keys)))
+
+    def restricted_to(self, paths: Collection[str]) -> "Objects":
+        """
+        The objects of the files in `paths` only; their classes keep the methods inherited
+        from classes elsewhere.
+        """
+
+        def is_kept(info: tuple[Any, ...]) -> bool:
+            return str(info[0]) in paths
+
+        return Objects(
+            functions=filter(is_kept, self.functions),
+            classes=filter(is_kept, self._classes),
+            syntax=None
+            if self.syntax is None
+            else [m for m in self.syntax if str(m.path) in paths],
+            all_classes=filter(is_kept, self._all_classes),
+        )
 
 
 def collect_method_info(class_text: str) -> ClassInfoBase:
@@ -120,17 +211,24 @@ def collect_objects_in_md(
     return list(enumerate(filter(condition, re.findall(Regex.OBJECT_IN_MD, src_text))))
 
 
-def collect_docs_objects(md_dir: Path, project_root: Path) -> Objects:
+def collect_docs_objects(
+    md_dir: Path, project_root: Path, cache: ParseCache | None = None
+) -> Objects:
     functions: list[tuple[Path, int, str]] = []
     code_block = re.compile(r"```.+?```", re.DOTALL)
 
     for _p in sorted(md_dir.rglob("*.md")):
         p = _p.relative_to(project_root) if _p.is_absolute() else _p
+        if cache and (cached := cache.get(_p)) is not None:
+            functions.extend((p, i, name) for i, name in cached)
+            continue
+
         source = str(p.read_text())  # hack for testing purposes, to make mock work
         source = re.sub(code_block, "", source)
-
-        for new_objects in collect_objects_in_md(source):
-            functions.append((p, *new_objects))
+        new_objects = collect_objects_in_md(source)
+        functions.extend((p, *new_object) for new_object in new_objects)
+        if cache:
+            cache.put(_p, new_objects)
 
     return Objects(functions=functions, classes=[])
 
@@ -146,33 +244,258 @@ def collect_object_texts(source: str) -> list[str]:
     return re.findall(Regex.OBJECT_TEXT, source)
 
 
+def scan_top_level(source: str) -> tuple[list[tuple[str, int]], list[tuple[int, int, str]]]:
+    """
+    Tokenize `source` once, returning the first token and offset of each top-level statement
+    and the span and quote of each triple-quoted string.
+    """
+    offsets = list(accumulate(map(len, io.StringIO(source).readlines()), initial=0))
+    statements: list[tuple[str, int]] = []
+    triple_quoted: list[tuple[int, int, str]] = []
+    fstring_starts: list[int] = []
+    depth, at_statement_start = 0, True
+
+    for tok in tokenize.generate_tokens(io.StringIO(source).readline):
+        start = offsets[tok.start[0] - 1] + tok.start[1]
+        end = offsets[tok.end[0] - 1] + tok.end[1]
+        depth += (tok.type == tokenize.INDENT) - (tok.type == tokenize.DEDENT)
+        if tok.type in SKIPPED_TOKENS:
+            at_statement_start = at_statement_start or tok.type == tokenize.NEWLINE
+            continue
+        if at_statement_start and depth == 0:
+            statements.append((tok.string, start))
+        at_statement_start = False
+
+        quote = tok.string.lstrip("rRbBuUfF")[:3]
+        if tok.type == tokenize.STRING and quote in TRIPLE_QUOTES:
+            triple_quoted.append((start + tok.string.index(quote), end, quote))
+        elif tok.type == FSTRING_START:
+            fstring_starts.append(start + len(tok.string) - 3)
+        elif tok.type == FSTRING_END:
+            fstring_start = fstring_starts.pop()
+            if not fstring_starts and tok.string in TRIPLE_QUOTES:
+                triple_quoted.append((fstring_start, end, tok.string))
+
+    return statements, triple_quoted
+
+
+def blank_triple_quoted(
+    source: str, start: int, end: int, triple_quoted: list[tuple[int, int, str]]
+) -> str:
+    pieces: list[str] = []
+    position = start
+    for blank_start, blank_end, quote in triple_quoted[bisect_left(triple_quoted, (start,)) :]:
+        if blank_start >= end:
+            break
+        pieces.extend((source[position:blank_start], f"{quote}  {quote}"))
+        position = blank_end
+    return "".join(pieces) + source[position:end]
+
+
+def scan_object_texts(source: str) -> list[str]:
+    """
+    Linear-time, `tokenize`-based counterpart of `collect_object_texts`.
+
+    Emits records of the same form: a bare "@" per decorator not on the first line, the head of
+    each function up to its last opening parenthesis, and the text of each class (with
+    triple-quoted strings blanked) up to the first double blank line. Source that cannot be
+    tokenized falls back to the regex engine.
+
+    Records follow the statements rather than the layout of the text, as with the `ast`
+    parser, so the two engines disagree on many real files:
+
+    - each top-level class ends where the next top-level statement starts, where the regex
+      engine runs on to the next double blank line, swallowing the classes and functions
+      separated from it by single blank lines;
+    - classes nested in `if`, `try` or other blocks are not top-level objects, where the regex
+      engine takes any `class` header it finds, at any indentation.
+
+    It is also slower on ordinary files, by about an order of magnitude; it only wins on class
+    headers that send the regex engine into quadratic backtracking.
+    """
+    source = str(source)  # hack for testing purposes, to make mock work
+    try:
+        statements, triple_quoted = scan_top_level(source)
+    except (SyntaxError, tokenize.TokenError):
+        return collect_object_texts(source)
+
+    texts: list[str] = []
+    for (keyword, start), (_, end) in zip(statements, [*statements[1:], ("", len(source))]):
+        first_line = source[start:end].split("\n", 1)[0]
+        if keyword == "@" and start:  # the regex engine never matches a decorator on line 1
+            texts.append("@")
+        elif keyword == "def" and first_line.rfind("(") > 4:
+            texts.append(first_line[: first_line.rfind("(") + 1])
+        elif keyword == "class" and re.match(Regex.CLASS_HEAD, first_line):
+            text = blank_triple_quoted(source, start, end, triple_quoted)
+            if (cut := text.find("\n\n\n", first_line.rfind(":") + 2)) != -1:
+                text = text[: cut + 3]
+            elif end == len(source) and text.endswith("\n"):
+                text = text[:-1]
+            texts.append(text)
+
+    return texts
+
+
+SCANNERS: dict[str, Callable[[str], list[str]]] = {
+    "regex": collect_object_texts,
+    "tokenize": scan_object_texts,
+}
+
+
+def collect_file_objects(path: Path, root_dir: Path, parser: str = "regex") -> FileObjects:
+    functions: list[tuple[Path, int, str]] = []
+    classes: list[ClassInfo] = []
+    p = path.relative_to(root_dir) if path.is_absolute() else path
+
+    for i, text in enumerate(SCANNERS[parser](path.read_text())):
+        if text.startswith(("@dataclass", "class ")) and (class_tuple := collect_method_info(text)):
+            classes.append((p, i, *class_tuple))
+        elif text.startswith(("@", "def ")) and (func_name := parse_function(text)):
+            functions.append((p, i, func_name))
+
+    return functions, classes
+
+
+def collect_source_syntax(
+    src_dir: Path,
+    root_dir: Path,
+    jobs: int = 1,
+    cache: ParseCache | None = None,
+) -> list[ModuleSyntax]:
+    """
+    Parse every Python file below `src_dir` exactly once (or not at all on a cache hit).
+
+    Module names are dotted paths relative to the parent of `src_dir`.
+    """
+    paths = sorted(src_dir.rglob("*.py"))
+    cached = {_p: cache.get(_p) for _p in paths} if cache else dict.fromkeys(paths)
+    to_parse = [_p for _p, data in cached.items() if data is None]
+    parse = partial(parse_module, root_dir=root_dir, package_dir=src_dir.parent)
+    parsed = dict(zip(to_parse, parallel_map(parse, to_parse, jobs)))
+    modules: list[ModuleSyntax] = []
+
+    for _p in paths:
+        if (data := cached[_p]) is None:
+            module = parsed[_p]
+            if cache:
+                cache.put(_p, module.to_json())
+        else:
+            p = _p.relative_to(root_dir) if _p.is_absolute() else _p
+            module = ModuleSyntax.from_json(data, p)
+        modules.append(module)
+
+    return modules
+
+
 def collect_source_objects(
     src_dir: Path,
     root_dir: Path,
+    jobs: int = 1,
+    cache: ParseCache | None = None,
+    parser: str = "regex",
 ) -> Objects:
+    if parser == "ast":
+        return Objects.from_syntax(collect_source_syntax(src_dir, root_dir, jobs, cache))
+
     functions: list[tuple[Path, int, str]] = []
     classes: list[ClassInfo] = []
-
-    for _p in sorted(src_dir.rglob("*.py")):
-        p = _p.relative_to(root_dir) if _p.is_absolute() else _p
-        for i, text in enumerate(collect_object_texts(_p.read_text())):
-            if text.startswith(("@dataclass", "class ")) and (
-                class_tuple := collect_method_info(text)
-            ):
-                classes.append((p, i, *class_tuple))
-            elif text.startswith(("@", "def ")) and (func_name := parse_function(text)):
-                functions.append((p, i, func_name))
+    paths = sorted(src_dir.rglob("*.py"))
+    cached = {_p: cache.get(_p) for _p in paths} if cache else dict.fromkeys(paths)
+    to_parse = [_p for _p, data in cached.items() if data is None]
+    parse = partial(collect_file_objects, root_dir=root_dir, parser=parser)
+    parsed = dict(zip(to_parse, parallel_map(parse, to_parse, jobs)))
+
+    for _p in paths:
+        if (data := cached[_p]) is None:
+            file_functions, file_classes = parsed[_p]
+            if cache:
+                cache.put(_p, [[t[1:] for t in file_functions], [t[1:] for t in file_classes]])
+        else:
+            p = _p.relative_to(root_dir) if _p.is_absolute() else _p
+            cached_functions, cached_classes = data
+            file_functions = [(p, *t) for t in cached_functions]
+            file_classes = [(p, *t) for t in cached_classes]
+        functions.extend(file_functions)
+        classes.extend(file_classes)
 
     return Objects(functions=functions, classes=classes)
 
 
 def add_inherited_methods(class_tuples: list[ClassInfo]) -> list[ClassInfo]:
-    methods = {d[2]: d[3] for d in class_tuples}
-    superclasses = {d[2]: d[5] for d in class_tuples}
+    """
+    Give every class the methods of all of its ancestors, at any depth: its own methods first,
+    then those of each base in turn, left to right and depth first, without repeats.
 
-    for _ in range(2):
-        for classname, superclass_names in superclasses.items():
-            inherited = list(chain.from_iterable([methods.get(sc, []) for sc in superclass_names]))
-            methods[classname] = deduplicate_ordered(methods[classname] + inherited)
+    Bases are resolved with `resolve_bases` and classes are visited bases first, so each one
+    is resolved exactly once; an inheritance cycle is reported and its closing edge ignored.
+    """
+    bases = resolve_bases(class_tuples)
+    methods: list[list[str]] = [[] for _ in class_tuples]
+    for i in order_bases_first(bases, class_tuples):
+        inherited = chain.from_iterable(methods[b] for b in bases[i])
+        methods[i] = deduplicate_ordered(chain(class_tuples[i][3], inherited))
+
+    return [(p, i, n, methods[k], md, s) for k, (p, i, n, _, md, s) in enumerate(class_tuples)]
+
+
+def resolve_bases(class_tuples: list[ClassInfo]) -> list[list[int]]:
+    """
+    Positions in `class_tuples` of the known bases of each class.
+
+    Base names carry no module, so a name resolves to the class of that name in the same file
+    and otherwise to the one in the file sharing the longest path prefix; a class never
+    resolves to itself, which makes `class Foo(other.Foo)` harmless.
+    """
+    index: dict[str, list[int]] = {}
+    for k, class_info in enumerate(class_tuples):
+        index.setdefault(class_info[2], []).append(k)
 
-    return [(p, i, n, methods[n], md, s) for p, i, n, _, md, s in class_tuples]
+    def shared_parts(p: Path, q: Path) -> int:
+        return sum(1 for _ in takewhile(lambda pair: pair[0] == pair[1], zip(p.parts, q.parts)))
+
+    def resolve(k: int, name: str) -> int | None:
+        candidates = [j for j in index.get(name, ()) if j != k]
+        if len(candidates) < 2:
+            return candidates[0] if candidates else None
+        p = class_tuples[k][0]
+        return max(candidates, key=lambda j: (shared_parts(p, class_tuples[j][0]), -j))
+
+    resolved = ([resolve(k, name) for name in c[5]] for k, c in enumerate(class_tuples))
+    return [deduplicate_ordered(b for b in bases if b is not None) for bases in resolved]
+
+
+def order_bases_first(bases: list[list[int]], class_tuples: list[ClassInfo]) -> list[int]:
+    """
+    Topological order of the classes, every class after all of its bases; an iterative
+    depth-first search, so hierarchies of any depth are fine.
+
+    An edge closing an inheritance cycle is reported, then dropped from `bases`.
+    """
+    order: list[int] = []
+    state = [0] * len(bases)  # 0: unvisited, 1: on the current path, 2: done
+    for root in range(len(bases)):
+        if state[root]:
+            continue
+        state[root] = 1
+        stack = [(root, iter(list(bases[root])))]
+        while stack:
+            k, remaining = stack[-1]
+            for b in remaining:
+                if state[b] == 1:
+                    p, _, name, *__ = class_tuples[k]
+                    base_name = class_tuples[b][2]
+                    print(
+                        f"    Inheritance cycle in '{p}:{name}'; ignoring its base '{base_name}'.",
+                        file=sys.stderr,
+                    )
+                    bases[k].remove(b)
+                elif not state[b]:
+                    state[b] = 1
+                    stack.append((b, iter(list(bases[b]))))
+                    break
+            else:
+                stack.pop()
+                state[k] = 2
+                order.append(k)
+    return order
@@ -4,17 +4,21 @@ Configuration types and helper functions.
 Goal is to perform strict validation and helpful error messages.
 """
 
+import copy
 import re
 import tomllib
 from collections.abc import Iterable
 from dataclasses import dataclass, field
-from functools import partial
+from functools import lru_cache, partial
 from pathlib import Path
-from typing import Self, TypeVar
+from typing import Any, Self, TypeVar
 
+from .cache import DEFAULT_CACHE_DIR, ConfigCache, file_digest
 from .regexes import Regex
 from .utils import (
     assert_bool,
+    assert_nonnegative_int,
+    assert_one_of,
     boolean_merge,
     compile_string_or_bool,
     default_module_name,
@@ -26,6 +30,8 @@ from .utils import (
 
 T = TypeVar("T")
 
+PARSERS = ("ast", "regex", "tokenize")
+
 
 @dataclass
 class DocsConfig:
@@ -189,6 +195,7 @@ class ImportsConfig:
         external: ImportInfo | None = None,
         grimp_cache: str = ".grimp_cache",
         module_name: str | None = None,
+        allowed_cycles: Iterable[Iterable[str]] | None = None,
     ):
         self._module_name = module_name or default_module_name()
 
@@ -199,6 +206,9 @@ class ImportsConfig:
         self.internal: ImportInfo = internal or ImportInfo(is_internal=True)
         self.external: ImportInfo = external or ImportInfo(is_internal=False)
         self.grimp_cache = grimp_cache
+        self.allowed_cycles = tuple(
+            frozenset(map(self._fixer, cycle)) for cycle in allowed_cycles or ()
+        )
 
         self._check_conflicts()
 
@@ -208,11 +218,13 @@ class ImportsConfig:
     def __str__(self) -> str:
         iae = str(sorted(self.internal_allowed_everywhere)).replace("'", '"')
         eae = str(sorted(self.external_allowed_everywhere)).replace("'", '"')
+        ac = str([sorted(cycle) for cycle in self.allowed_cycles]).replace("'", '"')
         return (
             f"[tool.structlint.imports]\n"
             f"internal_allowed_everywhere = {iae}\n"
             f"external_allowed_everywhere = {eae}\n"
-            f'grimp_cache = "{self.grimp_cache}"\n\n'
+            f'grimp_cache = "{self.grimp_cache}"\n'
+            f"allowed_cycles = {ac}\n\n"
             f"{self.internal}\n\n"
             f"{self.external}"
         ).strip("\n")
@@ -242,6 +254,7 @@ class ImportsConfig:
                 disallowed=raw_icfg.get("external_disallowed", {}),
             ),
             grimp_cache=raw_icfg.get("grimp_cache", ".grimp_cache"),
+            allowed_cycles=raw_icfg.get("allowed_cycles", []),
         )
 
     def merge(
@@ -252,6 +265,7 @@ class ImportsConfig:
         internal: ImportInfo | None = None,
         external: ImportInfo | None = None,
         grimp_cache: str | None = None,
+        allowed_cycles: Iterable[Iterable[str]] | None = None,
     ) -> Self:
         self.internal_allowed_everywhere = set(
             map(self._fixer, internal_allowed_everywhere or self.internal_allowed_everywhere)
@@ -262,6 +276,10 @@ class ImportsConfig:
         self.internal = internal or self.internal
         self.external = external or self.external
         self.grimp_cache = grimp_cache or self.grimp_cache
+        if allowed_cycles:
+            self.allowed_cycles = tuple(
+                frozenset(map(self._fixer, cycle)) for cycle in allowed_cycles
+            )
 
         self._check_conflicts()
         return self
@@ -464,6 +482,146 @@ class UnitTestsConfig:
         return self
 
 
+@dataclass
+class ImportTimeConfig:
+    modules: tuple[str, ...] = ()
+    """ Entry modules to time; by default the package itself and its `[project.scripts]`. """
+
+    budgets: dict[str, int] = field(default_factory=dict)
+    """ Most cumulative microseconds each module may take to import, under any entry module. """
+
+    repeat: int = 5
+    """ Runs per entry module, of which the median time of each module is kept. """
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self) -> str:
+        modules = str(list(self.modules)).replace("'", '"')
+        budgets = "\n".join(f'"{k}" = {v}' for k, v in sorted(self.budgets.items()))
+        return (
+            f"[tool.structlint.import_time]\n"
+            f"modules = {modules}\n"
+            f"repeat = {self.repeat}\n\n"
+            f"[tool.structlint.import_time.budgets]\n"
+            f"{budgets}"
+        ).strip("\n")
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, ImportTimeConfig):
+            return other.__dict__ == self.__dict__
+        return False
+
+    @classmethod
+    def from_dict(cls, raw_itcfg: dict) -> Self:
+        if (repeat := assert_nonnegative_int(raw_itcfg.get("repeat", 5))) == 0:
+            raise ValueError("At least one run per entry module expected; found 'repeat = 0'.")
+        return cls().merge(
+            modules=tuple(raw_itcfg.get("modules", ())),
+            budgets={k: assert_nonnegative_int(v) for k, v in raw_itcfg.get("budgets", {}).items()},
+            repeat=repeat,
+        )
+
+    def merge(
+        self,
+        *,
+        modules: tuple[str, ...] | None = None,
+        budgets: dict[str, int] | None = None,
+        repeat: int | None = None,
+    ) -> Self:
+        self.modules = modules or self.modules
+        self.budgets = budgets or self.budgets
+        self.repeat = self.repeat if repeat is None else repeat
+
+        return self
+
+
+@dataclass
+class FootprintConfig:
+    max_modules: int = 0
+    """ Most internal modules an entry point may load; 0 sets no limit. """
+
+    max_external_packages: int = 0
+    """ Most third-party packages an entry point may load; 0 sets no limit. """
+
+    max_source_bytes: int = 0
+    """ Most source bytes, internal and third-party, an entry point may load; 0 sets no limit. """
+
+    def __repr__(self):
+        return str(self)
+
+    def __str__(self) -> str:
+        return (
+            f"[tool.structlint.footprint]\n"
+            f"max_modules = {self.max_modules}\n"
+            f"max_external_packages = {self.max_external_packages}\n"
+            f"max_source_bytes = {self.max_source_bytes}"
+        )
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, FootprintConfig):
+            return other.__dict__ == self.__dict__
+        return False
+
+    @classmethod
+    def from_dict(cls, raw_fcfg: dict) -> Self:
+        return cls().merge(
+            max_modules=assert_nonnegative_int(raw_fcfg.get("max_modules", 0)),
+            max_external_packages=assert_nonnegative_int(raw_fcfg.get("max_external_packages", 0)),
+            max_source_bytes=assert_nonnegative_int(raw_fcfg.get("max_source_bytes", 0)),
+        )
+
+    def merge(
+        self,
+        *,
+        max_modules: int | None = None,
+        max_external_packages: int | None = None,
+        max_source_bytes: int | None = None,
+    ) -> Self:
+        self.max_modules = max_modules or self.max_modules
+        self.max_external_packages = max_external_packages or self.max_external_packages
+        self.max_source_bytes = max_source_bytes or self.max_source_bytes
+
+        return self
+
+
+@dataclass(frozen=True)
+class ConfigSource:
+    """
+    What a configuration is built from: the `[tool.structlint]` table of a pyproject file and
+    the name and scripts of its project. Sources compare and hash by the digest of the file,
+    which also stands for the configuration in the keys of result caches.
+    """
+
+    digest: str
+    module_name: str = field(default="", compare=False)
+    table: dict[str, Any] = field(default_factory=dict, compare=False)
+    scripts: dict[str, str] = field(default_factory=dict, compare=False)
+
+    @classmethod
+    def parse(cls, text: str, digest: str) -> Self:
+        raw_dict = tomllib.loads(text)
+        project = raw_dict.get("project", {})
+        return cls(
+            digest,
+            project.get("name", "").replace("-", "_"),
+            raw_dict["tool"]["structlint"],
+            project.get("scripts", {}),
+        )
+
+    @classmethod
+    def from_json(cls, raw: dict[str, Any]) -> Self:
+        return cls(raw["digest"], raw["module_name"], raw["table"], raw["scripts"])
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "digest": self.digest,
+            "module_name": self.module_name,
+            "table": self.table,
+            "scripts": self.scripts,
+        }
+
+
 @dataclass
 class Configuration:
     """
@@ -473,10 +631,18 @@ class Configuration:
     root_dir: Path = field(default_factory=Path.cwd)
     module_name: str = field(default_factory=default_module_name)
     module_root_dir: Path = field(default_factory=default_module_root_dir)
+    jobs: int = 1
+    cache_dir: str = DEFAULT_CACHE_DIR
+    parser: str = "regex"
     docs: DocsConfig = field(default_factory=DocsConfig)
     imports: ImportsConfig = field(default_factory=ImportsConfig)
     methods: MethodsConfig = field(default_factory=MethodsConfig)
     tests: UnitTestsConfig = field(default_factory=UnitTestsConfig)
+    import_time: ImportTimeConfig = field(default_factory=ImportTimeConfig)
+    footprint: FootprintConfig = field(default_factory=FootprintConfig)
+    scripts: dict[str, str] = field(default_factory=dict)
+    digest: str = ""
+    """ Digest of the pyproject file read, if any; not part of the settings compared. """
 
     def __repr__(self):
         return str(self)
@@ -486,29 +652,51 @@ class Configuration:
             f"[tool.structlint]\n"
             f'root_dir = "."\n'
             f'module_name = "{self.module_name}"\n'
-            f'module_root_dir = "{self.module_root_dir}"\n\n'
+            f'module_root_dir = "{self.module_root_dir}"\n'
+            f"jobs = {self.jobs}\n"
+            f'cache_dir = "{self.cache_dir}"\n'
+            f'parser = "{self.parser}"\n\n'
             f"{self.docs}\n\n"
             f"{self.imports}\n\n"
             f"{self.methods}\n\n"
-            f"{self.tests}"
+            f"{self.tests}\n\n"
+            f"{self.import_time}\n\n"
+            f"{self.footprint}"
         )
 
     def __eq__(self, other) -> bool:
         if isinstance(other, Configuration):
-            return other.__dict__ == self.__dict__
+            return other.__dict__ | {"digest": ""} == self.__dict__ | {"digest": ""}
         return False
 
     @classmethod
-    def read(cls, explicitly_passed: str | Path | None = None) -> Self:
+    def read(
+        cls, explicitly_passed: str | Path | None = None, use_cache: bool = True
+    ) -> "Configuration":
+        """
+        Read the configuration from `pyproject.toml`, or from `explicitly_passed`.
+
+        The parsed source is kept in the default cache directory, unless the configuration
+        moves or disables the cache, and reused while the digest of the file is unchanged;
+        within a process, its patterns are compiled once per digest, see `CompiledConfig`.
+        """
         root_dir = get_project_root()
         file_path = Path(explicitly_passed or root_dir / "pyproject.toml")
-        raw_dict = tomllib.loads(file_path.read_text())
-        module_name = (
-            raw_dict["project"]["name"].replace("-", "_")
-            if "project" in raw_dict
-            else default_module_name()
-        )
-        return cls.from_dict(raw_dict["tool"]["structlint"], module_name, root_dir)
+        digest = file_digest(file_path)
+        cache = ConfigCache(root_dir / DEFAULT_CACHE_DIR if use_cache else None)
+        if (raw_source := cache.get(digest)) is not None:
+            source = ConfigSource.from_json(raw_source)
+        else:
+            source = ConfigSource.parse(file_path.read_text(), digest)
+            if source.table.get("cache_dir", DEFAULT_CACHE_DIR) == DEFAULT_CACHE_DIR:
+                cache.put(digest, source.to_json())
+                cache.save()
+        return cls.from_source(source, root_dir)
+
+    @classmethod
+    def from_source(cls, source: ConfigSource, project_root: Path | None = None) -> "Configuration":
+        """A copy of the configuration compiled once per digest of `source` and project root."""
+        return CompiledConfig.compile(source, project_root or get_project_root()).build()
 
     @classmethod
     def from_dict(
@@ -528,10 +716,15 @@ class Configuration:
             root_dir=root_dir,
             module_root_dir=module_root_dir,
             module_name=raw_config.get("module_name", module_name),
+            jobs=assert_nonnegative_int(raw_config.get("jobs", 1)),
+            cache_dir=raw_config.get("cache_dir", DEFAULT_CACHE_DIR),
+            parser=assert_one_of(raw_config.get("parser", "regex"), PARSERS),
             docs=DocsConfig.from_dict(raw_config.get("docs", {})),
             imports=ImportsConfig.from_dict(raw_config.get("imports", {}), module_name),
             tests=UnitTestsConfig.from_dict(raw_config.get("tests", {})),
             methods=MethodsConfig.from_dict(raw_config.get("methods", {})),
+            import_time=ImportTimeConfig.from_dict(raw_config.get("import_time", {})),
+            footprint=FootprintConfig.from_dict(raw_config.get("footprint", {})),
         )
 
     def merge(
@@ -544,6 +737,13 @@ class Configuration:
         imports: ImportsConfig | None = None,
         methods: MethodsConfig | None = None,
         module_root_dir: Path | None = None,
+        jobs: int | None = None,
+        cache_dir: str | None = None,
+        parser: str | None = None,
+        import_time: ImportTimeConfig | None = None,
+        footprint: FootprintConfig | None = None,
+        scripts: dict[str, str] | None = None,
+        digest: str | None = None,
     ) -> Self:
         self.root_dir = root_dir or self.root_dir
         self.module_name = module_name or self.module_name
@@ -552,5 +752,38 @@ class Configuration:
         self.imports = imports or self.imports
         self.methods = methods or self.methods
         self.module_root_dir = module_root_dir or self.module_root_dir
+        self.jobs = self.jobs if (jobs is None) else jobs
+        self.cache_dir = self.cache_dir if (cache_dir is None) else cache_dir
+        self.parser = parser or self.parser
+        self.import_time = import_time or self.import_time
+        self.footprint = footprint or self.footprint
+        self.scripts = scripts or self.scripts
+        self.digest = digest or self.digest
 
         return self
+
+
+@dataclass(frozen=True)
+class CompiledConfig:
+    """
+    The configuration built from one `ConfigSource` under one project root, its patterns
+    compiled. It hashes by the digest of the source and the root, and is built once per pair:
+    later reads of an unchanged pyproject file only copy it, sharing the compiled patterns.
+    """
+
+    source: ConfigSource
+    root_dir: Path
+    configuration: Configuration = field(compare=False, repr=False)
+
+    @classmethod
+    @lru_cache(maxsize=16)
+    def compile(cls, source: ConfigSource, root_dir: Path) -> Self:
+        module_name = source.module_name or default_module_name()
+        cfg = Configuration.from_dict(source.table, module_name, root_dir)
+        return cls(source, root_dir, cfg.merge(scripts=source.scripts, digest=source.digest))
+
+    def build(self) -> Configuration:
+        """A configuration of its own to merge into, whose patterns are the compiled ones."""
+        cfg = self.configuration
+        immutable = (cfg.root_dir, cfg.module_root_dir, cfg.methods.ordering)  # not walked
+        return copy.deepcopy(cfg, {id(value): value for value in immutable})
@@ -0,0 +1,175 @@
+"""
+A server keeping the warm state of a project between runs of the command-line interface, and
+the client forwarding command lines to it over a Unix socket.
+
+A request is one JSON object sent before the client shuts its side of the connection down; the
+response is one JSON object with the output and the exit code of the command line.
+"""
+
+import io
+import json
+import socket
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .cache import DEFAULT_CACHE_DIR
+
+if TYPE_CHECKING:
+    import click
+
+    from .workspace import Workspace
+
+SOCKET_FILENAME = "daemon.sock"
+UNSERVED_COMMANDS = frozenset({"client", "daemon", "watch"})
+
+
+def socket_path(root_dir: Path) -> Path:
+    """Where the daemon of the project at `root_dir` listens, whatever its cache directory."""
+    return root_dir / DEFAULT_CACHE_DIR / SOCKET_FILENAME
+
+
+def receive(connection: socket.socket) -> dict[str, Any]:
+    """The JSON object sent on `connection` until the other side shut its writing down."""
+    chunks = []
+    while chunk := connection.recv(65536):
+        chunks.append(chunk)
+    return json.loads(b"".join(chunks) or b"{}")
+
+
+def send_request(path: Path, request: dict[str, Any]) -> dict[str, Any]:
+    """Send `request` to the daemon listening at `path` and wait for its response."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(str(path))
+        client.sendall(json.dumps(request).encode())
+        client.shutdown(socket.SHUT_WR)
+        return receive(client)
+
+
+def is_running(path: Path) -> bool:
+    """Whether a daemon accepts connections at `path`, rather than a stale socket file."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(str(path))
+        except OSError:
+            return False
+    return True
+
+
+def subcommand_names(command: "click.Group", args: list[str]) -> list[str]:
+    """
+    The subcommands a command line of the chained `command` invokes, as click parses it, so
+    that option values and arguments are never taken for one; parsing stops at an unknown name.
+    """
+    import click
+
+    names = []
+    ctx = command.context_class(command, info_name="structlint", resilient_parsing=True)
+    rest = click.Command.parse_args(command, ctx, list(args))  # the group's own options only
+    while rest:
+        name, subcommand, rest = command.resolve_command(ctx, rest)
+        if name is None or subcommand is None:
+            break
+        names.append(name)
+        sub_ctx = subcommand.make_context(
+            name,
+            rest,
+            parent=ctx,
+            allow_extra_args=True,
+            allow_interspersed_args=False,
+            resilient_parsing=True,
+        )
+        rest = sub_ctx.args
+    return names
+
+
+class Daemon:
+    """
+    Runs command lines of `command`, the command-line interface, against one `Workspace`,
+    brought up to date before each of them.
+
+    Before a request, the files of the project are polled as in watch mode, and what the
+    changed ones invalidate is dropped; the parse cache kept in memory then spares parsing
+    any file that did not change.
+    """
+
+    def __init__(self, workspace: "Workspace", command: "click.Group"):
+        from .watch import snapshot_workspace
+
+        self.workspace = workspace
+        self.command = command
+        self.snapshot = snapshot_workspace(workspace)
+        self.stopped = False
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        """
+        The response to `{"args": [...], "color": bool}`, with what the command line printed
+        and its exit code, or to `{"stop": true}`, after which the daemon stops serving.
+        """
+        if request.get("stop"):
+            self.stopped = True
+            return {"stdout": "", "stderr": "", "exit_code": 0}
+        args = [str(arg) for arg in request.get("args", [])]
+        if unserved := UNSERVED_COMMANDS.intersection(subcommand_names(self.command, args)):
+            message = f"Error: '{min(unserved)}' cannot be run through the daemon.\n"
+            return {"stdout": "", "stderr": message, "exit_code": 2}
+
+        from .watch import poll
+
+        self.snapshot, _ = poll(self.workspace, self.snapshot)
+        stdout, stderr, exit_code = self.run(args, bool(request.get("color")))
+        self.workspace.save()
+        return {"stdout": stdout, "stderr": stderr, "exit_code": exit_code}
+
+    def run(self, args: list[str], color: bool = False) -> tuple[str, str, int]:
+        """The output, error output and exit code of `structlint *args` on the workspace."""
+        import click
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                problems = self.command.main(
+                    args,
+                    prog_name="structlint",
+                    standalone_mode=False,
+                    color=color,
+                    obj={"WORKSPACE": self.workspace},
+                )
+                exit_code = int(problems or 0)
+            except click.ClickException as e:
+                e.show()
+                exit_code = e.exit_code
+            except click.Abort:
+                exit_code = 1
+            except Exception:  # a failing command line must not take the daemon down
+                traceback.print_exc()
+                exit_code = 1
+        return stdout.getvalue(), stderr.getvalue(), exit_code
+
+    def serve(self, path: Path) -> None:
+        """
+        Answer requests at `path` one after the other until asked to stop; the objects of the
+        project are collected first, so that even the first request finds them warm.
+        """
+        for name in ("source_objects", "tests_objects", "docs_objects"):
+            getattr(self.workspace, name)
+        self.workspace.save()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(path))
+            server.listen()
+            try:
+                while not self.stopped:
+                    connection, _ = server.accept()
+                    with connection:
+                        if not (request := receive(connection)):  # probed by `is_running`
+                            continue
+                        response = self.handle(request)
+                        try:
+                            connection.sendall(json.dumps(response).encode())
+                        except OSError:  # the client is gone; the next one is served all the same
+                            pass
+            finally:
+                path.unlink(missing_ok=True)
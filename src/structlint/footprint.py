@@ -0,0 +1,114 @@
+"""
+Static import footprint of entry points: what loading them imports, found without running it.
+"""
+
+import importlib.util
+import sys
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .configuration import Configuration, FootprintConfig
+from .graphs import reachable_closures
+from .syntax import ModuleSyntax
+from .utils import deduplicate_ordered
+
+if TYPE_CHECKING:
+    import grimp
+
+
+@dataclass(frozen=True)
+class Footprint:
+    """
+    The internal modules and third-party packages an entry module loads, itself included, their
+    source size, and the imports through which the most source is loaded.
+    """
+
+    entry: str
+    modules: frozenset[str]
+    external_packages: frozenset[str]
+    source_bytes: int
+    heaviest_imports: tuple[tuple[str, str, int], ...] = ()
+    """ `(importer, imported, bytes)`, with the bytes of everything loaded through the import. """
+
+
+def script_modules(cfg: Configuration) -> list[str]:
+    """The modules of the `[project.scripts]` entry points, else the package itself."""
+    scripts = (target.partition(":")[0].strip() for target in cfg.scripts.values())
+    return deduplicate_ordered(scripts) or [cfg.module_name]
+
+
+@cache
+def package_source_bytes(package: str) -> int:
+    """
+    Size of the Python sources of an installed package, located without importing it; 0 if it
+    cannot be found.
+    """
+    try:
+        spec = importlib.util.find_spec(package)
+    except (ImportError, ValueError):
+        return 0
+    if spec is None:
+        return 0
+    if spec.submodule_search_locations:
+        return sum(
+            p.stat().st_size
+            for location in spec.submodule_search_locations
+            for p in Path(location).rglob("*.py")
+        )
+    if spec.origin and spec.origin.endswith(".py"):
+        return Path(spec.origin).stat().st_size
+    return 0
+
+
+def module_source_bytes(modules: Iterable[ModuleSyntax], root_dir: Path) -> dict[str, int]:
+    return {m.module: (root_dir / m.path).stat().st_size for m in modules}
+
+
+def compute_footprint(
+    graph: "grimp.ImportGraph", entry: str, size_of: Callable[[str], int], top: int = 10
+) -> Footprint:
+    """
+    Everything `entry` reaches in `graph`, where externals are squashed to their package.
+
+    The standard library is left out. An import weighs the source bytes of all it reaches,
+    which it would load on its own even if other imports load part of that too.
+    """
+
+    def successors_of(module: str) -> list[str]:
+        return [
+            m
+            for m in graph.find_modules_directly_imported_by(module)
+            if m.partition(".")[0] not in sys.stdlib_module_names
+        ]
+
+    reached = {entry} | reachable_closures([entry], successors_of)[entry]
+    closures = reachable_closures(sorted(reached), successors_of)
+    external = {m for m in reached if graph.is_module_squashed(m)}
+    weights = {m: size_of(m) for m in reached}
+    edges = [
+        (importer, imported, sum(weights[m] for m in closures[imported] | {imported}))
+        for importer in sorted(reached)
+        for imported in sorted(successors_of(importer))
+    ]
+    heaviest = sorted(edges, key=lambda e: (-e[2], e[0], e[1]))[:top]
+
+    return Footprint(
+        entry,
+        frozenset(reached - external),
+        frozenset(external),
+        sum(weights.values()),
+        tuple(heaviest),
+    )
+
+
+def exceeded_limits(footprint: Footprint, limits: FootprintConfig) -> list[tuple[str, int, int]]:
+    """`(measure, value, limit)` for each limit the footprint exceeds; limits of 0 are off."""
+    measures = (
+        ("internal modules", len(footprint.modules), limits.max_modules),
+        ("external packages", len(footprint.external_packages), limits.max_external_packages),
+        ("source bytes", footprint.source_bytes, limits.max_source_bytes),
+    )
+    return [(name, value, limit) for name, value, limit in measures if 0 < limit < value]
@@ -0,0 +1,179 @@
+"""
+Graph algorithms over import graphs: strongly connected components, upstream closures and
+shortest cycles.
+"""
+
+from collections.abc import Callable, Collection, Iterable, Sequence
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import grimp
+
+    from .cache import ClosureCache
+
+
+def pop_component(stack: list[int], on_stack: list[bool], root: int) -> list[int]:
+    """The nodes of `stack` down to `root`, taken off it: the component `root` is the root of."""
+    component = []
+    while True:
+        member = stack.pop()
+        on_stack[member] = False
+        component.append(member)
+        if member == root:
+            return component
+
+
+def strongly_connected_components(successors: Sequence[Sequence[int]]) -> list[list[int]]:
+    """
+    Tarjan's algorithm, iterative so that import chains of any length are fine.
+
+    Nodes are `0..len(successors) - 1`; components come out in reverse topological order,
+    each one after every component it can reach.
+    """
+    index = [-1] * len(successors)
+    lowlink = [0] * len(successors)
+    on_stack = [False] * len(successors)
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+
+    for root in range(len(successors)):
+        if index[root] >= 0:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = lowlink[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            else:  # back from the child explored last
+                lowlink[node] = min(lowlink[node], lowlink[successors[node][i - 1]])
+            for j in range(i, len(successors[node])):
+                child = successors[node][j]
+                if index[child] < 0:
+                    work.append((node, j + 1))
+                    work.append((child, 0))
+                    break
+                if on_stack[child]:
+                    lowlink[node] = min(lowlink[node], index[child])
+            else:
+                if lowlink[node] == index[node]:
+                    components.append(pop_component(stack, on_stack, node))
+    return components
+
+
+def number_nodes(
+    roots: Iterable[str], successors_of: Callable[[str], Iterable[str]]
+) -> tuple[list[str], list[list[int]]]:
+    """
+    The nodes reachable from `roots`, numbered as they are discovered, the roots first, and
+    the numbers of the successors of each of them.
+    """
+    names = list(dict.fromkeys(roots))
+    position = {name: i for i, name in enumerate(names)}
+    successors: list[list[int]] = []
+    while len(successors) < len(names):
+        children = []
+        for child in successors_of(names[len(successors)]):
+            if child not in position:
+                position[child] = len(names)
+                names.append(child)
+            children.append(position[child])
+        successors.append(children)
+    return names, successors
+
+
+def component_reach(successors: Sequence[Sequence[int]]) -> tuple[list[int], list[int]]:
+    """
+    The component of each node, and what each component reaches as a bitset: the union of
+    its own members and of the bitsets of the components it points to.
+    """
+    component_of = [0] * len(successors)
+    reach: list[int] = []
+    for c, component in enumerate(strongly_connected_components(successors)):
+        bits = 0
+        for node in component:
+            component_of[node] = c
+            bits |= 1 << node
+        reach.append(bits)
+        for node in component:
+            for target in successors[node]:
+                if component_of[target] != c:  # an earlier component, already complete
+                    reach[c] |= reach[component_of[target]]
+    return component_of, reach
+
+
+def reachable_closures(
+    roots: Iterable[str], successors_of: Callable[[str], Iterable[str]]
+) -> dict[str, set[str]]:
+    """
+    Everything each root reaches, itself excluded, from one pass over the condensation of
+    the subgraph reachable from `roots`, with reachability kept as a bitset per component.
+    """
+    roots = list(roots)
+    names, successors = number_nodes(roots, successors_of)
+    position = {name: i for i, name in enumerate(names)}
+    component_of, reach = component_reach(successors)
+
+    def decode(bits: int) -> set[str]:
+        members = set()
+        while bits:
+            low = bits & -bits
+            members.add(names[low.bit_length() - 1])
+            bits ^= low
+        return members
+
+    return {
+        root: decode(reach[component_of[position[root]]] & ~(1 << position[root])) for root in roots
+    }
+
+
+def upstream_closures(
+    graph: "grimp.ImportGraph", modules: Iterable[str], cache: "ClosureCache | None" = None
+) -> dict[str, set[str]]:
+    """
+    `graph.find_upstream_modules` for each of `modules` at once.
+
+    Closures still valid in `cache` are reused; the others are computed together by
+    `reachable_closures`, so that the modules they share are walked only once, and stored.
+    """
+    closures: dict[str, set[str]] = {}
+    stale = []
+    for module in modules:
+        if cache and (closure := cache.get(module)) is not None:
+            closures[module] = closure
+        else:
+            stale.append(module)
+
+    computed = reachable_closures(stale, graph.find_modules_directly_imported_by)
+    if cache:
+        for module, closure in computed.items():
+            cache.put(module, closure)
+    return closures | computed
+
+
+def shortest_cycle(
+    start: str, successors_of: Callable[[str], Iterable[str]], within: Collection[str]
+) -> list[str]:
+    """
+    A shortest chain of imports from `start` back to itself through modules of `within`, both
+    ends included, by breadth-first search; `[]` if there is none.
+    """
+    parent: dict[str, str] = {}
+    frontier = [start]
+    while frontier:
+        following = []
+        for module in frontier:
+            for child in sorted(successors_of(module)):
+                if child == start:
+                    chain = [start, module]
+                    while chain[-1] != start:
+                        chain.append(parent[chain[-1]])
+                    return chain[::-1]
+                if child in within and child not in parent:
+                    parent[child] = module
+                    following.append(child)
+        frontier = following
+    return []
@@ -0,0 +1,73 @@
+"""
+Measurement of import times by running `python -X importtime` on entry modules.
+"""
+
+import statistics
+import subprocess
+import sys
+from collections.abc import Collection
+from pathlib import Path
+
+from .configuration import Configuration
+from .footprint import script_modules
+from .utils import deduplicate_ordered
+
+
+def entry_modules(cfg: Configuration) -> list[str]:
+    """The configured entry modules, else the package and the modules of its console scripts."""
+    if cfg.import_time.modules:
+        return list(cfg.import_time.modules)
+    return deduplicate_ordered([cfg.module_name, *script_modules(cfg)])
+
+
+def parse_importtime(stderr: str, roots: Collection[str] | None = None) -> dict[str, int]:
+    """
+    Cumulative microseconds per imported module, read off the `import time:` lines written to
+    stderr under `-X importtime`; other output is ignored.
+
+    Lines come in post-order, each nested import indented below its importer: with `roots`,
+    only the modules imported for one of them are kept, leaving out the interpreter's startup.
+    """
+    times: dict[str, int] = {}
+    pending: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.removeprefix("import time:").split("|", maxsplit=2)
+        if not cumulative.strip().isdigit():
+            continue
+        pending[name.strip()] = int(cumulative)
+        if not name.startswith("   "):  # a top-level import closes the subtree before it
+            if roots is None or name.strip() in roots:
+                times.update(pending)
+            pending = {}
+    return times
+
+
+def measure_import_time(module: str, cwd: Path | None = None) -> dict[str, int]:
+    """Import `module` in a fresh interpreter and return the time taken by each module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=cwd,
+        check=False,
+    )
+    if result.returncode:
+        last_line = result.stderr.strip().splitlines()[-1:] or [""]
+        raise ImportError(f"Module '{module}' could not be imported: {last_line[0]}")
+    parts = module.split(".")
+    return parse_importtime(result.stderr, {".".join(parts[:i]) for i in range(1, len(parts) + 1)})
+
+
+def median_import_times(module: str, repeat: int = 5, cwd: Path | None = None) -> dict[str, int]:
+    """
+    Median cumulative time of each module over `repeat` runs, to even out the noise of a
+    single run; modules seen in only some of the runs keep the median of those.
+    """
+    runs = [measure_import_time(module, cwd) for _ in range(max(repeat, 1))]
+    samples: dict[str, list[int]] = {}
+    for run in runs:
+        for name, time in run.items():
+            samples.setdefault(name, []).append(time)
+    return {name: int(statistics.median(times)) for name, times in samples.items()}
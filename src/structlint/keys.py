@@ -0,0 +1,79 @@
+"""
+Structured identity of a code object, formatted as a `path:NNN:name` string only for display.
+"""
+
+import sys
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, Self
+
+
+class ObjectKey:
+    """
+    A function, class or method: the file it lives in, its ordinal among the top-level objects
+    of that file, its owning class ("" for top-level objects) and its own name.
+
+    Keys hash and compare equal on everything but the ordinal, which only decides ordering;
+    their strings are interned, so most comparisons are identity checks.
+    """
+
+    __slots__ = ("_hash", "class_name", "member", "ordinal", "path")
+
+    path: str
+    ordinal: int
+    class_name: str
+    member: str
+    _hash: int
+
+    def __init__(self, path: str | Path, ordinal: int, class_name: str, member: str):
+        set_slot = object.__setattr__
+        set_slot(self, "path", sys.intern(str(path)))
+        set_slot(self, "ordinal", ordinal)
+        set_slot(self, "class_name", sys.intern(class_name))
+        set_slot(self, "member", sys.intern(member))
+        set_slot(self, "_hash", hash((self.path, self.class_name, self.member)))
+
+    @property
+    def name(self) -> str:
+        return f"{self.class_name}.{self.member}" if self.class_name else self.member
+
+    @property
+    def label(self) -> str:
+        """`path:name`, the form in which keys are reported."""
+        return f"{self.path}:{self.name}"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ObjectKey):
+            return NotImplemented
+        return self is other or (
+            self._hash == other._hash
+            and self.path is other.path
+            and self.class_name is other.class_name
+            and self.member is other.member
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __reduce__(self) -> tuple[type[Self], tuple[str, int, str, str]]:
+        return type(self), (self.path, self.ordinal, self.class_name, self.member)
+
+    def __repr__(self) -> str:
+        return f"ObjectKey({self.path!r}, {self.ordinal}, {self.class_name!r}, {self.member!r})"
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"'ObjectKey' is immutable; cannot set '{name}'.")
+
+    def __str__(self) -> str:
+        return f"{self.path}:{self.ordinal:0>3}:{self.name}"
+
+    @classmethod
+    def from_string(cls, s: str) -> Self:
+        """Inverse of `str`: parse `path:NNN:name` or `path:NNN:Class.member`."""
+        path, ordinal, name = s.rsplit(":", maxsplit=2)
+        class_name, _, member = name.rpartition(".")
+        return cls(path, int(ordinal), class_name, member)
+
+    def transform(self, func: Callable[[str], str]) -> Self:
+        """Apply `func` to the path and both names, as if to the formatted string."""
+        return type(self)(func(self.path), self.ordinal, func(self.class_name), func(self.member))
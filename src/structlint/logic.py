@@ -3,21 +3,29 @@ Functions implementing the core of the code analysis logic.
 """
 
 import re
+from collections import Counter
+from collections.abc import Callable, Iterable
+from functools import cache, lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import grimp
-
+from .cache import ClosureCache
 from .configuration import Configuration, ImportsConfig, MethodsConfig
+from .graphs import shortest_cycle, strongly_connected_components, upstream_closures
+from .keys import ObjectKey
 from .regexes import Regex
+from .syntax import ModuleSyntax
 from .utils import (
     dedup_underscores,
     filter_with,
     filter_without,
     move_path,
     path_matches,
-    remove_ordering_index,
 )
 
+if TYPE_CHECKING:
+    import grimp
+
 SetDict = dict[str, set[str]]
 
 
@@ -49,92 +57,158 @@ def make_doc_filename(p: Path) -> Path:
 
 def make_test_method_path(
     p: Path,
-    i: str,
+    i: int,
     class_name: str,
     method_name: str,
     file_per_class: re.Pattern,
     file_per_directory: re.Pattern,
-) -> str:
+) -> ObjectKey:
     if path_matches(p, file_per_class):
         p = p.parent / p.name.replace(".py", "") / class_name.lower()
     else:
         p = path_matches(p, file_per_directory) or p
 
-    return f"{make_test_filename(p)}:{i:0>3}:Test{class_name}.{make_test_method(method_name)}"
+    return ObjectKey(make_test_filename(p), i, f"Test{class_name}", make_test_method(method_name))
 
 
 def make_doc_class_path(
     p: Path,
-    i: str,
+    i: int,
     class_name: str,
     file_per_class: re.Pattern,
     file_per_directory: re.Pattern,
-) -> str:
+) -> ObjectKey:
     if path_matches(p, file_per_class):
         p = p.parent / p.name.replace(".py", "") / class_name.lower()
     else:
         p = path_matches(p, file_per_directory) or p
 
-    return f"{make_doc_filename(p)}:{i:0>3}:{class_name}"
+    return ObjectKey(make_doc_filename(p), i, "", class_name)
 
 
 def make_test_function_path(
-    p: Path, i: str, function_name: str, file_per_directory: re.Pattern
-) -> str:
+    p: Path, i: int, function_name: str, file_per_directory: re.Pattern
+) -> ObjectKey:
     p = path_matches(p, file_per_directory) or p
-    return f"{make_test_filename(p)}:{i:0>3}:test_{function_name}"
+    return ObjectKey(make_test_filename(p), i, "", f"test_{function_name}")
 
 
 def make_doc_function_path(
-    p: Path, i: str, function_name: str, file_per_directory: re.Pattern
-) -> str:
+    p: Path, i: int, function_name: str, file_per_directory: re.Pattern
+) -> ObjectKey:
     p = path_matches(p, file_per_directory) or p
-    return f"{make_doc_filename(p)}:{i:0>3}:{function_name}"
-
-
-def map_to_test(s: str, cfg: Configuration) -> str:
-    path_str, i, ob = s.split(":")
-    path_ = move_path(path_str, cfg.module_root_dir, cfg.tests.unit_dir)
-    if path_.is_absolute():
-        path_ = path_.relative_to(cfg.root_dir)
-    if "." in ob:
-        class_name, method_name = ob.split(".")
-        result = make_test_method_path(
-            path_,
-            i,
-            class_name,
-            method_name,
-            cfg.tests.file_per_class,
-            cfg.tests.file_per_directory,
-        )
-    elif ob[0].isupper():
-        return ""
-    else:
-        result = make_test_function_path(path_, i, ob, cfg.tests.file_per_directory)
-    return dedup_underscores(result) if cfg.tests.replace_double_underscore else result
-
-
-def map_to_doc(s: str, cfg: Configuration) -> str:
-    path_str, i, ob = s.split(":")
-    path_ = move_path(path_str, cfg.module_root_dir, cfg.docs.md_dir)
-    if path_.is_absolute():
-        path_ = path_.relative_to(cfg.root_dir)
-    if "." in ob:
-        class_name, _ = ob.split(".")
-        result = make_doc_class_path(
-            path_, i, class_name, cfg.docs.file_per_class, cfg.docs.file_per_directory
+    return ObjectKey(make_doc_filename(p), i, "", function_name)
+
+
+@lru_cache(maxsize=16)
+def compile_path_mapper(
+    old_base: Path,
+    new_base: Path,
+    root_dir: Path,
+    file_per_class: re.Pattern,
+    file_per_directory: re.Pattern,
+    make_filename: Callable[[Path], Path],
+    replace_double_underscore: bool,
+) -> Callable[[str, str], str]:
+    """
+    Mapper of a source file, and of a class in it, to its test or doc file, placed as by
+    `make_test_method_path` and the like.
+
+    Built once per configuration; every source file is moved and matched against the patterns
+    only the first time it is seen, so all the objects of a file share the work.
+    """
+
+    def finish(p: Path) -> str:
+        target = str(make_filename(p))
+        return dedup_underscores(target) if replace_double_underscore else target
+
+    @cache
+    def targets_of(path: str) -> tuple[str, Path | None]:
+        p = move_path(path, old_base, new_base)
+        if p.is_absolute():
+            p = p.relative_to(root_dir)
+        split_dir = (
+            p.parent / p.name.replace(".py", "") if path_matches(p, file_per_class) else None
         )
+        return finish(path_matches(p, file_per_directory) or p), split_dir
+
+    @cache
+    def target_path(path: str, class_name: str) -> str:
+        target, split_dir = targets_of(path)
+        if class_name and split_dir is not None:
+            return finish(split_dir / class_name.lower())
+        return target
+
+    return target_path
+
+
+def mapper_to_tests(cfg: Configuration) -> Callable[[str, str], str]:
+    return compile_path_mapper(
+        cfg.module_root_dir,
+        cfg.tests.unit_dir,
+        cfg.root_dir,
+        cfg.tests.file_per_class,
+        cfg.tests.file_per_directory,
+        make_test_filename,
+        cfg.tests.replace_double_underscore,
+    )
+
+
+def mapper_to_docs(cfg: Configuration) -> Callable[[str, str], str]:
+    return compile_path_mapper(
+        cfg.module_root_dir,
+        cfg.docs.md_dir,
+        cfg.root_dir,
+        cfg.docs.file_per_class,
+        cfg.docs.file_per_directory,
+        make_doc_filename,
+        cfg.docs.replace_double_underscore,
+    )
+
+
+def map_to_test(key: ObjectKey, cfg: Configuration) -> ObjectKey | None:
+    if key.class_name:
+        class_name, member = f"Test{key.class_name}", make_test_method(key.member)
+    elif key.member[0].isupper():
+        return None
     else:
-        result = make_doc_function_path(path_, i, ob, cfg.docs.file_per_directory)
-    return dedup_underscores(result) if cfg.docs.replace_double_underscore else result
+        class_name, member = "", f"test_{key.member}"
+    if cfg.tests.replace_double_underscore:
+        class_name, member = dedup_underscores(class_name), dedup_underscores(member)
+    target_path = mapper_to_tests(cfg)
+    return ObjectKey(target_path(key.path, key.class_name), key.ordinal, class_name, member)
+
+
+def map_to_doc(key: ObjectKey, cfg: Configuration) -> ObjectKey:
+    member = key.class_name or key.member
+    if cfg.docs.replace_double_underscore:
+        member = dedup_underscores(member)
+    target_path = mapper_to_docs(cfg)
+    return ObjectKey(target_path(key.path, key.class_name), key.ordinal, "", member)
 
 
 def compute_disallowed(
     allowed: SetDict,
     disallowed: SetDict,
     allowed_everywhere: set[str],
-    graph: grimp.ImportGraph,
+    graph: "grimp.ImportGraph",
+    internal_only: bool = False,
+    closures: dict[str, set[str]] | None = None,
 ) -> SetDict:
+    """
+    With `internal_only`, a graph including external packages is queried as if they were
+    absent: squashed external modules never lead back into the package, so leaving them out
+    of each upstream set gives exactly the upstream set of the internal-only graph.
+
+    Upstream sets are taken from `closures` when given, and asked of `graph` otherwise.
+    """
+    external = {m for m in graph.modules if graph.is_module_squashed(m)} if internal_only else set()
+
+    def find_upstream_modules(module: str) -> set[str]:
+        if closures is None:
+            return graph.find_upstream_modules(module) - external
+        return closures[module] - external
+
     violations: SetDict = {s: set() for s in set(allowed) | set(disallowed)}
     if allowed and disallowed:
         print(
@@ -143,80 +217,241 @@ def compute_disallowed(
         )
     if allowed:
         for module, imports in allowed.items():
-            if module not in graph.modules:
+            if module not in graph.modules or module in external:
                 print(f"    '{module}' is not a module or is not on the import tree.")
                 continue
-            upstream = graph.find_upstream_modules(module)
-            own_submodules = {module} | filter_with(upstream, module)
-            via_allowed = filter_without(
-                upstream,
-                imports | own_submodules | allowed_everywhere,
-            )
+            upstream = find_upstream_modules(module)
+            not_own_submodules = filter_without(upstream, module)
+            via_allowed = filter_without(not_own_submodules, imports | allowed_everywhere)
             violations[module].update(via_allowed)
     else:
         for module, imports in disallowed.items():
-            if module not in graph.modules:
+            if module not in graph.modules or module in external:
                 print(f"    '{module}' is not a module or is not on the import tree.")
                 continue
-            upstream = graph.find_upstream_modules(module)
+            upstream = find_upstream_modules(module)
             via_disallowed = filter_with(upstream, imports)
             violations[module].update(via_disallowed)
 
     return {m: ss for m, ss in violations.items() if ss}
 
 
-def get_disallowed_imports(icfg: ImportsConfig, module_name: str) -> tuple[SetDict, SetDict]:
-    internal_graph = grimp.build_graph(
-        module_name,
-        include_external_packages=False,
-        cache_dir=icfg.grimp_cache,
-    )
-    external_graph = grimp.build_graph(
-        module_name,
-        include_external_packages=True,
-        cache_dir=icfg.grimp_cache,
-    )
+def build_import_graph(
+    modules: Iterable[ModuleSyntax],
+    include_external_packages: bool = False,
+    eager_only: bool = False,
+) -> "grimp.ImportGraph":
+    """
+    Assemble the same import graph `grimp.build_graph` would, from already parsed modules.
+
+    `from a import b` points at `a.b` when that is a module of the package and at `a` otherwise;
+    imports of unknown internal modules are dropped and external imports are squashed to their
+    top-level package. With `eager_only`, deferred imports are left out, leaving the imports
+    that run when a module is loaded.
+    """
+    import grimp  # loaded only by the checks that need an import graph
+
+    modules = list(modules)
+    internal = {m.module for m in modules}
+    packages = {name.split(".")[0] for name in internal}
+    graph = grimp.ImportGraph()
+    for name in internal:
+        graph.add_module(name)
+
+    for m in modules:
+        for statement in m.imports:
+            if eager_only and statement.deferred:
+                continue
+            submodules = [f"{statement.module}.{n}" for n in statement.names]
+            targets = [t if t in internal else statement.module for t in submodules]
+            for target in dict.fromkeys(targets or [statement.module]):
+                parts = target.split(".")
+                if parts[0] not in packages:
+                    if not include_external_packages:
+                        continue
+                    imported = parts[0]
+                    graph.add_module(imported, is_squashed=True)
+                elif (imported := target) not in internal:
+                    continue
+                graph.add_import(
+                    importer=m.module,
+                    imported=imported,
+                    line_number=statement.line_number,
+                    line_contents=statement.line_contents,
+                )
+
+    return graph
+
+
+def load_import_graph(
+    icfg: ImportsConfig, module_name: str, modules: list[ModuleSyntax] | None = None
+) -> "grimp.ImportGraph":
+    """
+    The import graph of the package, external packages included and squashed: assembled from
+    `modules` when they are already parsed, else scanned by grimp through its cache.
+    """
+    if modules is None:
+        import grimp
+
+        return grimp.build_graph(
+            module_name,
+            include_external_packages=True,
+            cache_dir=icfg.grimp_cache,
+        )
+    return build_import_graph(modules, include_external_packages=True)
+
+
+def get_disallowed_imports(
+    icfg: ImportsConfig,
+    module_name: str,
+    modules: list[ModuleSyntax] | None = None,
+    graph: "grimp.ImportGraph | None" = None,
+    closure_cache: ClosureCache | None = None,
+) -> tuple[SetDict, SetDict]:
+    """
+    Internal and external violations, both read off one graph including external packages,
+    so the package is scanned and cached once; the upstream closures of all configured
+    modules are computed together, or taken from `closure_cache` while still valid.
+    """
+    if graph is None:
+        graph = load_import_graph(icfg, module_name, modules)
+    configured = {
+        *icfg.internal.allowed,
+        *icfg.internal.disallowed,
+        *icfg.external.allowed,
+        *icfg.external.disallowed,
+    }
+    closures = upstream_closures(graph, sorted(configured & graph.modules), closure_cache)
+
     internal_disallowed = compute_disallowed(
         icfg.internal.allowed,
         icfg.internal.disallowed,
         icfg.internal_allowed_everywhere,
-        internal_graph,
+        graph,
+        internal_only=True,
+        closures=closures,
     )
     external_disallowed = compute_disallowed(
         icfg.external.allowed,
         icfg.external.disallowed,
         icfg.external_allowed_everywhere,
-        external_graph,
+        graph,
+        closures=closures,
     )
 
     return internal_disallowed, external_disallowed
 
 
-def sort_methods(method_dict: dict[str, str], cfg: MethodsConfig) -> list[str]:
-    regex_pairs: tuple[tuple[re.Pattern, float], ...] = cfg.ordering
-    normal_value: float = cfg.normal
+def find_import_cycles(
+    graph: "grimp.ImportGraph", allowed_cycles: Iterable[frozenset[str]] = ()
+) -> list[tuple[list[str], list[str]]]:
+    """
+    Every import cycle among the internal modules of `graph`, as its members and a witness:
+    a shortest chain of imports from the first member back to itself.
+
+    Cycles are the strongly connected components of more than one module, or of a module
+    importing itself, found in linear time; components lying within one of `allowed_cycles`
+    are accepted.
+    """
+    names = sorted(m for m in graph.modules if not graph.is_module_squashed(m))
+    position = {name: i for i, name in enumerate(names)}
+    imported_by = {name: graph.find_modules_directly_imported_by(name) for name in names}
+    successors = [sorted(position[m] for m in imported_by[name] if m in position) for name in names]
+
+    cycles = []
+    for component in strongly_connected_components(successors):
+        members = sorted(names[i] for i in component)
+        if len(members) == 1 and members[0] not in imported_by[members[0]]:
+            continue
+        if any(allowed.issuperset(members) for allowed in allowed_cycles):
+            continue
+        chain = shortest_cycle(members[0], imported_by.__getitem__, set(members))
+        cycles.append((members, chain))
+    return sorted(cycles)
+
+
+@lru_cache(maxsize=16)
+def compile_method_classifier(
+    ordering: tuple[tuple[re.Pattern, float], ...], normal: float
+) -> Callable[[str], float]:
+    """
+    Classifier of method signatures: the value of the first rule of `ordering` found in the
+    signature, else `normal`.
+
+    The rules are compiled into one alternation, a lookahead per rule in `ordering` order each
+    followed by an empty group named after the rule, so that a single `match` at the start of
+    the signature stops at the first rule found anywhere in it and `lastgroup` tells which.
+    The lookaheads open with a greedy `.*`, which the engine backtracks by jumping to the
+    next possible start of the rule rather than trying every position. Rules the alternation
+    cannot hold unchanged (verbose patterns, named groups, backreferences) make it fall back
+    to one `search` per rule. Results are memoized by signature text.
+    """
+    rules = tuple((re.compile(regexp), value) for regexp, value in ordering)
+    if any(
+        p.flags & re.VERBOSE or p.groupindex or Regex.BACKREFERENCE.search(p.pattern)
+        for p, _ in rules
+    ):
+        searches = tuple((p.search, value) for p, value in rules)
+
+        def first_rule(signature: str) -> float:
+            for search, value in searches:
+                if search(signature):
+                    return value
+            return normal
+    else:
+        scoped = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"))
+        branches = [
+            f"(?=(?s:.*)(?{''.join(c for f, c in scoped if p.flags & f)}:{p.pattern}))"
+            f"(?P<rule_{i}>)"
+            for i, (p, _) in enumerate(rules)
+        ]
+        match = re.compile("|".join(branches) or Regex.MATCH_NOTHING.pattern).match
+        values = {f"rule_{i}": value for i, (_, value) in enumerate(rules)}
+
+        def first_rule(signature: str) -> float:
+            found = match(signature)
+            return values[found.lastgroup] if found and found.lastgroup else normal
+
+    return cache(first_rule)
 
-    def classify_method(s: str) -> float:
-        for regexp, value in regex_pairs:
-            if re.search(regexp, s):
-                return value
-        return normal_value
 
-    return sorted(method_dict, key=lambda k: classify_method(method_dict[k]))
+def sort_methods(method_dict: dict[str, str], cfg: MethodsConfig) -> list[str]:
+    classify = compile_method_classifier(cfg.ordering, cfg.normal)
+    return sorted(method_dict, key=lambda k: classify(method_dict[k]))
 
 
 def analyze_discrepancies(
-    expected: list[str],
-    actual: list[str],
+    expected: list[ObjectKey],
+    actual: list[ObjectKey],
     allow_additional: re.Pattern,
-) -> tuple[list[str], list[str], set[str]]:
-    actual_set = set(actual := list(map(remove_ordering_index, actual)))
-    expected_set = set(expected := list(map(remove_ordering_index, expected)))
-
-    missing: list[str] = [t for t in expected if t not in actual_set]
-    unexpected: list[str] = [
-        t for t in actual if (t not in expected_set) and not re.search(allow_additional, t)
+) -> tuple[list[ObjectKey], list[ObjectKey], set[ObjectKey], list[tuple[ObjectKey, ObjectKey]]]:
+    """
+    Keys ignore their ordinal when compared, so objects match wherever they sit in a file;
+    only unexpected keys are formatted, to be searched for `allow_additional`.
+
+    Missing and unexpected keys are then joined on the object name: a name missing from
+    one file and unexpected in another, once each, is an object that moved, and comes out
+    as an `(expected, actual)` pair instead of in the other two lists.
+    """
+    actual_set, expected_set = set(actual), set(expected)
+
+    missing: list[ObjectKey] = [k for k in expected if k not in actual_set]
+    unexpected: list[ObjectKey] = [
+        k for k in actual if (k not in expected_set) and not re.search(allow_additional, k.label)
     ]
     overlap = actual_set.intersection(expected_set)
 
-    return missing, unexpected, overlap
+    missing_count = Counter(k.name for k in missing)
+    unexpected_count = Counter(k.name for k in unexpected)
+    unexpected_by_name = {k.name: k for k in unexpected}
+    moved = [
+        (k, unexpected_by_name[k.name])
+        for k in missing
+        if missing_count[k.name] == 1 == unexpected_count[k.name]
+    ]
+    if moved:
+        moved_keys = {k for pair in moved for k in pair}
+        missing = [k for k in missing if k not in moved_keys]
+        unexpected = [k for k in unexpected if k not in moved_keys]
+
+    return missing, unexpected, overlap, moved
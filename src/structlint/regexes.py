@@ -25,6 +25,8 @@ class Methods:
 
 
 class Regex:
+    BACKREFERENCE = re.compile(r"\\(?:[1-9]|g<)|\(\?P=")
+    CLASS_HEAD = re.compile(r"class [A-Za-z_][^\n]+:")
     CLASS_NAME = re.compile(r"class ([A-Za-z_][A-Za-z_0-9]+)[:\(\[]")
     DUNDER = re.compile("^__.+?__$")
     FUNCTION_NAME = re.compile(r"(?:^|\n)def ([^\(\[]+)")
@@ -2,18 +2,24 @@
 Helper functions for formatting and displaying analysis results in the console.
 """
 
+import difflib
 import re
 from collections.abc import Callable
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 
+from .keys import ObjectKey
 from .utils import (
     Color,
     make_bar,
     make_colorize_path,
     make_double_bar,
-    remove_ordering_index,
 )
 
+if TYPE_CHECKING:
+    from .footprint import Footprint
+
 
 def make_methods_report(info: list[tuple[Path, str, list[str], list[str]]]) -> str:
     def make_class_report(info_tuple: tuple[Path, str, list[str], list[str]]) -> str:
@@ -71,6 +77,109 @@ def make_imports_report(
     )
 
 
+def make_cycles_report(cycles: list[tuple[list[str], list[str]]]) -> str:
+    def make_cycle_report(cycle: tuple[list[str], list[str]]) -> str:
+        members, chain = cycle
+        return f"    {Color.cyan(', '.join(members))}\n\n        {Color.red(' -> '.join(chain))}"
+
+    if not cycles:
+        return (
+            "\n"
+            + make_double_bar(" IMPORT CYCLES ")
+            + "\n\n"
+            + Color.green("    No problems detected.")
+        )
+    return (
+        "\n"
+        + make_double_bar(" IMPORT CYCLES ")
+        + "\n\n"
+        + "\n\n".join(map(make_cycle_report, cycles))
+    )
+
+
+def make_import_time_report(
+    results: list[tuple[str, dict[str, int]]],
+    budgets: dict[str, int],
+    top: int = 10,
+    failures: dict[str, str] | None = None,
+) -> str:
+    failures = failures or {}
+
+    def make_module_report(result: tuple[str, dict[str, int]]) -> str:
+        entry, times = result
+        heaviest = sorted(times, key=lambda m: (-times[m], m))[:top]
+        shown = heaviest + sorted(m for m in budgets if m in times and m not in heaviest)
+        over = any(times[m] > budgets[m] for m in budgets if m in times)
+        return (
+            f"\n{make_bar(' ' + entry + ' ', colorizer=Color.red if over else Color.no_color)}\n\n"
+            f"{'\n'.join(map(partial(make_line, times), shown))}"
+        )
+
+    def make_line(times: dict[str, int], module: str) -> str:
+        line = f"    {module + '  ':─<50}  {times[module]:>10,} us"
+        if module not in budgets:
+            return line
+        painter = Color.red if times[module] > budgets[module] else Color.green
+        return painter(f"{line}  (budget {budgets[module]:,} us)")
+
+    def make_failure_report(entry: str) -> str:
+        return f"\n{make_bar(' ' + entry + ' ', colorizer=Color.red)}\n\n    {failures[entry]}"
+
+    problems = bool(failures) or any(
+        times[m] > budgets[m] for _, times in results for m in budgets if m in times
+    )
+    return (
+        "\n"
+        + make_double_bar(" IMPORT TIME ")
+        + "\n"
+        + "\n".join([*map(make_module_report, results), *map(make_failure_report, failures)])
+        + ("" if problems else "\n\n" + Color.green("    No problems detected."))
+    )
+
+
+def make_footprint_report(
+    footprints: list[tuple["Footprint", list[tuple[str, int, int]]]],
+) -> str:
+    def make_entry_report(entry_info: tuple["Footprint", list[tuple[str, int, int]]]) -> str:
+        footprint, exceeded = entry_info
+        limits = {name: limit for name, _, limit in exceeded}
+        measures = (
+            ("internal modules", len(footprint.modules)),
+            ("external packages", len(footprint.external_packages)),
+            ("source bytes", footprint.source_bytes),
+        )
+        colorizer = Color.red if exceeded else Color.no_color
+        return (
+            f"\n{make_bar(' ' + footprint.entry + ' ', colorizer=colorizer)}\n\n"
+            f"{'\n'.join(make_measure_line(name, value, limits) for name, value in measures)}"
+            f"\n\n    heaviest imports\n\n"
+            f"{'\n'.join(map(make_import_line, footprint.heaviest_imports))}"
+        )
+
+    def make_measure_line(name: str, value: int, limits: dict[str, int]) -> str:
+        line = f"    {name + '  ':─<30}  {value:>10,}"
+        if name in limits:
+            return Color.red(f"{line}  (max {limits[name]:,})")
+        return line
+
+    def make_import_line(edge: tuple[str, str, int]) -> str:
+        importer, imported, size = edge
+        edge_text = f"{importer} -> {imported}  "
+        return f"        {edge_text:─<60}  {size:>10,} bytes"
+
+    return (
+        "\n"
+        + make_double_bar(" ENTRY-POINT FOOTPRINT ")
+        + "\n"
+        + "\n".join(map(make_entry_report, footprints))
+        + (
+            ""
+            if any(exceeded for _, exceeded in footprints)
+            else "\n\n" + Color.green("    No problems detected.")
+        )
+    )
+
+
 def make_missing_report(missing: list[str], painter: Callable[[str], str]) -> str:
     if not missing:
         return ""
@@ -86,6 +195,15 @@ def make_unexpected_report(unexpected: list[str], painter: Callable[[str], str])
     )
 
 
+def make_moved_report(moved: list[tuple[str, str]], painter: Callable[[str], str]) -> str:
+    """Each moved object where it was found, then where it is expected."""
+    if not moved:
+        return ""
+    width = max(len(painter(found)) for _, found in moved) + 6
+    lines = (f"{painter(found) + '  ':─<{width}}  {painter(expected)}" for expected, found in moved)
+    return f"{make_bar(' MOVED ', Color.red)}\n\n    {'\n    '.join(lines)}\n\n"
+
+
 def make_order_report(
     actual: list[str],
     expected: list[str],
@@ -120,27 +238,64 @@ def make_order_report(
 
 def make_discrepancy_report(
     title: str,
-    actual: list[str],
-    expected: list[str],
-    missing: list[str],
-    unexpected: list[str],
-    overlap: set[str],
+    actual: list[ObjectKey],
+    expected: list[ObjectKey],
+    missing: list[ObjectKey],
+    unexpected: list[ObjectKey],
+    overlap: set[ObjectKey],
     specific_path: Path,
     root_dir: Path,
     ignore: re.Pattern,
+    moved: list[tuple[ObjectKey, ObjectKey]] | None = None,
 ):
     title = f" {title.upper()} "
     paint = make_colorize_path(specific_path, root_dir)
-    actual = list(map(remove_ordering_index, actual))
-    expected = list(map(remove_ordering_index, expected))
-    order_report = make_order_report(actual, expected, overlap, paint, ignore)
+    order_report = make_order_report(
+        [k.label for k in actual],
+        [k.label for k in expected],
+        {k.label for k in overlap},
+        paint,
+        ignore,
+    )
 
-    if not (missing or unexpected or order_report):
+    if not (missing or unexpected or moved or order_report):
         return f"\n{make_double_bar(title)}\n\n    {Color.green('No problems detected.')}"
 
     return (
         f"\n{make_double_bar(title)}\n\n"
-        f"{make_missing_report(missing, paint)}"
-        f"{make_unexpected_report(unexpected, paint)}"
+        f"{make_missing_report([k.label for k in missing], paint)}"
+        f"{make_unexpected_report([k.label for k in unexpected], paint)}"
+        f"{make_moved_report([(e.label, a.label) for e, a in moved or ()], paint)}"
         f"{order_report}"
     ).replace("\n\n\n", "\n\n")
+
+
+def make_which_report(path: str, linked: list[str], is_source: bool) -> str:
+    if not linked:
+        return Color.red(f"    '{path}' is not linked to any source, test or doc file.")
+    heading = "test and doc files" if is_source else "source files"
+    listing = "\n".join(f"        {p}" for p in linked)
+    return f"{Color.cyan(path)}\n\n    {heading}\n\n{listing}"
+
+
+def make_delta_report(previous: dict[str, str], current: dict[str, str]) -> str:
+    """
+    The reports of `current` checks not in `previous` in full, and for the others the lines
+    that appeared, marked `+`, or disappeared, marked `-`; unchanged reports are left out.
+    """
+
+    def make_check_delta(check: str) -> str:
+        if check not in previous:
+            return current[check]
+        lines = difflib.ndiff(previous[check].splitlines(), current[check].splitlines())
+        changes = [line for line in lines if line[:1] in "+-" and line[2:].strip()]
+        if not changes:
+            return ""
+        return f"\n{make_double_bar(f' {check.upper()} ')}\n\n" + "\n".join(
+            Color.green(line) if line.startswith("+") else Color.red(line) for line in changes
+        )
+
+    deltas = [delta for delta in map(make_check_delta, current) if delta]
+    if not deltas:
+        return Color.green("    No change since the last check.")
+    return "\n".join(deltas)
@@ -2,13 +2,21 @@
 Small and simple utility functions.
 """
 
+import os
 import re
-from collections.abc import Callable, Iterable
+from collections import deque
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Literal
+from typing import Literal, TypeVar
 
+from structlint.keys import ObjectKey
 from structlint.regexes import Regex
 
+T = TypeVar("T")
+U = TypeVar("U")
+
 # PATH -----------------------------------------------------------------------
 
 
@@ -24,9 +32,14 @@ def get_project_root() -> Path:
     return _dir
 
 
+@lru_cache(maxsize=16)
+def find_module_root_dir(root: Path) -> Path:
+    """The first directory under `root/src`, relative to `root`; `src/` is listed once per root."""
+    return next((root / "src").iterdir()).relative_to(root)
+
+
 def default_module_root_dir() -> Path:
-    cwd = Path.cwd()
-    return next((cwd / "src").iterdir()).relative_to(cwd)
+    return find_module_root_dir(Path.cwd())
 
 
 def default_module_name() -> str:
@@ -51,6 +64,11 @@ def move_path(p: str | Path, old_base: Path, new_base: Path) -> Path:
     return new_base / p
 
 
+def module_name_from_path(p: Path, base_dir: Path) -> str:
+    parts = p.relative_to(base_dir).with_suffix("").parts
+    return ".".join(parts[:-1] if parts[-1] == "__init__" else parts)
+
+
 # MISCELLANEOUS -------------------------------------------------------------
 
 
@@ -64,8 +82,22 @@ def assert_bool(b: bool) -> bool:
     return b
 
 
-def sort_on_path(strings: Iterable[str]) -> list[str]:
-    return sorted(strings, key=lambda s: s.rsplit(":", maxsplit=1)[0])
+def assert_nonnegative_int(n: int) -> int:
+    if isinstance(n, bool) or not isinstance(n, int):
+        raise TypeError(f"Type 'int' expected; found '{type(n).__name__}'.")
+    if n < 0:
+        raise ValueError(f"Non-negative integer expected; found '{n}'.")
+    return n
+
+
+def assert_one_of(s: str, choices: Iterable[str]) -> str:
+    if s not in (choices := tuple(choices)):
+        raise ValueError(f"One of {', '.join(map(repr, choices))} expected; found '{s}'.")
+    return s
+
+
+def sort_on_path(keys: Iterable[ObjectKey]) -> list[ObjectKey]:
+    return sorted(keys, key=attrgetter("path", "ordinal"))
 
 
 def boolean_merge(incumbent: dict, challenger: dict) -> dict:
@@ -75,31 +107,92 @@ def boolean_merge(incumbent: dict, challenger: dict) -> dict:
 # SEQUENCE PROCESSING --------------------------------------------------------
 
 
-def deduplicate_ordered(strings: Iterable[str]) -> list[str]:
-    new_list = []
-    for s in strings:
-        if s not in new_list:
-            new_list.append(s)
-    return new_list
+def deduplicate_ordered[H: Hashable](items: Iterable[H]) -> list[H]:
+    return list(dict.fromkeys(items))
+
+
+class SubstringMatcher:
+    """
+    Aho-Corasick automaton telling whether a string contains any of a fixed set of patterns,
+    in a single pass over the string however many patterns there are.
+    """
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = frozenset(patterns)
+        goto: list[dict[str, int]] = [{}]
+        terminal = [False]
+        for pattern in self.patterns:
+            state = 0
+            for ch in pattern:
+                if ch not in goto[state]:
+                    goto[state][ch] = len(goto)
+                    goto.append({})
+                    terminal.append(False)
+                state = goto[state][ch]
+            terminal[state] = True
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in goto[state].items():
+                queue.append(child)
+                fallback = fail[state]
+                while fallback and ch not in goto[fallback]:
+                    fallback = fail[fallback]
+                fail[child] = goto[fallback].get(ch, 0) if state else 0
+                terminal[child] = terminal[child] or terminal[fail[child]]
+
+        self._goto, self._fail, self._terminal = goto, fail, terminal
+
+    def search(self, s: str) -> bool:
+        goto, fail, terminal = self._goto, self._fail, self._terminal
+        state = 0
+        if terminal[state]:  # the empty pattern is in every string
+            return True
+        for ch in s:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if terminal[state]:
+                return True
+        return False
+
+
+@lru_cache(maxsize=256)
+def substring_matcher(patterns: frozenset[str]) -> SubstringMatcher:
+    return SubstringMatcher(patterns)
 
 
 def filter_with(string_set: set[str], contained: str | set[str]) -> set[str]:
     if isinstance(contained, str):
         return {s for s in string_set if contained in s}
-    return {s for s in string_set if any(map(lambda c: c in s, contained))}
+    search = substring_matcher(frozenset(contained)).search
+    return {s for s in string_set if search(s)}
 
 
 def filter_without(string_set: set[str], contained: str | set[str]) -> set[str]:
     if isinstance(contained, str):
         return {s for s in string_set if contained not in s}
-    return {s for s in string_set if all(map(lambda c: c not in s, contained))}
+    search = substring_matcher(frozenset(contained)).search
+    return {s for s in string_set if not search(s)}
 
 
-# STRING PROCESSING ----------------------------------------------------------
+def parallel_map(func: Callable[[T], U], items: Sequence[T], jobs: int = 1) -> list[U]:
+    """Order-preserving map over a process pool; `jobs=0` means one worker per CPU."""
+    workers = min(jobs or os.cpu_count() or 1, len(items))
+    if workers <= 1:
+        return list(map(func, items))
+
+    import multiprocessing  # only worth loading once a pool is started
+    from concurrent.futures import ProcessPoolExecutor
 
+    context = multiprocessing.get_context("spawn")  # fork is unsafe once grimp spawned threads
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+        return list(executor.map(func, items, chunksize=max(1, len(items) // (workers * 4))))
 
-def remove_ordering_index(s: str) -> str:
-    return re.sub(r":\d+:", ":", s)
+
+# STRING PROCESSING ----------------------------------------------------------
 
 
 def prepend_module_name(s: str, module_name: str) -> str:
@@ -156,15 +249,44 @@ def get_method_name(s: str) -> str:
     return safe_search(Regex.METHOD_NAME, s, 1)
 
 
+class PathMatcher:
+    """
+    `path_matches` for one pattern, remembering every directory it has seen in a trie of path
+    components: each directory is searched once, and its node keeps its first matching
+    ancestor, itself included, so a later file below it costs one lookup per component.
+    """
+
+    def __init__(self, path_pattern: re.Pattern):
+        self.path_pattern = path_pattern
+        self._search = path_pattern.search
+        self._root: dict[str, tuple[dict, Path | None]] = {}
+
+    def match(self, p: Path | str) -> Path | Literal[False]:
+        parts = (p := Path(p)).parent.parts
+        children, found = self._root, None
+        for depth, part in enumerate(parts):
+            if (node := children.get(part)) is None:
+                directory = Path(*parts[: depth + 1])
+                if found is None and self._search(str(directory)):
+                    found = directory
+                node = children[part] = ({}, found)
+            children, found = node
+        if found is not None:
+            return found
+        return p if self._search(str(p)) else False
+
+
+@lru_cache(maxsize=64)
+def path_matcher(path_pattern: re.Pattern) -> PathMatcher:
+    return PathMatcher(path_pattern)
+
+
 def path_matches(p: Path | str, path_pattern: re.Pattern) -> Path | Literal[False]:
-    for parent in sorted((p := Path(p)).parents):
-        if parent == Path("."):
-            continue
-        if re.search(path_pattern, str(parent)):
-            return parent
-    if re.search(path_pattern, str(p)):
-        return p
-    return False
+    """
+    The shortest of `p` and its ancestors, `.` excepted, in which `path_pattern` is found;
+    answered by the `PathMatcher` of the pattern, shared by all calls with it.
+    """
+    return path_matcher(path_pattern).match(p)
 
 
 def path_matches_not(p: Path | str, path_pattern: re.Pattern) -> bool:
@@ -224,7 +346,6 @@ def make_colorize_path(specific_dir: Path, root_dir: Path) -> Callable[[str], st
 
     def colorize_path(s: str) -> str:
         new_colon = "\u001b[0m:\u001b[31m"
-        s = remove_ordering_index(s)
         s = s.replace(doc_prefix, new_doc_prefix).replace(":", new_colon) + "\u001b[0m"
         return s
 
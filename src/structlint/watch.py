@@ -0,0 +1,99 @@
+"""
+Watch mode: polling the files of a project for changes and checking again what they affect.
+"""
+
+import os
+import time
+from collections.abc import Callable, Iterable
+from pathlib import Path
+
+from .reporting import make_delta_report
+from .workspace import CHECKS, Workspace
+
+Snapshot = dict[str, tuple[int, int]]
+
+
+def scan_files(root_dir: Path, dirs: Iterable[tuple[Path, str]]) -> Snapshot:
+    """
+    `(mtime_ns, size)` of the files with the given suffix below each directory, keyed by their
+    path relative to `root_dir`, from one `os.scandir` sweep, without reading any file.
+    """
+    snapshot: Snapshot = {}
+    for directory, suffix in dirs:
+        pending = [root_dir / directory]
+        while pending:
+            try:
+                entries = list(os.scandir(pending.pop()))
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending.append(Path(entry.path))
+                elif entry.name.endswith(suffix):
+                    stat = entry.stat()
+                    path = os.path.relpath(entry.path, root_dir)
+                    snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def changed_files(before: Snapshot, after: Snapshot) -> set[str]:
+    """Files added, removed or modified between two snapshots."""
+    return {p for p in before.keys() | after.keys() if before.get(p) != after.get(p)}
+
+
+def snapshot_workspace(workspace: Workspace) -> Snapshot:
+    """The source, test and doc files of the project, and its `pyproject.toml`."""
+    cfg = workspace.cfg
+    snapshot = scan_files(
+        cfg.root_dir,
+        [(cfg.module_root_dir, ".py"), (cfg.tests.unit_dir, ".py"), (cfg.docs.md_dir, ".md")],
+    )
+    stat = (cfg.root_dir / "pyproject.toml").stat()
+    snapshot["pyproject.toml"] = (stat.st_mtime_ns, stat.st_size)
+    return snapshot
+
+
+def poll(workspace: Workspace, snapshot: Snapshot) -> tuple[Snapshot, list[str]]:
+    """
+    The files of the project now, and the checks affected by their changes since `snapshot`,
+    once `workspace` forgot what the changes invalidate.
+    """
+    current = snapshot_workspace(workspace)
+    changed = changed_files(snapshot, current)
+    checks = workspace.refresh(changed)
+    # the directories to watch come from the configuration, which may have changed
+    return (snapshot_workspace(workspace) if "pyproject.toml" in changed else current), checks
+
+
+def watch(
+    workspace: Workspace,
+    echo: Callable[[str], None],
+    interval: float = 1.0,
+    cycles: int | None = None,
+) -> bool:
+    """
+    Check the project, then poll it every `interval` seconds and, after each change, run again
+    only the checks the changed files affect, echoing how their results changed; stops after
+    `cycles` checks if given, or on interrupt. Whether the last results had problems.
+    """
+    reports: dict[str, str] = {}
+    problems: dict[str, bool] = {}
+    snapshot = snapshot_workspace(workspace)
+    checks: list[str] = list(CHECKS)
+    done = 0
+    try:
+        while True:
+            if checks:
+                results = {check: workspace.run(check) for check in checks}
+                echo(make_delta_report(reports, {k: r for k, (r, _) in results.items()}))
+                reports.update((k, r) for k, (r, _) in results.items())
+                problems.update((k, p) for k, (_, p) in results.items())
+                workspace.save()
+                done += 1
+                if cycles is not None and done >= cycles:
+                    break
+            time.sleep(interval)
+            snapshot, checks = poll(workspace, snapshot)
+    except KeyboardInterrupt:
+        pass
+    return any(problems.values())
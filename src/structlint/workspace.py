@@ -0,0 +1,203 @@
+"""
+Warm state of a project across checks: its configuration, parse cache, collected objects and
+import graph, each computed on first use and kept until the files it was computed from change.
+"""
+
+from collections.abc import Collection
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from .cache import SYNTAX_FILENAME, ClosureCache, ParseCache
+from .collection import (
+    Objects,
+    collect_docs_objects,
+    collect_source_objects,
+    collect_source_syntax,
+)
+from .configuration import Configuration
+from .syntax import ModuleSyntax
+from .utils import path_matcher
+
+if TYPE_CHECKING:
+    import grimp
+
+CHECKS = ("methods", "docs", "tests", "imports", "cycles", "footprint")
+
+
+class Workspace:
+    """
+    What the checks of one project are computed from, shared between them and between runs.
+
+    `refresh` drops what the changed files invalidate; collecting again afterwards goes through
+    the parse cache kept in memory, so only the files that actually changed are parsed again.
+    """
+
+    def __init__(self, use_cache: bool = True, jobs: int | None = None):
+        self.use_cache = use_cache
+        self.jobs = jobs
+        self._values: dict[str, Any] = {}
+
+    @property
+    def cfg(self) -> Configuration:
+        if "cfg" not in self._values:
+            cfg = Configuration.read(use_cache=self.use_cache)
+            self._values["cfg"] = cfg.merge(
+                jobs=self.jobs, cache_dir=None if self.use_cache else ""
+            )
+        return self._values["cfg"]
+
+    @property
+    def cache(self) -> ParseCache:
+        if "cache" not in self._values:
+            cfg = self.cfg
+            cache_dir = cfg.root_dir / cfg.cache_dir if cfg.cache_dir else None
+            # module names in parse results are relative to the parent of the parsed directory
+            salt = f"{cfg.parser}:{cfg.module_root_dir}:{cfg.tests.unit_dir}"
+            self._values["cache"] = ParseCache(cache_dir, salt=salt)
+        return self._values["cache"]
+
+    @property
+    def source_objects(self) -> Objects:
+        if "source_objects" not in self._values:
+            cfg = self.cfg
+            self._values["source_objects"] = collect_source_objects(
+                cfg.module_root_dir, cfg.root_dir, cfg.jobs, self.cache, cfg.parser
+            )
+        return self._values["source_objects"]
+
+    @property
+    def tests_objects(self) -> Objects:
+        if "tests_objects" not in self._values:
+            cfg = self.cfg
+            self._values["tests_objects"] = collect_source_objects(
+                cfg.tests.unit_dir, cfg.root_dir, cfg.jobs, self.cache, cfg.parser
+            )
+        return self._values["tests_objects"]
+
+    @property
+    def docs_objects(self) -> Objects:
+        if "docs_objects" not in self._values:
+            cfg = self.cfg
+            self._values["docs_objects"] = collect_docs_objects(
+                cfg.docs.md_dir, cfg.root_dir, self.cache
+            )
+        return self._values["docs_objects"]
+
+    @property
+    def source_syntax(self) -> list[ModuleSyntax] | None:
+        """The parsed modules of the package with the `ast` parser, which no other one yields."""
+        return self.source_objects.syntax if self.cfg.parser == "ast" else None
+
+    @property
+    def module_syntax(self) -> list[ModuleSyntax]:
+        """
+        The parsed modules of the package whatever the parser: `source_syntax` with the `ast`
+        parser, otherwise parsed apart, through a parse cache of their own.
+        """
+        if (syntax := self.source_syntax) is not None:
+            return syntax
+        if "module_syntax" not in self._values:
+            cfg = self.cfg
+            if "syntax_cache" not in self._values:
+                cache_dir = cfg.root_dir / cfg.cache_dir if cfg.cache_dir else None
+                self._values["syntax_cache"] = ParseCache(
+                    cache_dir, f"ast:{cfg.module_root_dir}", SYNTAX_FILENAME
+                )
+            self._values["module_syntax"] = collect_source_syntax(
+                cfg.module_root_dir, cfg.root_dir, cfg.jobs, self._values["syntax_cache"]
+            )
+        return self._values["module_syntax"]
+
+    @property
+    def graph(self) -> "grimp.ImportGraph":
+        """The import graph of the package, external packages included and squashed."""
+        if "graph" not in self._values:
+            from .logic import load_import_graph
+
+            cfg = self.cfg
+            self._values["graph"] = load_import_graph(
+                cfg.imports, cfg.module_name, self.source_syntax
+            )
+        return self._values["graph"]
+
+    @property
+    def closure_cache(self) -> ClosureCache | None:
+        """
+        The upstream closures of earlier runs, validated against the file digests the parse
+        cache holds for the parsed modules; `None` unless the `ast` parser yields them.
+        """
+        if "closure_cache" not in self._values:
+            if (syntax := self.source_syntax) is None:
+                return None
+            digests = {m.module: self.cache.digest(m.path) for m in syntax}
+            cfg = self.cfg
+            cache_dir = cfg.root_dir / cfg.cache_dir if cfg.cache_dir else None
+            self._values["closure_cache"] = ClosureCache(
+                cache_dir, {m: d for m, d in digests.items() if d is not None}
+            )
+        return self._values["closure_cache"]
+
+    def refresh(self, changed: Collection[str]) -> list[str]:
+        """
+        Forget what depends on the `changed` paths, relative to the project root, and return
+        the checks whose results they may change; a changed `pyproject.toml` resets everything.
+        The path matchers are reset too, so their tries do not keep every path ever seen.
+        """
+        if changed:
+            path_matcher.cache_clear()
+        if "pyproject.toml" in changed:
+            self.save()
+            self._values.clear()
+            return list(CHECKS)
+        cfg = self.cfg
+
+        def any_below(directory: Path, suffix: str) -> bool:
+            return any(p.endswith(suffix) and Path(p).is_relative_to(directory) for p in changed)
+
+        if any_below(cfg.module_root_dir, ".py"):
+            for name in ("source_objects", "module_syntax", "graph", "closure_cache"):
+                self._values.pop(name, None)
+            return list(CHECKS)
+        checks = []
+        if any_below(cfg.docs.md_dir, ".md"):
+            self._values.pop("docs_objects", None)
+            checks.append("docs")
+        if any_below(cfg.tests.unit_dir, ".py"):
+            self._values.pop("tests_objects", None)
+            checks.append("tests")
+        return checks
+
+    def run(self, check: str) -> tuple[str, bool]:
+        """The report of one of `CHECKS`, and whether it found problems."""
+        from .checks import (
+            check_cycles,
+            check_docs_structure,
+            check_footprint,
+            check_imports,
+            check_method_order,
+            check_tests_structure,
+        )
+
+        cfg = self.cfg
+        if check == "methods":
+            return check_method_order(cfg, self.source_objects)
+        if check == "docs":
+            return check_docs_structure(cfg, self.source_objects, self.docs_objects)
+        if check == "tests":
+            return check_tests_structure(cfg, self.source_objects, self.tests_objects)
+        syntax = self.source_syntax
+        if check == "imports":
+            return check_imports(
+                cfg.imports, cfg.module_name, syntax, self.graph, self.closure_cache
+            )
+        if check == "cycles":
+            return check_cycles(cfg.imports, cfg.module_name, syntax, self.graph)
+        if check == "footprint":
+            return check_footprint(cfg, self.module_syntax)
+        raise ValueError(f"Unknown check '{check}'; expected one of {', '.join(CHECKS)}.")
+
+    def save(self) -> None:
+        """Write the parse caches and the closure cache, if they were used."""
+        for name in ("cache", "syntax_cache", "closure_cache"):
+            if name in self._values:
+                self._values[name].save()
@@ -0,0 +1,243 @@
+import json
+import os
+from pathlib import Path
+
+from structlint import __version__
+from structlint.cache import (
+    CACHE_FILENAME,
+    CACHE_VERSION,
+    CLOSURES_FILENAME,
+    CONFIG_FILENAME,
+    ClosureCache,
+    ConfigCache,
+    JsonFileCache,
+    ParseCache,
+    file_digest,
+)
+
+
+def write_source(tmp_path: Path, text: str = "def f():\n    pass\n") -> Path:
+    source = tmp_path / "module.py"
+    source.write_text(text)
+    return source
+
+
+def test_file_digest(tmp_path: Path) -> None:
+    source = write_source(tmp_path)
+    digest = file_digest(source)
+
+    assert len(digest) == 32
+    assert digest == file_digest(source)
+
+    source.write_text("def g():\n    pass\n")
+    assert digest != file_digest(source)
+
+
+class TestJsonFileCache:
+    def test_header(self, tmp_path: Path) -> None:
+        cache = JsonFileCache(tmp_path / "cache.json", salt="regex")
+        assert cache.header == {
+            "version": CACHE_VERSION,
+            "structlint": __version__,
+            "salt": "regex",
+        }
+
+    def test_save(self, tmp_path: Path) -> None:
+        cache = JsonFileCache(tmp_path / "cache" / "cache.json")
+        cache.save()  # nothing changed, nothing written
+        assert not (tmp_path / "cache").exists()
+
+        cache._entries["a"] = 1
+        cache._dirty = True
+        cache.save()
+        raw = json.loads((tmp_path / "cache" / "cache.json").read_text())
+        assert raw == cache.header | {"entries": {"a": 1}}
+
+        in_memory = JsonFileCache(None)
+        in_memory._dirty = True
+        in_memory.save()
+
+    def test_load(self, tmp_path: Path) -> None:
+        path = tmp_path / "cache.json"
+        assert JsonFileCache(path)._load() == {}
+
+        path.write_text(
+            json.dumps(JsonFileCache(path, salt="regex").header | {"entries": {"a": 1}})
+        )
+        assert JsonFileCache(path, salt="regex")._entries == {"a": 1}
+        assert JsonFileCache(path, salt="tokenize")._entries == {}
+
+        path.write_text("{not json")
+        assert JsonFileCache(path)._entries == {}
+        assert JsonFileCache(None)._entries == {}
+
+
+class TestParseCache:
+    def test_get(self, tmp_path: Path) -> None:
+        source = write_source(tmp_path)
+        cache = ParseCache(tmp_path / "cache")
+        assert cache.get(source) is None
+
+        cache.put(source, [[[0, "f"]], []])
+        assert cache.get(source) == [[[0, "f"]], []]
+
+        # touched but unchanged: the content hash rescues the entry
+        os.utime(source, ns=(0, 0))
+        assert cache.get(source) == [[[0, "f"]], []]
+
+        source.write_text("def g():\n    pass\n")
+        assert cache.get(source) is None
+
+        cache.save()
+        assert ParseCache(tmp_path / "cache", salt="other").get(source) is None
+
+    def test_put(self, tmp_path: Path) -> None:
+        source = write_source(tmp_path)
+        in_memory = ParseCache(None)
+        in_memory.put(source, [])
+        assert in_memory.get(source) == []
+        in_memory.save()
+        assert not (tmp_path / CACHE_FILENAME).exists()
+
+        cache = ParseCache(tmp_path / "cache")
+        cache.put(source, [[0, "f"]])
+        assert cache.get(source) == [[0, "f"]]
+
+    def test_digest(self, tmp_path: Path) -> None:
+        source = write_source(tmp_path)
+        cache = ParseCache(None)
+        assert cache.digest(source) is None
+
+        cache.put(source, [])
+        assert cache.digest(source) == file_digest(source)
+
+    def test_save(self, tmp_path: Path) -> None:
+        source = write_source(tmp_path)
+        (tmp_path / "pkg").mkdir()
+        deleted = write_source(tmp_path / "pkg")
+        cache = ParseCache(tmp_path / "cache")
+        cache.put(source, [[0, "f"]])
+        cache.put(deleted, [[0, "f"]])
+        deleted.unlink()
+        cache.save()
+
+        raw = json.loads((tmp_path / "cache" / CACHE_FILENAME).read_text())
+        assert raw["version"] == CACHE_VERSION
+        assert list(raw["entries"]) == [str(source)]
+        assert ParseCache(tmp_path / "cache").get(source) == [[0, "f"]]
+
+        ParseCache(None).save()
+
+    def test_header(self, tmp_path: Path) -> None:
+        cache = ParseCache(tmp_path, salt="regex")
+        assert cache.header == JsonFileCache(cache.path, salt="regex").header
+        assert cache.path == tmp_path / CACHE_FILENAME
+
+    def test_load(self, tmp_path: Path) -> None:
+        source = write_source(tmp_path)
+        cache = ParseCache(tmp_path, salt="regex")
+        cache.put(source, [[0, "f"]])
+        cache.save()
+
+        assert ParseCache(tmp_path, salt="regex").get(source) == [[0, "f"]]
+        assert ParseCache(tmp_path, salt="tokenize").get(source) is None
+
+        (tmp_path / CACHE_FILENAME).write_text("{not json")
+        assert ParseCache(tmp_path, salt="regex").get(source) is None
+
+
+CLOSURE_DIGESTS = {"a": "1", "b": "2", "c": "3"}
+
+
+class TestClosureCache:
+    def test_get(self, tmp_path: Path) -> None:
+        cache = ClosureCache(tmp_path, CLOSURE_DIGESTS)
+        assert cache.get("a") is None
+
+        cache.put("a", {"b", "click"})
+        assert cache.get("a") == {"b", "click"}
+        cache.save()
+
+        assert ClosureCache(tmp_path, CLOSURE_DIGESTS | {"c": "4"}).get("a") == {"b", "click"}
+        assert ClosureCache(tmp_path, CLOSURE_DIGESTS | {"b": "4"}).get("a") is None
+        assert ClosureCache(tmp_path, CLOSURE_DIGESTS | {"d": "4"}).get("a") is None
+
+    def test_put(self, tmp_path: Path) -> None:
+        cache = ClosureCache(None, CLOSURE_DIGESTS)
+        cache.put("a", {"b", "click"})
+        assert cache._entries["a"] == {"closure": ["b", "click"], "digests": {"a": "1", "b": "2"}}
+
+    def test_header(self, tmp_path: Path) -> None:
+        header = ClosureCache(tmp_path, CLOSURE_DIGESTS).header
+        assert header["salt"] == ClosureCache(tmp_path, {"c": "", "b": "", "a": ""}).salt
+        assert header["salt"] != ClosureCache(tmp_path, {"a": "1"}).salt
+
+    def test_save(self, tmp_path: Path) -> None:
+        cache = ClosureCache(tmp_path / "cache", CLOSURE_DIGESTS)
+        cache.put("b", set())
+        cache.save()
+
+        raw = json.loads((tmp_path / "cache" / CLOSURES_FILENAME).read_text())
+        assert raw["entries"] == {"b": {"closure": [], "digests": {"b": "2"}}}
+        ClosureCache(None, CLOSURE_DIGESTS).save()
+
+    def test_load(self, tmp_path: Path) -> None:
+        cache = ClosureCache(tmp_path, CLOSURE_DIGESTS)
+        cache.put("b", set())
+        cache.save()
+        assert ClosureCache(tmp_path, CLOSURE_DIGESTS).get("b") == set()
+
+        (tmp_path / CLOSURES_FILENAME).write_text("{not json")
+        assert ClosureCache(tmp_path, CLOSURE_DIGESTS).get("b") is None
+
+
+class TestConfigCache:
+    def test_get(self, tmp_path: Path) -> None:
+        cache = ConfigCache(tmp_path)
+        assert cache.get("abc") is None
+
+        cache.put("abc", {"table": {}})
+        assert cache.get("abc") == {"table": {}}
+        assert cache.get("def") is None
+
+    def test_put(self, tmp_path: Path) -> None:
+        cache = ConfigCache(tmp_path)
+        cache.put("abc", {"table": {}})
+        cache.put("def", {"table": {"jobs": 2}})
+        assert cache.get("abc") is None
+        assert cache.get("def") == {"table": {"jobs": 2}}
+
+        disabled = ConfigCache(None)
+        disabled.put("abc", {"table": {}})
+        assert disabled.get("abc") is None
+
+    def test_header(self, tmp_path: Path) -> None:
+        assert ConfigCache(tmp_path).header == {
+            "version": CACHE_VERSION,
+            "structlint": __version__,
+            "salt": "",
+        }
+
+    def test_save(self, tmp_path: Path) -> None:
+        cache = ConfigCache(tmp_path / "cache")
+        cache.put("abc", {"table": {}})
+        cache.save()
+
+        raw = json.loads((tmp_path / "cache" / CONFIG_FILENAME).read_text())
+        assert raw["entries"]["digest"] == "abc"
+        assert ConfigCache(tmp_path / "cache").get("abc") == {"table": {}}
+
+        ConfigCache(None).save()
+
+    def test_load(self, tmp_path: Path) -> None:
+        cache = ConfigCache(tmp_path)
+        cache.put("abc", {"table": {}})
+        cache.save()
+        assert ConfigCache(tmp_path).get("abc") == {"table": {}}
+
+        path = tmp_path / CONFIG_FILENAME
+        path.write_text(json.dumps(json.loads(path.read_text()) | {"version": -1}))
+        assert ConfigCache(tmp_path).get("abc") is None
+
+        path.write_text("{not json")
+        assert ConfigCache(tmp_path).get("abc") is None
@@ -0,0 +1,141 @@
+import re
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from structlint.cache import ParseCache
+from structlint.changes import AffectedFiles, FileIndex, affected_files, changed_paths, run_git
+from structlint.collection import Objects, collect_source_objects
+from structlint.configuration import Configuration, UnitTestsConfig
+
+
+def make_repo(tmp_path: Path) -> Path:
+    def git(*args: str) -> None:
+        subprocess.run(["git", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    (tmp_path / "kept.py").write_text("")
+    (tmp_path / "edited.py").write_text("")
+    (tmp_path / "removed.py").write_text("")
+    git("add", ".")
+    git("-c", "user.name=t", "-c", "user.email=t@t", "commit", "-q", "-m", "initial")
+    (tmp_path / "edited.py").write_text("x = 1\n")
+    (tmp_path / "removed.py").unlink()
+    (tmp_path / "staged.py").write_text("")
+    git("add", "staged.py")
+    (tmp_path / "untracked.py").write_text("")
+    return tmp_path
+
+
+class TestAffectedFiles:
+    def test_package_changed(self) -> None:
+        files = (frozenset({"src/a.py"}), frozenset({"tests/a_test.py"}), frozenset())
+        assert AffectedFiles(*files, frozenset({"src/a.py"})).package_changed
+        assert not AffectedFiles(*files, frozenset({"tests/a_test.py"})).package_changed
+        assert not AffectedFiles(*files).package_changed
+
+
+class TestFileIndex:
+    def test_build(self, tmp_path: Path) -> None:
+        cfg = Configuration(root_dir=tmp_path, module_root_dir=Path("src/pkg"))
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "src" / "pkg" / "a.py").write_text("def f(): ...\n")
+        functions = [(Path("src/pkg/a.py"), 0, "f")]
+        classes = [(Path("src/pkg/a.py"), 1, "A", ["m"], {"m": "def m(self):"}, [])]
+        index = FileIndex.build(cfg, Objects(functions=functions, classes=classes))
+        assert index.targets == {"src/pkg/a.py": (["tests/unit/a_test.py"], ["docs/md/a.md"])}
+
+        cache = ParseCache(tmp_path, salt="index")
+        cache.put(tmp_path / "src/pkg/a.py", [["tests/unit/cached_test.py"], []])
+        index = FileIndex.build(cfg, Objects(functions=functions, classes=[]), cache)
+        assert index.targets == {"src/pkg/a.py": (["tests/unit/cached_test.py"], [])}
+
+    def test_build__edgecases(self, tmp_path: Path) -> None:
+        cfg = Configuration(root_dir=tmp_path, module_root_dir=Path("src/pkg"))
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        for name in ("a", "b"):
+            (tmp_path / "src" / "pkg" / f"{name}.py").write_text("")
+        child = (Path("src/pkg/a.py"), 0, "A", [], {}, ["B"])
+        cache = ParseCache(tmp_path, salt="index")
+
+        base = (Path("src/pkg/b.py"), 0, "B", [], {}, [])
+        index = FileIndex.build(cfg, Objects(functions=[], classes=[child, base]), cache)
+        assert index.targets["src/pkg/a.py"] == ([], ["docs/md/a.md"])
+
+        # the base gains a method in its own file; the cached entry of the child's file is kept
+        base = (Path("src/pkg/b.py"), 0, "B", ["m"], {"m": "def m(self):"}, [])
+        index = FileIndex.build(cfg, Objects(functions=[], classes=[child, base]), cache)
+        assert index.targets["src/pkg/a.py"] == (["tests/unit/a_test.py"], ["docs/md/a.md"])
+        assert cache.get(tmp_path / "src/pkg/a.py") == [[], ["docs/md/a.md"]]
+
+    def test_linked(self) -> None:
+        index = FileIndex(
+            {
+                "src/a.py": (["tests/a_test.py"], ["docs/a.md"]),
+                "src/b.py": (["tests/a_test.py"], []),
+            }
+        )
+        assert index.linked("src/a.py") == {"tests/a_test.py", "docs/a.md"}
+        assert index.linked("tests/a_test.py") == {"src/a.py", "src/b.py"}
+        assert index.linked("docs/a.md") == {"src/a.py"}
+        assert index.linked("README.md") == set()
+
+
+def test_run_git(tmp_path: Path) -> None:
+    repo = make_repo(tmp_path)
+    assert run_git(["ls-files", "-z"], repo) == ["edited.py", "kept.py", "removed.py", "staged.py"]
+
+    with pytest.raises(RuntimeError, match="'git rev-parse nope' failed"):
+        run_git(["rev-parse", "nope"], repo)
+
+
+def test_changed_paths(tmp_path: Path) -> None:
+    repo = make_repo(tmp_path)
+    assert changed_paths(repo) == ["edited.py", "removed.py", "staged.py", "untracked.py"]
+    assert changed_paths(repo, staged=True) == ["staged.py"]
+    assert changed_paths(repo, "HEAD", staged=True) == ["staged.py"]
+
+    (repo / "sub").mkdir()
+    (repo / "sub" / "inner.py").write_text("")
+    assert changed_paths(repo / "sub") == ["inner.py"]
+
+
+def test_affected_files() -> None:
+    cfg = Configuration.read(use_cache=False)
+    source_objects = collect_source_objects(cfg.module_root_dir, cfg.root_dir, parser=cfg.parser)
+    index = FileIndex.build(cfg, source_objects)
+    keys_files = ({"src/structlint/keys.py"}, {"tests/unit/keys_test.py"}, {"docs/md/api/keys.md"})
+
+    for changed in ("src/structlint/keys.py", "tests/unit/keys_test.py", "docs/md/api/keys.md"):
+        affected = affected_files(cfg, index, [changed, "README.md"])
+        assert (affected.sources, affected.tests, affected.docs) == keys_files
+        assert affected.changed == {changed}
+        assert affected.package_changed == changed.startswith("src/")
+    assert affected_files(cfg, index, ["src/structlint/gone.py"]) == AffectedFiles(
+        frozenset({"src/structlint/gone.py"}),
+        frozenset({"tests/unit/gone_test.py"}),
+        frozenset({"docs/md/api/gone.md"}),
+        frozenset({"src/structlint/gone.py"}),
+    )
+    assert affected_files(cfg, index, ["README.md"]) == AffectedFiles(
+        frozenset(), frozenset(), frozenset()
+    )
+
+
+def test_affected_files__edgecases() -> None:
+    cfg = Configuration(
+        root_dir=Path("."),
+        module_root_dir=Path("src/pkg"),
+        tests=UnitTestsConfig(file_per_directory=re.compile(r"/[^/]*?sub")),
+    )
+    functions = [
+        (Path("src/pkg/sub/a.py"), 0, "f"),
+        (Path("src/pkg/sub/b.py"), 0, "g"),
+        (Path("src/pkg/c.py"), 0, "h"),
+    ]
+    index = FileIndex.build(cfg, Objects(functions=functions, classes=[]))
+
+    affected = affected_files(cfg, index, ["src/pkg/sub/a.py"])
+    assert affected.sources == {"src/pkg/sub/a.py", "src/pkg/sub/b.py"}
+    assert affected.tests == {"tests/unit/sub_test.py"}
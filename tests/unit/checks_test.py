@@ -2,10 +2,14 @@ import re
 from pathlib import Path
 from unittest.mock import patch
 
+import grimp
 import pytest
 
 from structlint.checks import (
+    check_cycles,
     check_docs_structure,
+    check_footprint,
+    check_import_time,
     check_imports,
     check_method_order,
     check_tests_structure,
@@ -14,7 +18,9 @@ from structlint.collection import Objects
 from structlint.configuration import (
     Configuration,
     DocsConfig,
+    FootprintConfig,
     ImportsConfig,
+    ImportTimeConfig,
     MethodsConfig,
     UnitTestsConfig,
 )
@@ -653,3 +659,60 @@ def test_check_imports(
         for search_string in not_contained:
             assert not re.search(search_string, result)
         assert result_problems is problems
+
+
+def test_check_cycles():
+    with patch("structlint.checks.find_import_cycles") as mock_finder:
+        mock_finder.return_value = []
+        result, problems = check_cycles(icfg_base, "structlint", graph=grimp.ImportGraph())
+        assert "No problems detected." in result
+        assert problems is False
+
+        mock_finder.return_value = [(["pkg.a", "pkg.b"], ["pkg.a", "pkg.b", "pkg.a"])]
+        result, problems = check_cycles(icfg_base, "structlint", graph=grimp.ImportGraph())
+        assert "pkg.a -> pkg.b -> pkg.a" in result
+        assert problems is True
+
+    result, problems = check_cycles(icfg_base, "structlint")
+    assert "No problems detected." in result
+    assert problems is False
+
+
+def test_check_import_time():
+    cfg = Configuration(module_name="pkg", import_time=ImportTimeConfig(budgets={"pkg.a": 400}))
+    with patch("structlint.importtime.median_import_times") as mock_timer:
+        mock_timer.return_value = {"pkg": 900, "pkg.a": 300}
+        result, problems = check_import_time(cfg)
+        mock_timer.assert_called_once_with("pkg", 5, cfg.root_dir)
+        assert "No problems detected." in result
+        assert problems is False
+
+        mock_timer.return_value = {"pkg": 900, "pkg.a": 500}
+        result, problems = check_import_time(cfg)
+        assert "(budget 400 us)" in result
+        assert problems is True
+
+        mock_timer.side_effect = ImportError("Module 'pkg' could not be imported: boom")
+        result, problems = check_import_time(cfg)
+        assert "Module 'pkg' could not be imported: boom" in result
+        assert problems is True
+
+
+def test_check_footprint(capsys):
+    root_dir = Path(__file__).parents[2]
+    cfg = Configuration(
+        root_dir=root_dir,
+        module_name="structlint",
+        module_root_dir=Path("src/structlint"),
+        scripts={"structlint": "structlint.cli:main", "other": "structlint.missing:main"},
+    )
+    result, problems = check_footprint(cfg)
+    assert "structlint.cli" in result
+    assert "No problems detected." in result
+    assert problems is False
+    assert "'structlint.missing' is not a module of 'structlint'" in capsys.readouterr().err
+
+    cfg.merge(footprint=FootprintConfig(max_modules=1))
+    result, problems = check_footprint(cfg)
+    assert "(max 1)" in result
+    assert problems is True
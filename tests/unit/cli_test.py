@@ -1,11 +1,27 @@
+import subprocess
+import sys
+import threading
 import tomllib
 from pathlib import Path
+from unittest.mock import PropertyMock, patch
 
+import click
+import pytest
 from click.testing import CliRunner
 
+from structlint.changes import AffectedFiles
+from structlint.checks import check_imports
 from structlint.cli import (
+    combine_results,
+    load_affected,
+    load_context,
+    load_index,
+    load_workspace,
     structlint_cli,
 )
+from structlint.collection import Objects, collect_source_objects
+from structlint.daemon import Daemon, is_running
+from structlint.workspace import Workspace
 
 
 def get_version() -> str:
@@ -19,7 +35,130 @@ def test_structlint_cli(capsys):
     assert "No problems detected." in result.output
 
 
+def test_combine_results() -> None:
+    ctx = click.Context(structlint_cli, obj={"NO_CACHE": True})
+    with ctx:
+        ctx.invoked_subcommand = "*"
+        assert ctx.invoke(combine_results, [False, True]) is True
+        assert ctx.invoke(combine_results, [False, False]) is False
+        ctx.invoked_subcommand = None
+        with patch("structlint.cli.run_all.callback", return_value=True) as run_all:
+            assert ctx.invoke(combine_results, [])
+        run_all.assert_called_once()
+
+    runner = CliRunner()
+    with patch(
+        "structlint.workspace.collect_source_objects", wraps=collect_source_objects
+    ) as collect:
+        result = runner.invoke(structlint_cli, ["--no-cache", "methods", "tests", "docs"])
+    assert result.exit_code == 0
+    assert "METHOD ORDER" in result.output
+    assert "TESTS" in result.output
+    assert "DOCUMENTATION" in result.output
+    assert collect.call_count == 2  # the sources and the tests, each collected once
+
+
+def test_load_workspace() -> None:
+    ctx = click.Context(structlint_cli, obj={"JOBS": 2, "NO_CACHE": True})
+    with ctx:
+        workspace = load_workspace(ctx)
+        assert load_workspace(ctx) is workspace
+        assert (workspace.use_cache, workspace.jobs) == (False, 2)
+
+    workspace = Workspace(use_cache=False)
+    ctx = click.Context(structlint_cli, obj={"WORKSPACE": workspace})
+    with ctx, patch.object(workspace, "save") as save:
+        assert load_workspace(ctx) is workspace
+    save.assert_not_called()
+
+
+def test_load_context() -> None:
+    ctx = click.Context(structlint_cli, obj={"JOBS": 3, "NO_CACHE": True})
+    with ctx:
+        cfg, cache = load_context(ctx)
+        assert load_context(ctx) == (cfg, cache)
+        assert cfg.jobs == 3
+        assert cfg.cache_dir == ""
+        assert cache.path is None
+
+    workspace = Workspace(use_cache=False)
+    ctx = click.Context(structlint_cli, obj={"WORKSPACE": workspace})
+    with ctx:
+        assert load_context(ctx) == (workspace.cfg, workspace.cache)
+
+
+def test_load_affected() -> None:
+    ctx = click.Context(structlint_cli, obj={"NO_CACHE": True})
+    with ctx:
+        cfg, _ = load_context(ctx)
+        assert load_affected(ctx, cfg, Objects([], [])) is None
+
+    ctx = click.Context(structlint_cli, obj={"NO_CACHE": True, "STAGED": True})
+    with ctx, patch("structlint.changes.changed_paths", return_value=["src/structlint/keys.py"]):
+        cfg, _ = load_context(ctx)
+        source_objects = Objects([(Path("src/structlint/keys.py"), 0, "f")], [])
+        affected = load_affected(ctx, cfg, source_objects)
+        assert affected is not None
+        assert affected.tests == {"tests/unit/keys_test.py"}
+        assert load_affected(ctx, cfg, Objects([], [])) is affected
+
+    ctx = click.Context(structlint_cli, obj={"NO_CACHE": True, "CHANGED_SINCE": "HEAD"})
+    with ctx, patch("structlint.changes.changed_paths", return_value=["pyproject.toml"]):
+        cfg, _ = load_context(ctx)
+        assert load_affected(ctx, cfg, Objects([], [])) is None
+
+    error = RuntimeError("'git diff' failed")
+    ctx = click.Context(structlint_cli, obj={"NO_CACHE": True, "CHANGED_SINCE": "nope"})
+    with ctx, patch("structlint.changes.changed_paths", side_effect=error):
+        cfg, _ = load_context(ctx)
+        with pytest.raises(click.ClickException, match="'git diff' failed"):
+            load_affected(ctx, cfg, Objects([], []))
+
+    runner = CliRunner()
+    with patch("structlint.changes.changed_paths", return_value=["src/structlint/keys.py"]):
+        result = runner.invoke(structlint_cli, ["--staged", "all"])
+    assert result.exit_code == 0
+    assert "DOCUMENTATION" in result.output
+    assert "IMPORT CYCLES" in result.output
+
+    with patch("structlint.changes.changed_paths", return_value=["tests/unit/keys_test.py"]):
+        result = runner.invoke(structlint_cli, ["--changed-since", "HEAD", "all"])
+    assert result.exit_code == 0
+    assert "TESTS" in result.output
+    assert "IMPORT CYCLES" not in result.output
+
+
+def test_load_index(tmp_path) -> None:
+    source_objects = Objects([(Path("src/structlint/keys.py"), 0, "f")], [])
+    ctx = click.Context(structlint_cli, obj={"NO_CACHE": True})
+    with ctx:
+        cfg, _ = load_context(ctx)
+        index = load_index(ctx, cfg, source_objects)
+        assert index.linked("tests/unit/keys_test.py") == {"src/structlint/keys.py"}
+        assert load_index(ctx, cfg, Objects([], [])) is index
+
+    ctx = click.Context(structlint_cli, obj={"NO_CACHE": True})
+    with ctx:
+        cfg, _ = load_context(ctx)
+        cfg.cache_dir = tmp_path
+        load_index(ctx, cfg, source_objects)
+    assert (tmp_path / "index.json").exists()
+
+
 def test_version(capsys):
+    code = (
+        "import sys\n"
+        "from structlint.cli import structlint_cli\n"
+        "structlint_cli(['version'], standalone_mode=False)\n"
+        "print(*sorted(sys.modules))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    loaded = set(output.splitlines()[-1].split())
+    assert {m for m in loaded if m.startswith("structlint")} == {"structlint", "structlint.cli"}
+    assert not loaded & {"grimp", "concurrent.futures", "multiprocessing", "subprocess", "tomllib"}
+
     expected_version = get_version()
     runner = CliRunner()
     result = runner.invoke(structlint_cli, ["version"])
@@ -37,6 +176,39 @@ def test_run_all(capsys):
     result = runner.invoke(structlint_cli, ["all"])
     assert result.exit_code == 0
     assert "No problems detected." in result.output
+    assert "internal modules" not in result.output  # no footprint limits are configured
+
+    parallel_result = runner.invoke(structlint_cli, ["--jobs", "2", "all"])
+    assert parallel_result.exit_code == 0
+    assert parallel_result.output == result.output
+
+    uncached_result = runner.invoke(structlint_cli, ["--no-cache", "all"])
+    assert uncached_result.exit_code == 0
+    assert uncached_result.output == result.output
+
+    threads = []
+
+    def record_thread(*args, **kwargs):
+        threads.append(threading.current_thread().name)
+        return check_imports(*args, **kwargs)
+
+    with patch("structlint.checks.check_imports", side_effect=record_thread):
+        concurrent_result = runner.invoke(structlint_cli, ["all"])
+    assert concurrent_result.output == result.output
+    assert len(threads) == 1 and threads[0].startswith("structlint-imports")
+
+    tests_only = AffectedFiles(frozenset(), frozenset({"tests/unit/cli_test.py"}), frozenset())
+    with (
+        patch("structlint.cli.load_affected", return_value=tests_only),
+        patch("structlint.workspace.Workspace.graph", new_callable=PropertyMock) as graph,
+    ):
+        restricted_result = runner.invoke(structlint_cli, ["all"])
+    assert restricted_result.exit_code == 0
+    graph.assert_not_called()
+
+    with patch("structlint.checks.check_imports", side_effect=RuntimeError("graph failed")):
+        failed_result = runner.invoke(structlint_cli, ["all"])
+    assert isinstance(failed_result.exception, RuntimeError)
 
 
 def test_docs(capsys):
@@ -53,6 +225,31 @@ def test_imports(capsys):
     assert "No problems detected." in result.output
 
 
+def test_cycles(capsys):
+    runner = CliRunner()
+    result = runner.invoke(structlint_cli, ["cycles"])
+    assert result.exit_code == 0
+    assert "IMPORT CYCLES" in result.output
+    assert "No problems detected." in result.output
+
+
+def test_footprint(capsys):
+    runner = CliRunner()
+    result = runner.invoke(structlint_cli, ["footprint"])
+    assert result.exit_code == 0
+    assert "structlint.cli" in result.output
+    assert "No problems detected." in result.output
+
+
+def test_import_time(capsys):
+    runner = CliRunner()
+    with patch("structlint.importtime.median_import_times", return_value={"structlint.cli": 1}):
+        result = runner.invoke(structlint_cli, ["import-time"])
+    assert result.exit_code == 0
+    assert "IMPORT TIME" in result.output
+    assert "No problems detected." in result.output
+
+
 def test_methods(capsys):
     runner = CliRunner()
     result = runner.invoke(structlint_cli, ["methods"])
@@ -67,6 +264,102 @@ def test_tsts(capsys):
     assert "No problems detected." in result.output
 
 
+def test_which() -> None:
+    runner = CliRunner()
+    result = runner.invoke(structlint_cli, ["which", "src/structlint/keys.py"])
+    assert result.exit_code == 0
+    assert "test and doc files" in result.output
+    assert "tests/unit/keys_test.py" in result.output
+    assert "docs/md/api/keys.md" in result.output
+
+    result = runner.invoke(structlint_cli, ["which", "tests/unit/keys_test.py"])
+    assert result.exit_code == 0
+    assert "src/structlint/keys.py" in result.output
+
+    result = runner.invoke(structlint_cli, ["which", "README.md"])
+    assert "is not linked" in result.output
+
+    result = runner.invoke(structlint_cli, ["which", "/"])
+    assert result.exit_code == 2
+    assert "outside of the project" in result.output
+
+
+def test_watch() -> None:
+    runner = CliRunner()
+    with patch("structlint.watch.watch", return_value=False) as watch_files:
+        result = runner.invoke(structlint_cli, ["--no-cache", "watch", "--interval", "0.5"])
+    assert result.exit_code == 0
+    assert "every 0.5s" in result.output
+    workspace, _, interval = watch_files.call_args.args
+    assert (workspace.use_cache, interval) == (False, 0.5)
+
+    result = runner.invoke(structlint_cli, ["watch", "--interval", "0"])
+    assert result.exit_code == 2
+
+
+def test_daemon(tmp_path: Path) -> None:
+    runner = CliRunner()
+    path = tmp_path / "daemon.sock"
+    with patch("structlint.daemon.socket_path", return_value=path):
+        result = runner.invoke(structlint_cli, ["daemon", "--stop"])
+        assert result.exit_code == 1
+        assert "No structlint daemon is listening" in result.output
+
+        with patch.object(Daemon, "serve", side_effect=KeyboardInterrupt) as serve:
+            result = runner.invoke(structlint_cli, ["--no-cache", "daemon"])
+        assert result.exit_code == 0
+        assert f"Listening at '{path}'" in result.output
+        serve.assert_called_once_with(path)
+
+        daemon = Daemon(Workspace(use_cache=False), structlint_cli)
+        thread = threading.Thread(target=daemon.serve, args=(path,), daemon=True)
+        thread.start()
+        for _ in range(500):
+            if is_running(path):
+                break
+            thread.join(0.01)
+
+        result = runner.invoke(structlint_cli, ["daemon"])
+        assert result.exit_code == 1
+        assert "already listening" in result.output
+
+        result = runner.invoke(structlint_cli, ["daemon", "--stop"])
+        assert result.exit_code == 0
+        assert "Stopped the structlint daemon" in result.output
+        thread.join(5)
+        assert not thread.is_alive()
+
+
+def test_client(tmp_path: Path) -> None:
+    runner = CliRunner()
+    path = tmp_path / "daemon.sock"
+    with patch("structlint.daemon.socket_path", return_value=path):
+        result = runner.invoke(structlint_cli, ["client", "methods"])
+        assert result.exit_code == 1
+        assert "start one with 'structlint daemon'" in result.output
+
+        daemon = Daemon(Workspace(use_cache=False), structlint_cli)
+        thread = threading.Thread(target=daemon.serve, args=(path,), daemon=True)
+        thread.start()
+        for _ in range(500):
+            if is_running(path):
+                break
+            thread.join(0.01)
+
+        result = runner.invoke(structlint_cli, ["client", "--staged", "methods"])
+        assert result.exit_code == 0
+        assert "METHOD ORDER" in result.output
+        result = runner.invoke(structlint_cli, ["client", "which", "README.md"])
+        assert result.exit_code == 1
+        result = runner.invoke(structlint_cli, ["client", "nope"])
+        assert result.exit_code == 2
+        assert "No such command 'nope'" in result.output
+
+        daemon.stopped = True
+        runner.invoke(structlint_cli, ["client", "version"])
+        thread.join(5)
+
+
 def test_show_config() -> None:
     runner = CliRunner()
     result = runner.invoke(structlint_cli, ["show-config"])
@@ -2,21 +2,33 @@ import re
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pytest
+
+from structlint.cache import ParseCache
 from structlint.collection import (
     ClassInfo,
     Objects,
     add_inherited_methods,
+    blank_triple_quoted,
     collect_docs_objects,
+    collect_file_objects,
     collect_method_info,
     collect_object_texts,
     collect_objects_in_md,
     collect_source_objects,
+    collect_source_syntax,
+    order_bases_first,
     parse_function,
+    resolve_bases,
+    scan_object_texts,
+    scan_top_level,
 )
+from structlint.keys import ObjectKey
+from structlint.syntax import ClassSyntax, FunctionSyntax, ModuleSyntax
 
 
 class TestObjects:
-    def test_function_strings(self) -> None:
+    def test_function_keys(self) -> None:
         functions = [
             (Path("src/module.py"), 0, "test_function"),
             (Path("src/utils.py"), 5, "helper_func"),
@@ -25,20 +37,22 @@ class TestObjects:
         classes: list[ClassInfo] = []
 
         objects = Objects(functions=functions, classes=classes)
-        expected = [
+        expected = (
             "src/module.py:000:test_function",
             "src/utils.py:005:helper_func",
             "lib/core.py:012:process_data",
-        ]
+        )
 
-        assert objects.function_strings == expected
+        assert tuple(map(str, objects.function_keys)) == expected
+        assert objects.function_keys is objects.function_keys
+        assert objects.function_keys[1] == ObjectKey("src/utils.py", 5, "", "helper_func")
 
-    def test_strings_without_methods(self) -> None:
+    def test_keys_without_methods(self) -> None:
         functions = [(Path("src/utils.py"), 0, "helper")]
         classes: list[ClassInfo] = [(Path("src/models.py"), 1, "User", ["login"], {}, [])]
 
         objects = Objects(functions=functions, classes=classes)
-        result: list = objects.strings_without_methods
+        result = list(map(str, objects.keys_without_methods))
 
         assert "src/utils.py:000:helper" in result
         assert "src/models.py:001:User" in result
@@ -52,13 +66,14 @@ class TestObjects:
             (Path("src/admin.py"), 2, "AdminUser", ["ban_user"], {}, ["User"]),
         ]
 
-        result: list[str] = Objects(functions=functions, classes=classes).classes_only
-        # Note: classes are sorted by path, methods are processed in order
-        expected = [
+        result = Objects(functions=functions, classes=classes + classes[:1]).classes_only
+        result = tuple(map(str, result))
+        # Note: classes are deduplicated and sorted by path
+        expected = (
             "src/admin.py:002:AdminUser",
             "src/base.py:001:BaseModel",
             "src/models.py:000:User",
-        ]
+        )
 
         assert result == expected
 
@@ -72,9 +87,9 @@ class TestObjects:
         ]
 
         objects = Objects(functions=functions, classes=classes)
-        expected = ["src/empty.py:001:EmptyClass", "src/data.py:002:DataClass"]
+        expected = ("src/empty.py:001:EmptyClass", "src/data.py:002:DataClass")
 
-        assert objects.methodless == expected
+        assert tuple(map(str, objects.methodless)) == expected
 
     def test_test_only(self) -> None:
         functions = [
@@ -88,7 +103,7 @@ class TestObjects:
             (Path("src/admin.py"), 2, "TestAdminUser", ["ban_user"], {}, ["User"]),
         ]
 
-        test_objects: list[str] = Objects(functions=functions, classes=classes).test_only.strings(
+        test_objects = Objects(functions=functions, classes=classes).test_only.keys(
             include_inherited=False
         )
         expected = [
@@ -98,14 +113,102 @@ class TestObjects:
             "src/module.py:003:test_function",
         ]
 
-        assert sorted(test_objects) == expected
+        assert sorted(map(str, test_objects)) == expected
+
+        inheriting: list[ClassInfo] = [
+            (Path("tests/base.py"), 0, "Mixin", ["test_shared"], {}, []),
+            (Path("tests/a_test.py"), 0, "TestA", ["test_own"], {}, ["Mixin"]),
+        ]
+        objects = Objects(functions=[], classes=inheriting)
+        assert objects.test_only is objects.test_only
+        assert tuple(map(str, objects.test_only.method_keys())) == (
+            "tests/a_test.py:000:TestA.test_own",
+            "tests/a_test.py:000:TestA.test_shared",
+        )
+        assert objects.test_only.method_keys(include_inherited=False) == (
+            ObjectKey("tests/a_test.py", 0, "TestA", "test_own"),
+        )
 
-    def test_strings(self) -> None:
+    def test_method_key_views(self) -> None:
+        classes: list[ClassInfo] = [
+            (Path("src/base.py"), 0, "Base", ["save"], {}, []),
+            (Path("src/user.py"), 1, "User", ["login"], {}, ["Base"]),
+        ]
+        views = Objects(functions=[], classes=classes)._method_key_views
+
+        assert {k: tuple(map(str, v)) for k, v in views.items()} == {
+            False: ("src/base.py:000:Base.save", "src/user.py:001:User.login"),
+            True: (
+                "src/base.py:000:Base.save",
+                "src/user.py:001:User.login",
+                "src/user.py:001:User.save",
+            ),
+        }
+
+    def test_key_views(self) -> None:
+        functions = [(Path("src/utils.py"), 0, "helper")]
+        classes: list[ClassInfo] = [
+            (Path("src/base.py"), 0, "Base", ["save"], {}, []),
+            (Path("src/user.py"), 1, "User", [], {}, ["Base"]),
+        ]
+        views = Objects(functions=functions, classes=classes)._key_views
+
+        assert {k: tuple(map(str, v)) for k, v in views.items()} == {
+            False: ("src/base.py:000:Base.save", "src/utils.py:000:helper"),
+            True: (
+                "src/base.py:000:Base.save",
+                "src/user.py:001:User.save",
+                "src/utils.py:000:helper",
+            ),
+        }
+
+    def test_dunder_setattr(self) -> None:
+        objects = Objects(functions=[], classes=[])
+
+        with pytest.raises(AttributeError, match="'Objects' is immutable; cannot set 'functions'."):
+            objects.functions = ()
+        assert objects.methodless == ()
+
+    def test_from_syntax(self) -> None:
+        method = FunctionSyntax("save", 0, ("final",), "@final\n    def save(self):")
+        modules = [
+            ModuleSyntax(
+                Path("src/models.py"),
+                "models",
+                functions=(FunctionSyntax("helper", 1, (), "def helper():"),),
+                classes=(
+                    ClassSyntax("Base", 0, (), (method,)),
+                    ClassSyntax("User", 2, ("Base",), ()),
+                ),
+            )
+        ]
+        objects = Objects.from_syntax(modules)
+
+        assert objects.syntax is modules
+        assert objects.functions == ((Path("src/models.py"), 1, "helper"),)
+        assert objects.classes(include_inherited=False) == (
+            (
+                Path("src/models.py"),
+                0,
+                "Base",
+                ["save"],
+                {"save": "@final\n    def save(self):"},
+                [],
+            ),
+            (Path("src/models.py"), 2, "User", [], {}, ["Base"]),
+        )
+        assert tuple(map(str, objects.keys())) == (
+            "src/models.py:000:Base.save",
+            "src/models.py:002:User.save",
+            "src/models.py:001:helper",
+        )
+
+    def test_keys(self) -> None:
         functions = [(Path("src/utils.py"), 0, "helper")]
         classes: list[ClassInfo] = [(Path("src/models.py"), 1, "User", ["login"], {}, [])]
 
         objects = Objects(functions=functions, classes=classes)
-        result: list = objects.strings()
+        result = list(map(str, objects.keys()))
 
         assert "src/utils.py:000:helper" in result
         assert "src/models.py:001:User.login" in result
@@ -123,7 +226,7 @@ class TestObjects:
 
         assert objects._all_classes == objects.classes() != objects._classes
 
-    def test_method_strings(self) -> None:
+    def test_method_keys(self) -> None:
         functions = [(Path("src/utils.py"), 0, "helper")]
         classes: list[ClassInfo] = [
             (Path("src/models.py"), 0, "User", ["login", "logout"], {}, []),
@@ -142,7 +245,7 @@ class TestObjects:
         ]
 
         objects = Objects(functions=functions, classes=classes)
-        result: list = objects.method_strings()
+        result = list(map(str, objects.method_keys()))
 
         assert sorted(result) == expected
 
@@ -154,31 +257,52 @@ class TestObjects:
         objects = Objects(functions=functions, classes=classes)
 
         # simple processor
-        def add_prefix(s):
-            return f"processed_{s}"
+        def add_prefix(k: ObjectKey) -> ObjectKey:
+            return k.transform(lambda s: f"processed_{s}" if s else s)
 
         result: list = objects.apply(add_prefix)
-        assert all(s.startswith("processed_") for s in result)
+        assert all(k.path.startswith("processed_") for k in result)
 
-        # with ignore pattern
+        # with ignore pattern, searched in the formatted key
         ignore_pattern = re.compile(r".*models\.py.*")
         result = objects.apply(add_prefix, ignore=ignore_pattern)
         assert len(result) == 1
-        assert "processed_src/utils.py:000:test_func" in result
+        assert str(result[0]) == "processed_src/utils.py:000:processed_test_func"
+        assert objects.apply(add_prefix, ignore=re.compile(r":000:")) == [
+            add_prefix(ObjectKey("src/models.py", 1, "User", "login"))
+        ]
 
         # with classes_only
         empty_classes: list[ClassInfo] = [(Path("src/empty.py"), 2, "Empty", [], {}, [])]
         objects_with_classes_only = Objects(functions=functions, classes=classes + empty_classes)
 
         result = objects_with_classes_only.apply(add_prefix, classes_only=True)
-        assert any("Empty" in s for s in result)
+        assert any("Empty" in k.member for k in result)
 
-        # with processor that returns empty string
-        def filter_processor(s):
-            return "" if "models" in s else s
+        # with processor that drops keys
+        def filter_processor(k: ObjectKey) -> ObjectKey | None:
+            return None if "models" in k.path else k
 
         result = objects.apply(filter_processor)
-        assert all("models" not in s for s in result)
+        assert all("models" not in k.path for k in result)
+
+    def test_restricted_to(self) -> None:
+        functions = [(Path("src/a.py"), 0, "f"), (Path("src/b.py"), 0, "g")]
+        classes: list[ClassInfo] = [
+            (Path("src/a.py"), 1, "Base", ["base_method"], {}, []),
+            (Path("src/b.py"), 1, "Child", ["own_method"], {}, ["Base"]),
+        ]
+        objects = Objects(functions=functions, classes=classes)
+
+        restricted = objects.restricted_to({"src/b.py"})
+        assert restricted.function_keys == (ObjectKey("src/b.py", 0, "", "g"),)
+        assert restricted.classes_only == (ObjectKey("src/b.py", 1, "", "Child"),)
+        assert restricted.method_keys(include_inherited=True) == (
+            ObjectKey("src/b.py", 1, "Child", "own_method"),
+            ObjectKey("src/b.py", 1, "Child", "base_method"),
+        )
+        assert restricted.syntax is None
+        assert objects.restricted_to(set()).keys() == ()
 
 
 def test_collect_method_info() -> None:
@@ -373,7 +497,127 @@ def last_function():
     assert any("DataClass" in text for text in result)
 
 
-def test_collect_source_objects() -> None:
+def test_scan_top_level() -> None:
+    source = 'X = 1\n\n\n@deco\ndef f():\n    """Doc."""\n\n\nclass A:\n    y = f"""{X}"""\n'
+    statements, triple_quoted = scan_top_level(source)
+
+    assert [keyword for keyword, _ in statements] == ["X", "@", "def", "class"]
+    assert [source[start:].split("\n")[0] for _, start in statements] == [
+        "X = 1",
+        "@deco",
+        "def f():",
+        "class A:",
+    ]
+    assert [source[start:end] for start, end, _ in triple_quoted] == ['"""Doc."""', '"""{X}"""']
+
+
+def test_blank_triple_quoted() -> None:
+    source = 'class A:\n    """Doc\n\n    def fake(): ..."""\n    b = r"""x"""\n'
+    _, triple_quoted = scan_top_level(source)
+
+    assert blank_triple_quoted(source, 0, len(source), triple_quoted) == (
+        'class A:\n    """  """\n    b = r"""  """\n'
+    )
+    assert blank_triple_quoted(source, 0, 8, triple_quoted) == "class A:"
+
+
+def test_scan_object_texts() -> None:
+    samples = [
+        Path(__file__).parent.parent / "_data/complex/src/hello/__init__.py",
+        *sorted((Path(__file__).parents[2] / "src").rglob("*.py")),
+    ]
+    for sample in samples:
+        source = sample.read_text()
+        assert scan_object_texts(source) == collect_object_texts(source)
+
+    source = (
+        "import os\n\n\n"
+        "@decorator\n"
+        "def function1():\n"
+        "    '''A docstring with a\n\n    class Fake:\n        pass\n    '''\n\n\n"
+        "class Class1(Base):\n    def method1(self):\n        pass\n\n\n"
+        "last = 1\n"
+    )
+    assert scan_object_texts(source) == [
+        "@",
+        "def function1(",
+        "class Class1(Base):\n    def method1(self):\n        pass\n\n\n",
+    ]
+
+    unterminated = "def f(:\n    x = (\n"
+    assert scan_object_texts(unterminated) == collect_object_texts(unterminated)
+
+
+def test_scan_object_texts__edgecases() -> None:
+    # a decorator on the first line: neither engine records its "@"
+    source = "@dataclass\nclass Data:\n    x: int\n\n\n@dataclass\nclass Other:\n    y: int\n"
+    expected = ["class Data:\n    x: int\n\n\n", "@", "class Other:\n    y: int"]
+    assert scan_object_texts(source) == collect_object_texts(source) == expected
+
+    # single blank lines: the regex engine runs on to the next double blank line
+    source = "class First:\n    x = 1\n\nclass Second:\n    y = 2\n\ndef function():\n    pass\n"
+    assert collect_object_texts(source) == [source[:-1]]
+    assert scan_object_texts(source) == [
+        "class First:\n    x = 1\n\n",
+        "class Second:\n    y = 2\n\n",
+        "def function(",
+    ]
+
+    # nested and conditional classes: only the regex engine takes them as top-level objects
+    outer = "class Outer:\n    class Inner:\n        pass\n\n\n"
+    conditional = "try:\n    class Fallback:\n        x = 1\nexcept ImportError:\n    pass\n\n\n"
+    source = outer + conditional + "if True:\n    def conditional():\n        pass\n"
+    assert scan_object_texts(source) == [outer]
+    assert collect_object_texts(source) == [outer, conditional.removeprefix("try:\n    ")]
+
+
+@pytest.mark.parametrize("parser", ["regex", "tokenize"])
+def test_collect_file_objects(tmp_path: Path, parser: str) -> None:
+    source_file = tmp_path / "pkg" / "module.py"
+    source_file.parent.mkdir()
+    source_file.write_text("""def first():
+    pass
+
+
+class Second(Base):
+    def method(self):
+        pass
+
+
+@decorated
+def third():
+    pass
+""")
+
+    functions, classes = collect_file_objects(source_file, tmp_path, parser)
+
+    assert functions == [(Path("pkg/module.py"), 0, "first"), (Path("pkg/module.py"), 3, "third")]
+    assert classes == [
+        (Path("pkg/module.py"), 1, "Second", ["method"], {"method": "def method(self):"}, ["Base"])
+    ]
+
+
+def test_collect_source_syntax(tmp_path: Path) -> None:
+    root_dir = Path(__file__).parents[2]
+    modules = collect_source_syntax(root_dir / "src/structlint", root_dir)
+    by_name = {m.module: m for m in modules}
+
+    assert "structlint" in by_name
+    assert by_name["structlint.cli"].path == Path("src/structlint/cli.py")
+    assert "main" in [f.name for f in by_name["structlint.cli"].functions]
+
+    cache = ParseCache(tmp_path)
+    assert collect_source_syntax(root_dir / "src/structlint", root_dir, cache=cache) == modules
+    cache.save()
+    with patch("structlint.collection.parse_module") as mock_parse:
+        warm = collect_source_syntax(
+            root_dir / "src/structlint", root_dir, jobs=2, cache=ParseCache(tmp_path)
+        )
+        assert not mock_parse.called
+    assert warm == modules
+
+
+def test_collect_source_objects(tmp_path: Path) -> None:
     with (
         patch("pathlib.Path.rglob") as mock_rglob,
         patch("pathlib.Path.read_text") as mock_read_text,
@@ -430,6 +674,34 @@ def last_function():
         assert len(result.functions) >= 0
         assert len(result.classes()) >= 0
 
+    root_dir = Path(__file__).parents[2]
+    serial = collect_source_objects(root_dir / "src", root_dir)
+    parallel = collect_source_objects(root_dir / "src", root_dir, jobs=2)
+
+    assert parallel.keys() == serial.keys()
+    assert parallel.classes() == serial.classes()
+
+    cache = ParseCache(tmp_path)
+    cold = collect_source_objects(root_dir / "src", root_dir, cache=cache)
+    cache.save()
+    with patch("structlint.collection.collect_file_objects") as mock_parse:
+        warm = collect_source_objects(root_dir / "src", root_dir, cache=ParseCache(tmp_path))
+        assert not mock_parse.called
+
+    assert cold.keys() == warm.keys() == serial.keys()
+    assert cold.classes() == warm.classes() == serial.classes()
+
+    from_ast = collect_source_objects(root_dir / "src", root_dir, parser="ast")
+    # the parsers number objects differently, which keys ignore when compared
+    assert len(from_ast.keys()) == len(serial.keys())
+    assert set(from_ast.keys()) == set(serial.keys())
+    assert from_ast.syntax is not None and serial.syntax is None
+
+    docs_cache = ParseCache(tmp_path / "docs")
+    docs_cold = collect_docs_objects(root_dir / "docs/md", root_dir, docs_cache)
+    docs_warm = collect_docs_objects(root_dir / "docs/md", root_dir, docs_cache)
+    assert docs_cold.keys() == docs_warm.keys()
+
 
 def test_add_inherited_methods() -> None:
     class_tuples: list[ClassInfo] = [
@@ -475,16 +747,57 @@ def test_add_inherited_methods() -> None:
     assert standalone[3] == ["solo_method"]
     assert len(result) == 1
 
+    deep: list[ClassInfo] = [
+        (Path(f"level{k}.py"), 0, f"Level{k}", [f"method{k}"], {}, [f"Level{k - 1}"] if k else [])
+        for k in range(6)
+    ]
+    deepest = add_inherited_methods(deep[::-1])[0]
+    assert deepest[3] == [f"method{k}" for k in range(5, -1, -1)]
+
+    same_name: list[ClassInfo] = [
+        (Path("pkg/a/models.py"), 0, "Base", ["a_method"], {}, []),
+        (Path("pkg/b/models.py"), 0, "Base", ["b_method"], {}, []),
+        (Path("pkg/b/views.py"), 0, "View", ["view"], {}, ["Base"]),
+    ]
+    assert add_inherited_methods(same_name)[2][3] == ["view", "b_method"]
+
+
+def test_resolve_bases() -> None:
+    class_tuples: list[ClassInfo] = [
+        (Path("pkg/a/models.py"), 0, "Base", [], {}, []),
+        (Path("pkg/b/models.py"), 0, "Base", [], {}, []),
+        (Path("pkg/b/models.py"), 1, "Mixin", [], {}, []),
+        (Path("pkg/b/views.py"), 0, "View", [], {}, ["Base", "Mixin", "Unknown", "Mixin"]),
+        (Path("pkg/a/models.py"), 1, "Local", [], {}, ["Base"]),
+        (Path("pkg/c/shadow.py"), 0, "Mixin", [], {}, ["Mixin"]),
+    ]
+
+    assert resolve_bases(class_tuples) == [[], [], [], [1, 2], [0], [2]]
+
+
+def test_order_bases_first(capsys) -> None:
+    class_tuples: list[ClassInfo] = [
+        (Path("a.py"), k, name, [], {}, []) for k, name in enumerate("ABCD")
+    ]
+    bases = [[1], [2], [], [0, 2]]
+    assert order_bases_first(bases, class_tuples) == [2, 1, 0, 3]
+    assert capsys.readouterr().out == ""
+
+    bases = [[1], [2], [0], []]
+    assert order_bases_first(bases, class_tuples) == [2, 1, 0, 3]
+    assert bases == [[1], [2], [], []]
+    assert "Inheritance cycle in 'a.py:C'; ignoring its base 'A'." in capsys.readouterr().err
+
 
 def test_objects__edgecases() -> None:
     empty_objects = Objects(functions=[], classes=[])
-    assert empty_objects.function_strings == []
-    assert empty_objects.method_strings() == []
-    assert empty_objects.strings() == []
-    assert empty_objects.methodless == []
+    assert empty_objects.function_keys == ()
+    assert empty_objects.method_keys() == ()
+    assert empty_objects.keys() == ()
+    assert empty_objects.methodless == ()
 
-    def empty_processor(s):
-        return ""
+    def empty_processor(k: ObjectKey) -> None:
+        return None
 
     assert empty_objects.apply(empty_processor) == []
 
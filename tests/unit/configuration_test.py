@@ -1,14 +1,22 @@
+import json
 import re
 import tomllib
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
+from structlint.cache import CONFIG_FILENAME, file_digest
 from structlint.configuration import (
+    DEFAULT_CACHE_DIR,
+    CompiledConfig,
+    ConfigSource,
     Configuration,
     DocsConfig,
+    FootprintConfig,
     ImportInfo,
     ImportsConfig,
+    ImportTimeConfig,
     MethodsConfig,
     UnitTestsConfig,
 )
@@ -300,6 +308,11 @@ class TestImportsConfig:
         other = ImportsConfig(internal_allowed_everywhere={"structlint.random"})
         assert default.merge(internal_allowed_everywhere={"random"}) == other
 
+        default = ImportsConfig()
+        other = ImportsConfig(allowed_cycles=[["structlint.a", "b"]])
+        assert default.merge(allowed_cycles=[["a", "structlint.b"]]) == other
+        assert other.allowed_cycles == (frozenset({"structlint.a", "structlint.b"}),)
+
     def test_fixer(self) -> None:
         default = ImportsConfig(module_name="hello")
         assert default._fixer("submodule") == "hello.submodule"
@@ -385,6 +398,89 @@ class TestUnitTestsConfig:
         assert default.merge(file_per_class=re.compile(r"Custom")) == other
 
 
+class TestImportTimeConfig:
+    default = ImportTimeConfig()
+
+    def test_dunder_str(self) -> None:
+        custom = ImportTimeConfig(modules=("structlint.cli",), budgets={"grimp": 50_000}, repeat=3)
+        for config in (self.default, custom):
+            reimport = tomllib.loads(str(config))["tool"]["structlint"]["import_time"]
+            assert ImportTimeConfig.from_dict(reimport) == config
+
+    def test_from_dict(self) -> None:
+        assert ImportTimeConfig.from_dict({}) == self.default
+
+        raw_dict = {"modules": ["structlint.cli"], "budgets": {"structlint.cli": 200_000}}
+        custom = ImportTimeConfig(modules=("structlint.cli",), budgets={"structlint.cli": 200_000})
+        assert ImportTimeConfig.from_dict(raw_dict) == custom
+
+        with pytest.raises(ValueError, match="Non-negative integer expected; found '-1'."):
+            ImportTimeConfig.from_dict({"budgets": {"structlint": -1}})
+        with pytest.raises(ValueError, match="found 'repeat = 0'"):
+            ImportTimeConfig.from_dict({"repeat": 0})
+
+    def test_merge(self) -> None:
+        default = ImportTimeConfig()
+        other = ImportTimeConfig(repeat=9)
+        assert default.merge(repeat=9) == other
+        assert default.merge(repeat=None).repeat == 9
+        assert default.merge(repeat=0).repeat == 0
+
+
+class TestFootprintConfig:
+    default = FootprintConfig()
+
+    def test_dunder_str(self) -> None:
+        custom = FootprintConfig(max_modules=20, max_external_packages=2)
+        for config in (self.default, custom):
+            reimport = tomllib.loads(str(config))["tool"]["structlint"]["footprint"]
+            assert FootprintConfig.from_dict(reimport) == config
+
+    def test_from_dict(self) -> None:
+        assert FootprintConfig.from_dict({}) == self.default
+        custom = FootprintConfig(max_source_bytes=1_000_000)
+        assert FootprintConfig.from_dict({"max_source_bytes": 1_000_000}) == custom
+
+        with pytest.raises(TypeError, match="Type 'int' expected; found 'str'."):
+            FootprintConfig.from_dict({"max_modules": "20"})
+
+    def test_merge(self) -> None:
+        default = FootprintConfig()
+        other = FootprintConfig(max_modules=20)
+        assert default.merge(max_modules=20) == other
+        assert default.merge(max_modules=None).max_modules == 20
+
+
+class TestConfigSource:
+    text = '[project]\nname = "my-pkg"\nscripts = {my-pkg = "my_pkg.cli:main"}\n\n'
+    text += "[tool.structlint]\njobs = 2\n"
+
+    def test_parse(self) -> None:
+        source = ConfigSource.parse(self.text, "abc")
+        assert source.module_name == "my_pkg"
+        assert source.table == {"jobs": 2}
+        assert source.scripts == {"my-pkg": "my_pkg.cli:main"}
+
+        assert source == ConfigSource("abc")
+        assert len({source, ConfigSource("abc"), ConfigSource("def")}) == 2
+        assert ConfigSource.parse("[tool.structlint]\n", "abc").module_name == ""
+
+    def test_from_json(self) -> None:
+        source = ConfigSource.parse(self.text, "abc")
+        restored = ConfigSource.from_json(json.loads(json.dumps(source.to_json())))
+        assert restored == source
+        assert restored.table == source.table
+        assert restored.scripts == source.scripts
+
+    def test_to_json(self) -> None:
+        assert ConfigSource.parse(self.text, "abc").to_json() == {
+            "digest": "abc",
+            "module_name": "my_pkg",
+            "table": {"jobs": 2},
+            "scripts": {"my-pkg": "my_pkg.cli:main"},
+        }
+
+
 class TestConfiguration:
     default = Configuration()
 
@@ -396,7 +492,34 @@ class TestConfiguration:
 
     def test_read(self) -> None:
         default_toml = Path(__file__).parent.parent / "_data/default.toml"
-        assert Configuration.read(explicitly_passed=default_toml) == self.default
+        assert Configuration.read(explicitly_passed=default_toml, use_cache=False) == self.default
+
+    def test_read__edgecases(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        (tmp_path / "src" / "pkg").mkdir(parents=True)
+        (tmp_path / "pyproject.toml").write_text("[tool.structlint]\njobs = 2\n")
+        monkeypatch.chdir(tmp_path)
+
+        cold = Configuration.read()
+        assert (cold.module_name, cold.jobs) == ("pkg", 2)
+        assert cold.digest == file_digest(tmp_path / "pyproject.toml")
+        assert (tmp_path / DEFAULT_CACHE_DIR / CONFIG_FILENAME).exists()
+
+        with patch.object(ConfigSource, "parse", side_effect=AssertionError("parsed again")):
+            warm = Configuration.read()
+        assert warm == cold
+        assert warm.digest == cold.digest
+
+        (tmp_path / "pyproject.toml").write_text("[tool.structlint]\njobs = 3\n")
+        changed = Configuration.read()
+        assert changed.jobs == 3
+        assert changed.digest != cold.digest
+
+    def test_from_source(self) -> None:
+        source = ConfigSource("abc", "structlint", {}, {"structlint": "structlint.cli:main"})
+        cfg = Configuration.from_source(source)
+        expected = Configuration.from_dict({}, "structlint")
+        assert cfg == expected.merge(scripts={"structlint": "structlint.cli:main"})
+        assert cfg.digest == "abc"
 
     def test_from_dict(self) -> None:
         default = Configuration()
@@ -409,3 +532,29 @@ class TestConfiguration:
         default = Configuration()
         other = Configuration(root_dir=Path("some/root"))
         assert default.merge(root_dir=Path("some/root")) == other
+        assert default.merge(jobs=None).jobs == 1
+        assert default.merge(jobs=0).jobs == 0
+
+
+class TestCompiledConfig:
+    source = ConfigSource("compiled", "structlint", {"docs": {"ignore": "_private"}}, {})
+
+    def test_compile(self) -> None:
+        compiled = CompiledConfig.compile(self.source, Path("/project"))
+        assert compiled is CompiledConfig.compile(ConfigSource("compiled"), Path("/project"))
+        assert compiled is not CompiledConfig.compile(self.source, Path("/other"))
+        assert compiled == CompiledConfig(
+            ConfigSource("compiled"), Path("/project"), Configuration()
+        )
+        assert compiled.configuration.digest == "compiled"
+        assert compiled.configuration.docs.ignore.pattern == "_private"
+
+    def test_build(self) -> None:
+        compiled = CompiledConfig.compile(self.source, Path("/project"))
+        first, second = compiled.build(), compiled.build()
+        assert first == second == compiled.configuration
+        assert first is not second and first.docs is not second.docs
+        assert first.docs.ignore is second.docs.ignore  # compiled once, shared
+
+        first.merge(jobs=4).docs.merge(ignore=re.compile("other"))
+        assert compiled.build() == second
@@ -0,0 +1,143 @@
+import socket
+import threading
+from pathlib import Path
+from unittest.mock import patch
+
+from structlint import __version__
+from structlint.cli import structlint_cli
+from structlint.daemon import (
+    Daemon,
+    is_running,
+    receive,
+    send_request,
+    socket_path,
+    subcommand_names,
+)
+from structlint.workspace import Workspace
+
+
+def serve_in_thread(daemon: Daemon, path: Path) -> threading.Thread:
+    thread = threading.Thread(target=daemon.serve, args=(path,), daemon=True)
+    thread.start()
+    for _ in range(500):
+        if is_running(path):
+            break
+        thread.join(0.01)
+    return thread
+
+
+def test_socket_path() -> None:
+    assert socket_path(Path("/project")) == Path("/project/.structlint_cache/daemon.sock")
+
+
+def test_receive() -> None:
+    left, right = socket.socketpair()
+    with left, right:
+        left.sendall(b'{"args": ["methods"]}')
+        left.shutdown(socket.SHUT_WR)
+        assert receive(right) == {"args": ["methods"]}
+
+    left, right = socket.socketpair()
+    with left, right:
+        left.shutdown(socket.SHUT_WR)
+        assert receive(right) == {}
+
+
+def test_send_request(tmp_path: Path) -> None:
+    path = tmp_path / "echo.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+
+        def echo() -> None:
+            connection, _ = server.accept()
+            with connection:
+                connection.sendall(str(receive(connection)["n"] + 1).encode())
+
+        thread = threading.Thread(target=echo)
+        thread.start()
+        assert send_request(path, {"n": 41}) == 42
+        thread.join()
+
+
+def test_is_running(tmp_path: Path) -> None:
+    path = tmp_path / "daemon.sock"
+    assert not is_running(path)
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+        server.bind(str(path))
+        server.listen()
+        assert is_running(path)
+    assert path.exists()
+    assert not is_running(path)  # a stale socket file
+
+
+def test_subcommand_names() -> None:
+    assert subcommand_names(structlint_cli, []) == []
+    assert subcommand_names(structlint_cli, ["--staged", "watch"]) == ["watch"]
+    assert subcommand_names(structlint_cli, ["-j", "2", "which", "daemon"]) == ["which"]
+    assert subcommand_names(structlint_cli, ["which", "src/x/watch.py", "docs"]) == [
+        "which",
+        "docs",
+    ]
+    assert subcommand_names(structlint_cli, ["--changed-since", "watch", "tests"]) == ["tests"]
+    assert subcommand_names(structlint_cli, ["client", "watch"]) == ["client"]
+    assert subcommand_names(structlint_cli, ["nope", "watch"]) == []
+
+
+class TestDaemon:
+    def test_handle(self) -> None:
+        daemon = Daemon(Workspace(use_cache=False), structlint_cli)
+        response = daemon.handle({"args": ["methods"]})
+        assert "METHOD ORDER" in response["stdout"]
+        assert response["exit_code"] == 0
+
+        with patch("structlint.watch.changed_files", return_value={"docs/md/api/keys.md"}):
+            docs_objects = daemon.workspace.docs_objects
+            daemon.handle({"args": ["version"]})
+        assert daemon.workspace.docs_objects is not docs_objects
+
+        response = daemon.handle({"args": ["--staged", "watch"]})
+        assert response == {
+            "stdout": "",
+            "stderr": "Error: 'watch' cannot be run through the daemon.\n",
+            "exit_code": 2,
+        }
+        assert not daemon.stopped
+        response = daemon.handle({"args": ["which", "src/structlint/watch.py"]})
+        assert response["exit_code"] == 0
+        assert "cannot be run through the daemon" not in response["stderr"]
+        assert daemon.handle({"stop": True})["exit_code"] == 0
+        assert daemon.stopped
+
+    def test_run(self) -> None:
+        daemon = Daemon(Workspace(use_cache=False), structlint_cli)
+        assert daemon.run(["version"]) == (f"structlint, version {__version__}\n", "", 0)
+
+        stdout, stderr, exit_code = daemon.run(["which", "README.md"])
+        assert "is not linked" in stdout
+        assert exit_code == 1
+
+        stdout, stderr, exit_code = daemon.run(["nope"])
+        assert "No such command 'nope'" in stderr
+        assert exit_code == 2
+
+        with patch("structlint.checks.sort_methods", side_effect=RuntimeError("boom")):
+            stdout, stderr, exit_code = daemon.run(["methods"])
+        assert "RuntimeError: boom" in stderr
+        assert exit_code == 1
+
+    def test_serve(self, tmp_path: Path) -> None:
+        path = tmp_path / "daemon.sock"
+        path.touch()  # left over by a daemon that did not stop cleanly
+        workspace = Workspace(use_cache=False)
+        thread = serve_in_thread(Daemon(workspace, structlint_cli), path)
+        assert is_running(path)
+        assert "source_objects" in workspace._values
+
+        response = send_request(path, {"args": ["version"]})
+        assert response["stdout"] == f"structlint, version {__version__}\n"
+        send_request(path, {"stop": True})
+        thread.join(5)
+        assert not thread.is_alive()
+        assert not path.exists()
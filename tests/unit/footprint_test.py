@@ -0,0 +1,82 @@
+from pathlib import Path
+
+import click
+import grimp
+
+from structlint.configuration import Configuration, FootprintConfig
+from structlint.footprint import (
+    Footprint,
+    compute_footprint,
+    exceeded_limits,
+    module_source_bytes,
+    package_source_bytes,
+    script_modules,
+)
+from structlint.syntax import ModuleSyntax
+
+IMPORTS = {
+    "pkg.cli": {"pkg.core", "click", "os"},
+    "pkg.core": {"pkg.models", "pkg.graph"},
+    "pkg.graph": {"grimp"},
+    "pkg.models": {"pkg.core"},
+}
+SIZES = {"pkg.cli": 1, "pkg.core": 10, "pkg.graph": 100, "pkg.models": 1000, "click": 10_000}
+
+
+def make_graph() -> grimp.ImportGraph:
+    graph = grimp.ImportGraph()
+    for importer, imported in IMPORTS.items():
+        graph.add_module(importer)
+        for module in imported:
+            if not module.startswith("pkg."):
+                graph.add_module(module, is_squashed=True)
+            graph.add_import(importer=importer, imported=module)
+    return graph
+
+
+def test_script_modules() -> None:
+    cfg = Configuration(module_name="pkg", scripts={"a": "pkg.cli:main", "b": "pkg.cli:other"})
+    assert script_modules(cfg) == ["pkg.cli"]
+    assert script_modules(Configuration(module_name="pkg")) == ["pkg"]
+
+
+def test_package_source_bytes() -> None:
+    size = package_source_bytes("click")
+    assert size == sum(p.stat().st_size for p in Path(click.__file__).parent.rglob("*.py")) > 0
+    assert package_source_bytes("not_a_package") == 0
+    assert package_source_bytes("sys") == 0
+
+
+def test_module_source_bytes(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("x = 1\n")
+    assert module_source_bytes([ModuleSyntax(Path("a.py"), "pkg.a")], tmp_path) == {"pkg.a": 6}
+
+
+def test_compute_footprint() -> None:
+    footprint = compute_footprint(make_graph(), "pkg.cli", lambda m: SIZES.get(m, 0), top=3)
+    assert footprint == Footprint(
+        "pkg.cli",
+        frozenset({"pkg.cli", "pkg.core", "pkg.graph", "pkg.models"}),
+        frozenset({"click", "grimp"}),
+        11_111,
+        (
+            ("pkg.cli", "click", 10_000),
+            ("pkg.cli", "pkg.core", 1110),
+            ("pkg.core", "pkg.models", 1110),
+        ),
+    )
+
+    footprint = compute_footprint(make_graph(), "pkg.graph", lambda m: SIZES.get(m, 0))
+    assert footprint.modules == {"pkg.graph"}
+    assert footprint.heaviest_imports == (("pkg.graph", "grimp", 0),)
+
+
+def test_exceeded_limits() -> None:
+    footprint = Footprint("pkg", frozenset({"pkg", "pkg.a"}), frozenset({"click"}), 500)
+    assert exceeded_limits(footprint, FootprintConfig()) == []
+    assert exceeded_limits(footprint, FootprintConfig(max_modules=2, max_source_bytes=100)) == [
+        ("source bytes", 500, 100)
+    ]
+    assert exceeded_limits(footprint, FootprintConfig(max_modules=1, max_external_packages=1)) == [
+        ("internal modules", 2, 1)
+    ]
@@ -0,0 +1,121 @@
+import grimp
+import pytest
+
+from structlint.cache import ClosureCache
+from structlint.graphs import (
+    component_reach,
+    number_nodes,
+    pop_component,
+    reachable_closures,
+    shortest_cycle,
+    strongly_connected_components,
+    upstream_closures,
+)
+
+
+def make_graph(imports: dict[str, set[str]]) -> grimp.ImportGraph:
+    graph = grimp.ImportGraph()
+    for importer, imported in imports.items():
+        graph.add_module(importer)
+        for module in imported:
+            graph.add_module(module)
+            graph.add_import(importer=importer, imported=module)
+    return graph
+
+
+LAYERED = {
+    "app": {"app.cli"},
+    "app.cli": {"app.core", "click"},
+    "app.core": {"app.models", "app.utils"},
+    "app.models": {"app.utils", "app.registry"},
+    "app.registry": {"app.models"},
+    "app.utils": set(),
+    "click": set(),
+}
+
+
+def test_pop_component() -> None:
+    stack, on_stack = [0, 1, 2, 3], [True] * 4
+    assert pop_component(stack, on_stack, 1) == [3, 2, 1]
+    assert stack == [0]
+    assert on_stack == [True, False, False, False]
+
+
+@pytest.mark.parametrize(
+    "successors, expected",
+    [
+        ([], []),
+        ([[]], [[0]]),
+        ([[1], [2], []], [[2], [1], [0]]),
+        ([[1], [0, 2], [2]], [[2], [0, 1]]),
+        ([[1], [2], [0], [2, 4], []], [[0, 1, 2], [4], [3]]),
+    ],
+)
+def test_strongly_connected_components(successors: list[list[int]], expected: list[list[int]]):
+    components = strongly_connected_components(successors)
+    assert [sorted(c) for c in components] == expected
+
+    chain = [[i + 1] for i in range(50_000)] + [[0]]
+    assert len(strongly_connected_components(chain)) == 1
+
+
+def test_number_nodes() -> None:
+    names, successors = number_nodes(["app.models", "app.utils", "app.models"], LAYERED.__getitem__)
+
+    assert names[:2] == ["app.models", "app.utils"]
+    assert set(names) == {"app.models", "app.utils", "app.registry"}
+    assert [{names[i] for i in s} for s in successors] == [LAYERED[name] for name in names]
+    assert number_nodes([], LAYERED.__getitem__) == ([], [])
+
+
+def test_component_reach() -> None:
+    component_of, reach = component_reach([[1], [0, 2], [], [2]])
+
+    assert component_of[0] == component_of[1] != component_of[2]
+    assert reach[component_of[0]] == 0b0111
+    assert reach[component_of[2]] == 0b0100
+    assert reach[component_of[3]] == 0b1100
+
+
+def test_reachable_closures() -> None:
+    closures = reachable_closures(["app.cli", "app.models", "app.utils"], LAYERED.__getitem__)
+
+    assert closures == {
+        "app.cli": {"app.core", "app.models", "app.registry", "app.utils", "click"},
+        "app.models": {"app.registry", "app.utils"},
+        "app.utils": set(),
+    }
+    assert reachable_closures([], LAYERED.__getitem__) == {}
+
+
+def test_upstream_closures() -> None:
+    graph = make_graph(LAYERED)
+    modules = sorted(graph.modules)
+    assert upstream_closures(graph, modules) == {m: graph.find_upstream_modules(m) for m in modules}
+
+    cache = ClosureCache(None, {m: "0" for m in LAYERED if m != "click"})
+    cache.put("app.cli", {"stale"})
+    closures = upstream_closures(graph, ["app.cli", "app.models"], cache)
+    assert closures == {"app.cli": {"stale"}, "app.models": {"app.registry", "app.utils"}}
+    assert cache.get("app.models") == {"app.registry", "app.utils"}
+
+    graph.add_module("app.extra")
+    graph.add_import(importer="app.utils", imported="app.extra")
+    closures = upstream_closures(graph, ["app.cli", "app.registry"])
+    assert closures == {m: graph.find_upstream_modules(m) for m in ["app.cli", "app.registry"]}
+    assert "app.extra" in closures["app.cli"]
+
+
+def test_shortest_cycle() -> None:
+    imports = {
+        "a": {"b", "c"},
+        "b": {"d"},
+        "c": {"a"},
+        "d": {"a", "e"},
+        "e": {"e"},
+    }
+    assert shortest_cycle("a", imports.__getitem__, set(imports)) == ["a", "c", "a"]
+    assert shortest_cycle("b", imports.__getitem__, set(imports)) == ["b", "d", "a", "b"]
+    assert shortest_cycle("b", imports.__getitem__, {"b", "d"}) == []
+    assert shortest_cycle("e", imports.__getitem__, {"e"}) == ["e", "e"]
+    assert shortest_cycle("app.cli", LAYERED.__getitem__, set(LAYERED)) == []
@@ -0,0 +1,65 @@
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from structlint.configuration import Configuration, ImportTimeConfig
+from structlint.importtime import (
+    entry_modules,
+    measure_import_time,
+    median_import_times,
+    parse_importtime,
+)
+
+STDERR = """
+import time: self [us] | cumulative | imported package
+import time:       900 |       4000 | site
+import time:       100 |        100 |     pkg.c
+import time:       300 |        400 |   pkg.b
+import time:       200 |        600 | pkg
+import time:       500 |       1100 | pkg.a
+Traceback (most recent call last):
+""".strip()
+
+
+def test_entry_modules() -> None:
+    cfg = Configuration(module_name="pkg", scripts={"pkg": "pkg.cli:main", "pkg2": "pkg:run"})
+    assert entry_modules(cfg) == ["pkg", "pkg.cli"]
+
+    cfg.merge(import_time=ImportTimeConfig(modules=("pkg.a",)))
+    assert entry_modules(cfg) == ["pkg.a"]
+
+
+def test_parse_importtime() -> None:
+    assert parse_importtime(STDERR) == {
+        "site": 4000,
+        "pkg.c": 100,
+        "pkg.b": 400,
+        "pkg": 600,
+        "pkg.a": 1100,
+    }
+    assert parse_importtime(STDERR, {"pkg", "pkg.a"}) == {
+        "pkg.c": 100,
+        "pkg.b": 400,
+        "pkg": 600,
+        "pkg.a": 1100,
+    }
+    assert parse_importtime(STDERR, {"pkg.a"}) == {"pkg.a": 1100}
+    assert parse_importtime("") == {}
+
+
+def test_measure_import_time() -> None:
+    times = measure_import_time("json.decoder", cwd=Path(__file__).parent)
+    assert {"json", "json.decoder"} <= times.keys()
+    assert "site" not in times
+    assert times["json"] <= times["json.decoder"]  # the statement also imports the package
+
+    with pytest.raises(ImportError, match="Module 'not_a_module' could not be imported: "):
+        measure_import_time("not_a_module")
+
+
+def test_median_import_times() -> None:
+    runs = [{"a": 30, "b": 1}, {"a": 10}, {"a": 20, "b": 3}]
+    with patch("structlint.importtime.measure_import_time", side_effect=runs) as measure:
+        assert median_import_times("a", repeat=3) == {"a": 20, "b": 2}
+        assert measure.call_count == 3
@@ -0,0 +1,68 @@
+import copy
+import pickle
+from pathlib import Path
+
+import pytest
+
+from structlint.keys import ObjectKey
+from structlint.utils import dedup_underscores
+
+
+class TestObjectKey:
+    def test_name(self) -> None:
+        assert ObjectKey("a.py", 0, "", "f").name == "f"
+        assert ObjectKey("a.py", 0, "Cls", "m").name == "Cls.m"
+
+    def test_label(self) -> None:
+        assert ObjectKey(Path("src/a.py"), 7, "Cls", "m").label == "src/a.py:Cls.m"
+
+    def test_dunder_eq(self) -> None:
+        key = ObjectKey("src/a.py", 1, "Cls", "m")
+
+        assert key == ObjectKey(Path("src/a.py"), 9, "Cls", "m")
+        assert key != ObjectKey("src/a.py", 1, "", "m")
+        assert key != ObjectKey("src/b.py", 1, "Cls", "m")
+        assert key != "src/a.py:001:Cls.m"
+
+    def test_dunder_hash(self) -> None:
+        keys = {ObjectKey("a.py", 1, "", "f"), ObjectKey("a.py", 2, "", "f")}
+        assert len(keys) == 1
+        assert hash(ObjectKey("a.py", 1, "Cls", "m")) == hash(("a.py", "Cls", "m"))
+
+    def test_dunder_reduce(self) -> None:
+        key = ObjectKey("src/a.py", 3, "Cls", "m")
+        for clone in (pickle.loads(pickle.dumps(key)), copy.copy(key)):
+            assert clone == key
+            assert clone.ordinal == 3
+
+    def test_dunder_repr(self) -> None:
+        assert repr(ObjectKey("a.py", 2, "", "f")) == "ObjectKey('a.py', 2, '', 'f')"
+
+    def test_dunder_setattr(self) -> None:
+        key = ObjectKey("a.py", 0, "", "f")
+        with pytest.raises(AttributeError, match="'ObjectKey' is immutable; cannot set 'path'."):
+            key.path = "b.py"
+
+    def test_dunder_str(self) -> None:
+        assert str(ObjectKey("src/a.py", 1, "Cls", "m")) == "src/a.py:001:Cls.m"
+        assert str(ObjectKey("src/a.py", 1234, "", "f")) == "src/a.py:1234:f"
+
+    @pytest.mark.parametrize(
+        "s, fields",
+        [
+            ("src/a.py:001:f", ("src/a.py", 1, "", "f")),
+            ("src/a.py:042:Cls.m", ("src/a.py", 42, "Cls", "m")),
+            ("C:/src/a.py:000:Cls.m", ("C:/src/a.py", 0, "Cls", "m")),
+        ],
+    )
+    def test_from_string(self, s: str, fields: tuple[str, int, str, str]) -> None:
+        key = ObjectKey.from_string(s)
+        assert (key.path, key.ordinal, key.class_name, key.member) == fields
+        assert str(key) == s
+
+    def test_transform(self) -> None:
+        key = ObjectKey("tests/my__pkg/a_test.py", 4, "TestCls", "test___mangled")
+        assert (
+            str(key.transform(dedup_underscores))
+            == "tests/my_pkg/a_test.py:004:TestCls.test_mangled"
+        )
@@ -1,9 +1,11 @@
 import re
+from collections.abc import Iterable
 from pathlib import Path
 
 import grimp
 import pytest
 
+from structlint.collection import collect_source_syntax
 from structlint.configuration import (
     Configuration,
     DocsConfig,
@@ -12,11 +14,17 @@ from structlint.configuration import (
     MethodsConfig,
     UnitTestsConfig,
 )
+from structlint.keys import ObjectKey
 from structlint.logic import (
     analyze_discrepancies,
+    build_import_graph,
+    compile_method_classifier,
+    compile_path_mapper,
     compute_disallowed,
+    find_import_cycles,
     fix_dunder_filename,
     get_disallowed_imports,
+    load_import_graph,
     make_doc_class_path,
     make_doc_filename,
     make_doc_function_path,
@@ -26,8 +34,11 @@ from structlint.logic import (
     make_test_method_path,
     map_to_doc,
     map_to_test,
+    mapper_to_docs,
+    mapper_to_tests,
     sort_methods,
 )
+from structlint.syntax import ImportStatement, ModuleSyntax
 
 int_graph = grimp.build_graph(
     "structlint",
@@ -186,7 +197,7 @@ def test_make_doc_filename(pre: Path, post: Path):
     [
         (
             Path("/some/expand_me/to/file.py"),
-            "1",
+            1,
             "CoolClass",
             "cool_method",
             re.compile(r"expand_me"),
@@ -195,7 +206,7 @@ def test_make_doc_filename(pre: Path, post: Path):
         ),
         (
             Path("/some/path/collapse_me/file.py"),
-            "1",
+            1,
             "CoolClass",
             "cool_method",
             re.compile(r"expand_me"),
@@ -204,7 +215,7 @@ def test_make_doc_filename(pre: Path, post: Path):
         ),
         (
             Path("/some/path/to/file.py"),
-            "1",
+            1,
             "CoolClass",
             "cool_method",
             re.compile(r"expand_me"),
@@ -216,7 +227,7 @@ def test_make_doc_filename(pre: Path, post: Path):
 )
 def test_make_test_method_path(
     path: Path,
-    idx: str,
+    idx: int,
     class_name: str,
     method: str,
     file_per_class: re.Pattern,
@@ -226,7 +237,8 @@ def test_make_test_method_path(
     result = make_test_method_path(
         path, idx, class_name, method, file_per_class, file_per_directory
     )
-    assert result == expected
+    assert str(result) == expected
+    assert (result.class_name, result.member) == (f"Test{class_name}", f"test_{method}")
 
 
 @pytest.mark.parametrize(
@@ -234,7 +246,7 @@ def test_make_test_method_path(
     [
         (
             Path("some/expand_me/to/file.py"),
-            "1",
+            1,
             "CoolClass",
             re.compile(r"expand_me"),
             re.compile(r"collapse_me"),
@@ -242,7 +254,7 @@ def test_make_test_method_path(
         ),
         (
             Path("some/path/collapse_me/to/file.py"),
-            "2",
+            2,
             "CoolClass",
             re.compile(r"expand_me"),
             re.compile(r"collapse_me"),
@@ -250,7 +262,7 @@ def test_make_test_method_path(
         ),
         (
             Path("/some/path/to/file.py"),
-            "42",
+            42,
             "CoolClass",
             re.compile(r"expand_me"),
             re.compile(r"collapse_me"),
@@ -261,14 +273,15 @@ def test_make_test_method_path(
 )
 def test_make_doc_class_path(
     path: Path,
-    idx: str,
+    idx: int,
     klass: str,
     file_per_class: re.Pattern,
     file_per_directory: re.Pattern,
     expected: str,
 ):
     result = make_doc_class_path(path, idx, klass, file_per_class, file_per_directory)
-    assert result == expected
+    assert str(result) == expected
+    assert (result.class_name, result.member) == ("", klass)
 
 
 @pytest.mark.parametrize(
@@ -276,14 +289,14 @@ def test_make_doc_class_path(
     [
         (
             Path("some/collapse_me/to/file.py"),
-            "99",
+            99,
             "cool_function",
             re.compile(r"collapse_me"),
             "some/collapse_me_test.py:099:test_cool_function",
         ),
         (
             Path("some/collapse_me/to/file.py"),
-            "99",
+            99,
             "cool_function",
             re.compile(r"no_match"),
             "some/collapse_me/to/file_test.py:099:test_cool_function",
@@ -293,12 +306,12 @@ def test_make_doc_class_path(
 )
 def test_make_test_function_path(
     path: Path,
-    idx: str,
+    idx: int,
     func_name: str,
     file_per_directory: re.Pattern,
     expected: str,
 ):
-    assert make_test_function_path(path, idx, func_name, file_per_directory) == expected
+    assert str(make_test_function_path(path, idx, func_name, file_per_directory)) == expected
 
 
 @pytest.mark.parametrize(
@@ -306,14 +319,14 @@ def test_make_test_function_path(
     [
         (
             Path("some/collapse_me/to/file.py"),
-            "99",
+            99,
             "cool_function",
             re.compile(r"collapse_me"),
             "some/collapse_me.md:099:cool_function",
         ),
         (
             Path("some/collapse_me/to/file.py"),
-            "99",
+            99,
             "cool_function",
             re.compile(r"no_match"),
             "some/collapse_me/to/file.md:099:cool_function",
@@ -322,9 +335,47 @@ def test_make_test_function_path(
     ids=["file-per-directory", "one-to-one"],
 )
 def test_make_doc_function_path(
-    path: Path, idx: str, func_name: str, file_per_directory: re.Pattern, expected: str
+    path: Path, idx: int, func_name: str, file_per_directory: re.Pattern, expected: str
 ):
-    assert make_doc_function_path(path, idx, func_name, file_per_directory) == expected
+    assert str(make_doc_function_path(path, idx, func_name, file_per_directory)) == expected
+
+
+def test_compile_path_mapper() -> None:
+    compile_path_mapper.cache_clear()
+    args = (
+        Path("/root/src/pkg"),
+        Path("tests/unit"),
+        Path("/root"),
+        re.compile(r"expand_me"),
+        re.compile(r"collapse_me"),
+        make_test_filename,
+    )
+    target_path = compile_path_mapper(*args, True)
+    assert compile_path_mapper(*args, True) is target_path
+
+    assert target_path("src/pkg/a/file.py", "") == "tests/unit/a/file_test.py"
+    assert target_path("src/pkg/a/file.py", "Cls") == "tests/unit/a/file_test.py"
+    assert target_path("src/pkg/collapse_me/b/file.py", "") == "tests/unit/collapse_me_test.py"
+    assert target_path("src/pkg/expand_me.py", "Cls") == "tests/unit/expand_me/cls_test.py"
+    assert target_path("src/pkg/expand_me.py", "") == "tests/unit/expand_me_test.py"
+    assert target_path("src/pkg/__dunder.py", "") == "tests/unit/_dunder_test.py"
+    assert compile_path_mapper(*args, False)("src/pkg/__dunder.py", "") == (
+        "tests/unit/__dunder_test.py"
+    )
+
+
+def test_mapper_to_tests() -> None:
+    target_path = mapper_to_tests(cfg1)
+    assert target_path is mapper_to_tests(cfg1)
+    assert target_path("src/hello_world/sub/file.py", "") == "tests/unit_tests/sub/file_test.py"
+
+
+def test_mapper_to_docs() -> None:
+    target_path = mapper_to_docs(cfg1)
+    assert target_path is mapper_to_docs(cfg1)
+    assert target_path("src/hello_world/expand_me/file.py", "Cls") == (
+        "docs/markdown/expand_me/file/cls.md"
+    )
 
 
 @pytest.mark.parametrize(
@@ -345,7 +396,8 @@ def test_make_doc_function_path(
     ],
 )
 def test_map_to_test(config: Configuration, pre: str, post: str):
-    assert map_to_test(pre, config) == post
+    result = map_to_test(ObjectKey.from_string(pre), config)
+    assert (str(result) if result else "") == post
 
 
 @pytest.mark.parametrize(
@@ -358,26 +410,107 @@ def test_map_to_test(config: Configuration, pre: str, post: str):
     ],
 )
 def test_map_to_doc(config: Configuration, pre: str, post: str):
-    assert map_to_doc(pre, config) == post
+    assert str(map_to_doc(ObjectKey.from_string(pre), config)) == post
 
 
 @pytest.mark.parametrize(
-    "allowed, disallowed, allowed_everywhere, graph, expected",
+    "allowed, disallowed, allowed_everywhere, graph, internal_only, expected",
     [
-        ({"mod1": {"import1"}}, {}, {"allow_me"}, int_graph, {}),
-        ({}, {"mod1": {"import1"}, "grimp": {"sys"}}, {"allow_me"}, ext_graph, {}),
-        ({}, {}, {""}, "TODO", {}),
+        ({"mod1": {"import1"}}, {}, {"allow_me"}, int_graph, False, {}),
+        ({}, {"mod1": {"import1"}, "grimp": {"sys"}}, {"allow_me"}, ext_graph, False, {}),
+        ({}, {}, {""}, "TODO", False, {}),
+        (
+            {},
+            {"structlint.logic": {"structlint.utils", "grimp"}},
+            set(),
+            ext_graph,
+            False,
+            {"structlint.logic": {"structlint.utils", "grimp"}},
+        ),
+        (
+            {},
+            {"structlint.logic": {"structlint.utils", "grimp"}, "grimp": {"structlint"}},
+            set(),
+            ext_graph,
+            True,
+            {"structlint.logic": {"structlint.utils"}},
+        ),
     ],
-    ids=["a", "b", "c"],
+    ids=["a", "b", "c", "external", "internal-only"],
 )
 def test_compute_disallowed(
     allowed: dict[str, set[str]],
     disallowed: dict[str, set[str]],
     allowed_everywhere: set[str],
     graph: grimp.ImportGraph,
+    internal_only: bool,
     expected: dict[str, set[str]],
 ):
-    assert compute_disallowed(allowed, disallowed, allowed_everywhere, graph) == expected
+    result = compute_disallowed(allowed, disallowed, allowed_everywhere, graph, internal_only)
+    assert result == expected
+
+    if internal_only:
+        internal = grimp.build_graph("structlint", cache_dir=None)
+        external = grimp.build_graph("structlint", include_external_packages=True, cache_dir=None)
+        for module in internal.modules:
+            assert compute_disallowed(
+                {module: set()}, {}, set(), external, internal_only=True
+            ) == compute_disallowed({module: set()}, {}, set(), internal)
+
+
+def test_build_import_graph() -> None:
+    modules = [
+        ModuleSyntax(Path("pkg/__init__.py"), "pkg"),
+        ModuleSyntax(
+            Path("pkg/a.py"),
+            "pkg.a",
+            imports=(
+                ImportStatement("pkg", ("b", "helper"), 1, "from . import b, helper"),
+                ImportStatement("pkg.missing", ("x",), 2, "from .missing import x"),
+                ImportStatement("os.path", (), 3, "import os.path"),
+                ImportStatement("json", (), 5, "import json", deferred=True),
+            ),
+        ),
+        ModuleSyntax(Path("pkg/b.py"), "pkg.b"),
+    ]
+
+    internal = build_import_graph(modules)
+    assert internal.modules == {"pkg", "pkg.a", "pkg.b"}
+    assert internal.find_modules_directly_imported_by("pkg.a") == {"pkg", "pkg.b"}
+    [details] = internal.get_import_details(importer="pkg.a", imported="pkg.b")
+    assert (details["line_number"], details["line_contents"]) == (1, "from . import b, helper")
+
+    external = build_import_graph(modules, include_external_packages=True)
+    assert external.modules == {"pkg", "pkg.a", "pkg.b", "os", "json"}
+    assert external.is_module_squashed("os")
+    assert external.find_modules_directly_imported_by("pkg.a") == {"pkg", "pkg.b", "os", "json"}
+
+    eager = build_import_graph(modules, include_external_packages=True, eager_only=True)
+    assert eager.modules == {"pkg", "pkg.a", "pkg.b", "os"}
+
+    root_dir = Path(__file__).parents[2]
+    modules = collect_source_syntax(root_dir / "src/structlint", root_dir)
+    for include_external_packages in (False, True):
+        built = build_import_graph(modules, include_external_packages)
+        scanned = grimp.build_graph(
+            "structlint", include_external_packages=include_external_packages, cache_dir=None
+        )
+        assert built.modules == scanned.modules
+        for module in scanned.modules:
+            imported = scanned.find_modules_directly_imported_by(module)
+            assert built.find_modules_directly_imported_by(module) == imported
+
+
+def test_load_import_graph(tmp_path) -> None:
+    icfg = ImportsConfig(grimp_cache=str(tmp_path))
+    scanned = load_import_graph(icfg, "structlint")
+    assert "structlint.logic" in scanned.modules
+    assert scanned.is_module_squashed("grimp")
+
+    root_dir = Path(__file__).parents[2]
+    modules = collect_source_syntax(root_dir / "src" / "structlint", root_dir)
+    built = load_import_graph(icfg, "structlint", modules)
+    assert built.modules == scanned.modules
 
 
 @pytest.mark.parametrize(
@@ -400,6 +533,83 @@ def test_get_disallowed_imports(
     assert violations_internal == disallowed_internal
     assert violations_external == disallowed_external
 
+    root_dir = Path(__file__).parents[2]
+    modules = collect_source_syntax(root_dir / "src" / module_name, root_dir)
+    assert get_disallowed_imports(config, module_name, modules) == (
+        disallowed_internal,
+        disallowed_external,
+    )
+
+
+def test_find_import_cycles() -> None:
+    graph = grimp.ImportGraph()
+    imports = {
+        "pkg": {"pkg.a"},
+        "pkg.a": {"pkg.b", "os"},
+        "pkg.b": {"pkg.c", "pkg.d"},
+        "pkg.c": {"pkg.a"},
+        "pkg.d": {"pkg.b"},
+        "pkg.e": {"pkg.e"},
+        "pkg.f": {"pkg.e"},
+    }
+    for importer, imported in imports.items():
+        graph.add_module(importer)
+        for module in imported:
+            graph.add_module(module, is_squashed=module == "os")
+            graph.add_import(importer=importer, imported=module)
+
+    assert find_import_cycles(graph) == [
+        (["pkg.a", "pkg.b", "pkg.c", "pkg.d"], ["pkg.a", "pkg.b", "pkg.c", "pkg.a"]),
+        (["pkg.e"], ["pkg.e", "pkg.e"]),
+    ]
+    assert find_import_cycles(graph, [frozenset({"pkg.e"})]) == [
+        (["pkg.a", "pkg.b", "pkg.c", "pkg.d"], ["pkg.a", "pkg.b", "pkg.c", "pkg.a"]),
+    ]
+    grown = [frozenset({"pkg.a", "pkg.b", "pkg.c"}), frozenset({"pkg.e", "pkg.x"})]
+    assert find_import_cycles(graph, grown) == [
+        (["pkg.a", "pkg.b", "pkg.c", "pkg.d"], ["pkg.a", "pkg.b", "pkg.c", "pkg.a"]),
+    ]
+    assert find_import_cycles(grimp.build_graph("structlint", cache_dir=None)) == []
+
+
+def test_compile_method_classifier():
+    ordering = ((re.compile(r"@property"), 2.0), (re.compile(r"def _"), 5.0))
+    classify = compile_method_classifier(ordering, 4.0)
+
+    assert classify("@property\n    def _x(self):") == 2.0
+    assert classify("def _x(self):") == 5.0
+    assert classify("def _x(self: '@property'):") == 2.0
+    assert classify("def x(self):") == 4.0
+    assert classify("def x(self):") == 4.0
+    assert classify.cache_info().hits == 1
+    assert compile_method_classifier(ordering, 4.0) is classify
+    assert compile_method_classifier(ordering, 3.0) is not classify
+
+    ordering = (
+        (re.compile(r"@classmethod.+?@abstractmethod", re.DOTALL), 1.0),
+        (re.compile(r"@classmethod"), 2.0),
+        (re.compile(r"^def _"), 3.0),
+    )
+    classify = compile_method_classifier(ordering, 4.0)
+    assert classify("@classmethod\n    @abstractmethod\n    def x(cls):") == 1.0
+    assert classify("@abstractmethod\n    @classmethod\n    def x(cls):") == 2.0
+    assert classify("def _x(self):") == 3.0
+    assert classify("@cache\ndef _x(self):") == 4.0
+    assert compile_method_classifier((), 4.0)("def x(self):") == 4.0
+
+
+def test_compile_method_classifier__edgecases():
+    ordering = (
+        (re.compile(r"(\w)\1"), 1.0),
+        (re.compile(r"(?P<name>_\w+)"), 2.0),
+        (re.compile(r"def \  x  # a comment", re.VERBOSE), 3.0),
+    )
+    classify = compile_method_classifier(ordering, 4.0)
+    assert classify("def ab(cls):") == 4.0
+    assert classify("def eggs(cls):") == 1.0
+    assert classify("def _x(self):") == 2.0
+    assert classify("def x(self):") == 3.0
+
 
 @pytest.mark.parametrize(
     "method_dict, post, methods_cfg",
@@ -438,8 +648,9 @@ def test_sort_methods(method_dict: dict[str, str], post: list[str], methods_cfg:
         (["a", "b", "c"], ["a", "c"], re.compile(r"additional"), ["b"], [], {"a", "c"}),
         (["a", "c"], ["a", "b", "c"], re.compile(r"additional"), [], ["b"], {"a", "c"}),
         (["a", "c"], ["a", "b"], re.compile(r"additional"), ["c"], ["b"], {"a"}),
+        (["a"], ["a", "additional"], re.compile(r"mod.py:add"), [], [], {"a"}),
     ],
-    ids=["0", "1", "2", "3"],
+    ids=["0", "1", "2", "3", "4"],
 )
 def test_analyze_discrepancies(
     expected: list[str],
@@ -449,5 +660,34 @@ def test_analyze_discrepancies(
     unexpected: list[str],
     overlap: set[str],
 ):
-    result = analyze_discrepancies(expected, actual, allow_additional)
-    assert result == (missing, unexpected, overlap)
+    def keys(names: Iterable[str]) -> list[ObjectKey]:
+        return [ObjectKey("mod.py", i, "", name) for i, name in enumerate(names)]
+
+    result = analyze_discrepancies(keys(expected), keys(actual), allow_additional)
+    assert result == (keys(missing), keys(unexpected), set(keys(overlap)), [])
+
+
+def test_analyze_discrepancies__edgecases() -> None:
+    expected = [
+        ObjectKey("a.py", 0, "", "kept"),
+        ObjectKey("a.py", 1, "", "moved"),
+        ObjectKey("a.py", 2, "Cls", "method"),
+        ObjectKey("a.py", 3, "", "twice"),
+        ObjectKey("b.py", 0, "", "twice"),
+        ObjectKey("b.py", 1, "", "gone"),
+    ]
+    actual = [
+        ObjectKey("a.py", 5, "", "kept"),
+        ObjectKey("c.py", 0, "", "moved"),
+        ObjectKey("c.py", 1, "Cls", "method"),
+        ObjectKey("c.py", 2, "", "twice"),
+        ObjectKey("c.py", 3, "", "new"),
+    ]
+    missing, unexpected, overlap, moved = analyze_discrepancies(
+        expected, actual, re.compile(r"(?!)")
+    )
+
+    assert moved == [(expected[1], actual[1]), (expected[2], actual[2])]
+    assert missing == [expected[3], expected[4], expected[5]]
+    assert unexpected == [actual[3], actual[4]]
+    assert overlap == {expected[0]}
@@ -3,17 +3,25 @@ from pathlib import Path
 
 import pytest
 
+from structlint.footprint import Footprint
+from structlint.keys import ObjectKey
 from structlint.regexes import Regex
 from structlint.reporting import (
     display_disallowed,
+    make_cycles_report,
+    make_delta_report,
     make_discrepancy_report,
+    make_footprint_report,
+    make_import_time_report,
     make_imports_report,
     make_methods_report,
     make_missing_report,
+    make_moved_report,
     make_order_report,
     make_unexpected_report,
+    make_which_report,
 )
-from structlint.utils import Color
+from structlint.utils import Color, make_double_bar
 
 
 def test_make_methods_report() -> None:
@@ -72,6 +80,54 @@ def test_make_imports_report(
         assert substring not in result
 
 
+def test_make_cycles_report() -> None:
+    result = make_cycles_report([])
+    assert "IMPORT CYCLES" in result
+    assert "No problems detected." in result
+
+    report = make_cycles_report([(["pkg.a", "pkg.b"], ["pkg.a", "pkg.b", "pkg.a"])])
+    assert "No problems detected." not in report
+    assert Color.cyan("pkg.a, pkg.b") in report
+    assert Color.red("pkg.a -> pkg.b -> pkg.a") in report
+
+
+def test_make_import_time_report() -> None:
+    times = {"pkg": 900, "pkg.a": 500, "pkg.b": 300, "os": 200}
+    result = make_import_time_report([("pkg", times)], {"pkg.b": 400})
+    assert "IMPORT TIME" in result
+    assert "No problems detected." in result
+    assert "(budget 400 us)" in result
+
+    report = make_import_time_report([("pkg", times)], {"pkg.a": 400, "missing": 1}, top=1)
+    assert "No problems detected." not in report
+    assert "pkg.a" in report and "(budget 400 us)" in report
+    assert "pkg.b" not in report and "missing" not in report
+    assert "900 us" in report
+
+    report = make_import_time_report([], {}, failures={"pkg.nope": "Module 'pkg.nope' failed"})
+    assert "No problems detected." not in report
+    assert "pkg.nope" in report and "Module 'pkg.nope' failed" in report
+
+
+def test_make_footprint_report() -> None:
+    footprint = Footprint(
+        "pkg.cli",
+        frozenset({"pkg.cli", "pkg.core"}),
+        frozenset({"click"}),
+        12_345,
+        (("pkg.cli", "click", 10_000),),
+    )
+    result = make_footprint_report([(footprint, [])])
+    assert "ENTRY-POINT FOOTPRINT" in result
+    assert "No problems detected." in result
+    assert "pkg.cli -> click" in result and "10,000 bytes" in result
+    assert "12,345" in result
+
+    report = make_footprint_report([(footprint, [("internal modules", 2, 1)])])
+    assert "No problems detected." not in report
+    assert "(max 1)" in report
+
+
 def test_make_missing_report() -> None:
     assert make_missing_report([], lambda s: s) == ""
 
@@ -90,6 +146,15 @@ def test_make_unexpected_report() -> None:
     assert "b" in result
 
 
+def test_make_moved_report() -> None:
+    assert make_moved_report([], lambda s: s) == ""
+
+    result = make_moved_report([("a.py:000:f", "b.py:003:f"), ("a.py:001:g", "cc.py:0:g")], str)
+    assert "MOVED" in result
+    assert "    b.py:003:f  ────  a.py:000:f" in result
+    assert "    cc.py:0:g  ─────  a.py:001:g" in result
+
+
 def test_make_order_report() -> None:
     result = make_order_report([], [], set(), lambda s: s, Regex.MATCH_NOTHING)
     assert result == ""
@@ -117,13 +182,16 @@ def test_make_order_report() -> None:
 
 
 def test_make_discrepancy_report(tmp_path):
+    def key(name: str, i: int = 0) -> ObjectKey:
+        return ObjectKey("mod.py", i, "", name)
+
     report = make_discrepancy_report(
         "test",
-        ["a"],
-        ["a"],
+        [key("a")],
+        [key("a")],
         [],
         [],
-        {"a"},
+        {key("a")},
         specific_path=tmp_path / "x.py",
         root_dir=tmp_path,
         ignore=Regex.MATCH_NOTHING,
@@ -133,16 +201,56 @@ def test_make_discrepancy_report(tmp_path):
 
     report = make_discrepancy_report(
         "demo",
-        ["1", "2"],
-        ["2", "3"],
-        ["3"],
-        ["1"],
-        {"2"},
+        [key("one", 1), key("two", 2)],
+        [key("two", 5), key("three", 6)],
+        [key("three", 6)],
+        [key("one", 1)],
+        {key("two", 2)},
         specific_path=tmp_path / "demo.py",
         root_dir=tmp_path,
         ignore=Regex.MATCH_NOTHING,
     )
     assert "MISSING" in report
-    assert "3" in report
+    assert "mod.py\x1b[0m:\x1b[31mthree" in report
     assert "UNEXPECTED" in report
-    assert "1" in report
+    assert "one" in report
+    assert ":005:" not in report
+
+    report = make_discrepancy_report(
+        "demo",
+        [ObjectKey("new.py", 0, "", "f")],
+        [ObjectKey("old.py", 0, "", "f")],
+        [],
+        [],
+        set(),
+        specific_path=tmp_path / "demo.py",
+        root_dir=tmp_path,
+        ignore=Regex.MATCH_NOTHING,
+        moved=[(ObjectKey("old.py", 0, "", "f"), ObjectKey("new.py", 0, "", "f"))],
+    )
+    assert "MOVED" in report
+    assert "No problems detected" not in report
+
+
+def test_make_which_report() -> None:
+    report = make_which_report("src/a.py", ["docs/a.md", "tests/a_test.py"], is_source=True)
+    assert report == (
+        f"{Color.cyan('src/a.py')}\n\n    test and doc files\n\n"
+        "        docs/a.md\n        tests/a_test.py"
+    )
+    assert "    source files\n\n        src/a.py" in make_which_report("a.md", ["src/a.py"], False)
+    assert "is not linked" in make_which_report("README.md", [], is_source=False)
+
+
+def test_make_delta_report() -> None:
+    previous = {"tests": "\nTESTS\n\n    a_test.py:f\n    a_test.py:g", "docs": "DOCS"}
+    current = {"tests": "\nTESTS\n\n    a_test.py:g\n    a_test.py:h", "docs": "DOCS", "new": "NEW"}
+    report = make_delta_report(previous, current)
+    assert report.startswith(f"\n{make_double_bar(' TESTS ')}")
+    assert Color.red("-     a_test.py:f") in report
+    assert Color.green("+     a_test.py:h") in report
+    assert "a_test.py:g" not in report
+    assert "DOCS" not in report
+    assert report.endswith("\nNEW")
+
+    assert "No change since the last check." in make_delta_report(current, current)
@@ -0,0 +1,236 @@
+import ast
+from pathlib import Path
+
+import pytest
+
+from structlint.syntax import (
+    ClassSyntax,
+    FunctionSyntax,
+    ImportStatement,
+    ModuleSyntax,
+    base_name,
+    collect_imports,
+    header_text,
+    is_type_checking_block,
+    make_class_syntax,
+    make_function_syntax,
+    parse_module,
+    resolve_relative_import,
+)
+
+SOURCE = '''"""Module docstring mentioning class Fake: and def fake(."""
+
+import os.path
+from . import sibling
+
+X = "class NotAClass(Base):"
+
+
+@decorator(arg=":")
+def function1(a: dict[str, int] = {"k": 1}) -> None:  # trailing: comment
+    from .sub import helper
+
+
+class Class1(mod.Base, Generic[T], metaclass=Meta):
+    """Docstring with
+    def not_a_method(self):
+    """
+
+    @property
+    def value(self) -> int:
+        return 1
+
+    @value.setter
+    def value(self, v: int) -> None: ...
+
+    async def fetch(
+        self,
+        url: str,
+    ) -> bytes:
+        pass
+
+    class Nested:
+        def ignored(self): ...
+
+
+try:
+    import tomllib
+except ImportError:
+    import tomli as tomllib
+'''
+
+
+def parse(source: str) -> tuple[ast.Module, list[str]]:
+    return ast.parse(source), source.splitlines(keepends=True)
+
+
+class TestModuleSyntax:
+    def test_from_source(self) -> None:
+        syntax = ModuleSyntax.from_source(SOURCE, Path("pkg/module.py"), "pkg.module")
+
+        assert syntax.path == Path("pkg/module.py")
+        assert syntax.module == "pkg.module"
+        assert syntax.functions == (
+            FunctionSyntax(
+                "function1",
+                0,
+                ("decorator(arg=':')",),
+                '@decorator(arg=":")\ndef function1(a: dict[str, int] = {"k": 1}) -> None:',
+            ),
+        )
+        [class1] = syntax.classes
+        assert (class1.name, class1.index, class1.bases) == ("Class1", 1, ("Base", "Generic"))
+        assert [m.name for m in class1.methods] == ["value", "fetch"]
+        assert [m.module for m in syntax.imports] == [
+            "os.path",
+            "pkg",
+            "pkg.sub",
+            "tomllib",
+            "tomli",
+        ]
+
+        package = ModuleSyntax.from_source("from . import a\n", Path("pkg/__init__.py"), "pkg")
+        assert package.imports == (ImportStatement("pkg", ("a",), 1, "from . import a"),)
+
+        with pytest.raises(SyntaxError):
+            ModuleSyntax.from_source("def broken(:\n", Path("broken.py"))
+
+    def test_from_json(self) -> None:
+        syntax = ModuleSyntax.from_source(SOURCE, Path("pkg/module.py"), "pkg.module")
+        assert ModuleSyntax.from_json(syntax.to_json(), Path("pkg/module.py")) == syntax
+
+    def test_to_json(self) -> None:
+        syntax = ModuleSyntax.from_source(
+            "import os\n\n\nclass A(B):\n    def f(self): ...\n", Path("a.py"), "a"
+        )
+        assert syntax.to_json() == [
+            "a",
+            [],
+            [("A", 0, ("B",), (("f", 0, (), "def f(self):"),))],
+            [("os", (), 1, "import os", False)],
+        ]
+
+
+def test_parse_module(tmp_path: Path, capsys) -> None:
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    source = tmp_path / "src" / "pkg" / "module.py"
+    source.write_text("def f():\n    pass\n")
+
+    syntax = parse_module(source, tmp_path, package_dir=tmp_path / "src")
+    assert syntax.path == Path("src/pkg/module.py")
+    assert syntax.module == "pkg.module"
+    assert [f.name for f in syntax.functions] == ["f"]
+    assert parse_module(source, tmp_path).module == ""
+
+    source.write_text("def f(:\n")
+    assert parse_module(source, tmp_path) == ModuleSyntax(Path("src/pkg/module.py"))
+    assert "'src/pkg/module.py' could not be parsed" in capsys.readouterr().err
+
+
+def test_make_function_syntax() -> None:
+    tree, lines = parse("@staticmethod\n@cache\ndef f(x):\n    return x\n")
+    assert make_function_syntax(tree.body[0], 3, lines) == FunctionSyntax(
+        "f", 3, ("staticmethod", "cache"), "@staticmethod\n@cache\ndef f(x):"
+    )
+
+
+def test_make_class_syntax() -> None:
+    tree, lines = parse(SOURCE)
+    syntax = make_class_syntax(tree.body[5], 7, lines)
+
+    assert isinstance(syntax, ClassSyntax)
+    assert (syntax.name, syntax.index, syntax.bases) == ("Class1", 7, ("Base", "Generic"))
+    assert syntax.methods == (
+        FunctionSyntax("value", 0, ("property",), "@property\n    def value(self) -> int:"),
+        FunctionSyntax(
+            "fetch",
+            1,
+            (),
+            "async def fetch(\n        self,\n        url: str,\n    ) -> bytes:",
+        ),
+    )
+
+
+def test_header_text() -> None:
+    tree, lines = parse(SOURCE)
+    function1, class1 = tree.body[4], tree.body[5]
+
+    assert header_text(function1, lines).endswith('{"k": 1}) -> None:')
+    assert header_text(class1, lines) == "class Class1(mod.Base, Generic[T], metaclass=Meta):"
+    assert (
+        header_text(class1.body[2], lines) == "@value.setter\n    def value(self, v: int) -> None:"
+    )
+
+    tree, lines = parse("class A:\n    def f(self, s=':', d={1: (2, 3)}): return s  # x: y\n")
+    assert header_text(tree.body[0].body[0], lines) == "def f(self, s=':', d={1: (2, 3)}):"
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("Base", "Base"),
+        ("mod.sub.Base", "Base"),
+        ("Generic[T]", "Generic"),
+        ("make_base()", "make_base"),
+        ("bases[0]", "bases"),
+        ("(lambda: object)()", ""),
+    ],
+)
+def test_base_name(expression: str, expected: str) -> None:
+    assert base_name(ast.parse(expression, mode="eval").body) == expected
+
+
+def test_collect_imports() -> None:
+    tree, lines = parse(SOURCE)
+    imports = list(collect_imports(tree, lines, "pkg.module", is_package=False))
+
+    assert imports[:3] == [
+        ImportStatement("os.path", (), 3, "import os.path"),
+        ImportStatement("pkg", ("sibling",), 4, "from . import sibling"),
+        ImportStatement("pkg.sub", ("helper",), 11, "from .sub import helper", deferred=True),
+    ]
+    assert [s.line_number for s in imports] == sorted(s.line_number for s in imports)
+
+    assert [s.module for s in imports if s.deferred] == ["pkg.sub"]
+
+    source = "if TYPE_CHECKING:\n    import a\nelse:\n    import b\nclass C:\n    import c\n"
+    tree, lines = parse(source)
+    deferred = {s.module: s.deferred for s in collect_imports(tree, lines, "m", is_package=False)}
+    assert deferred == {"a": True, "b": False, "c": False}
+
+    tree, lines = parse("from ... import x\nfrom os import *\n")
+    assert list(collect_imports(tree, lines, "pkg.module", is_package=False)) == [
+        ImportStatement("os", (), 2, "from os import *")
+    ]
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("if TYPE_CHECKING:\n    pass", True),
+        ("if typing.TYPE_CHECKING:\n    pass", True),
+        ("if not TYPE_CHECKING:\n    pass", False),
+        ("if DEBUG:\n    pass", False),
+        ("import os", False),
+    ],
+)
+def test_is_type_checking_block(source: str, expected: bool) -> None:
+    assert is_type_checking_block(ast.parse(source).body[0]) is expected
+
+
+@pytest.mark.parametrize(
+    "imported, level, module, is_package, expected",
+    [
+        ("os", 0, "pkg.module", False, "os"),
+        ("", 1, "pkg.module", False, "pkg"),
+        ("sub", 1, "pkg.module", False, "pkg.sub"),
+        ("sub", 1, "pkg", True, "pkg.sub"),
+        ("other", 2, "pkg.inner.module", False, "pkg.other"),
+        ("", 2, "pkg.module", False, ""),
+        ("x", 1, "", False, ""),
+    ],
+)
+def test_resolve_relative_import(
+    imported: str, level: int, module: str, is_package: bool, expected: str
+) -> None:
+    assert resolve_relative_import(imported, level, module, is_package) == expected
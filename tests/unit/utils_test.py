@@ -1,4 +1,5 @@
 import os
+import random
 import re
 from collections.abc import Callable
 from pathlib import Path
@@ -6,11 +7,16 @@ from unittest.mock import patch
 
 import pytest
 
+from structlint.keys import ObjectKey
 from structlint.regexes import Regex
 from structlint.utils import (
     Color,
+    PathMatcher,
+    SubstringMatcher,
     always_true,
     assert_bool,
+    assert_nonnegative_int,
+    assert_one_of,
     boolean_merge,
     compile_for_path_segment,
     compile_string_or_bool,
@@ -20,20 +26,24 @@ from structlint.utils import (
     default_module_root_dir,
     filter_with,
     filter_without,
+    find_module_root_dir,
     get_method_name,
     get_project_root,
     make_bar,
     make_colorize_path,
     make_double_bar,
     make_regex,
+    module_name_from_path,
     move_path,
+    parallel_map,
+    path_matcher,
     path_matches,
     path_matches_not,
     prepend_module_name,
     remove_body,
-    remove_ordering_index,
     safe_search,
     sort_on_path,
+    substring_matcher,
 )
 
 
@@ -62,6 +72,14 @@ def test_get_project_root__error() -> None:
             get_project_root()
 
 
+def test_find_module_root_dir(tmp_path: Path) -> None:
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    assert find_module_root_dir(tmp_path) == Path("src/pkg")
+
+    (tmp_path / "src" / "pkg").rmdir()
+    assert find_module_root_dir(tmp_path) == Path("src/pkg")  # listed once
+
+
 def test_default_module_root_dir() -> None:
     assert default_module_root_dir() == Path("src/structlint")
 
@@ -104,6 +122,18 @@ def test_move_path(to_move: Path, old: Path, new: Path, expected: Path):
     assert move_path(to_move, old, new) == expected
 
 
+@pytest.mark.parametrize(
+    "p, base_dir, expected",
+    [
+        (Path("src/pkg/module.py"), Path("src"), "pkg.module"),
+        (Path("src/pkg/__init__.py"), Path("src"), "pkg"),
+        (Path("/abs/src/pkg/sub/__main__.py"), Path("/abs/src"), "pkg.sub.__main__"),
+    ],
+)
+def test_module_name_from_path(p: Path, base_dir: Path, expected: str):
+    assert module_name_from_path(p, base_dir) == expected
+
+
 def test_always_true() -> None:
     assert always_true("")
     assert always_true("a")
@@ -118,6 +148,23 @@ def test_assert_bool() -> None:
         assert_bool("True")  # type: ignore
 
 
+def test_assert_nonnegative_int() -> None:
+    assert assert_nonnegative_int(0) == 0
+    assert assert_nonnegative_int(8) == 8
+
+    with pytest.raises(TypeError, match="Type 'int' expected; found 'bool'."):
+        assert_nonnegative_int(True)
+    with pytest.raises(ValueError, match="Non-negative integer expected; found '-1'."):
+        assert_nonnegative_int(-1)
+
+
+def test_assert_one_of() -> None:
+    assert assert_one_of("regex", ("regex", "tokenize")) == "regex"
+
+    with pytest.raises(ValueError, match="One of 'regex', 'tokenize' expected; found 'ast'."):
+        assert_one_of("ast", ["regex", "tokenize"])
+
+
 def test_sort_on_path() -> None:
     pre = [
         "src/structlint/configuration.py:2:function_b",
@@ -125,15 +172,19 @@ def test_sort_on_path() -> None:
         "src/structlint/cli.py:3:ClassA.method3",
         "src/structlint/cli.py:2:ClassA.method2",
         "src/structlint/cli.py:1:ClassA.method1",
+        "src/structlint/cli.py:10:ClassB.method_b",
+        "src/structlint/cli.py:10:ClassB.method_a",
     ]
     post = [
-        "src/structlint/cli.py:1:ClassA.method1",
-        "src/structlint/cli.py:2:ClassA.method2",
-        "src/structlint/cli.py:3:ClassA.method3",
-        "src/structlint/configuration.py:1:function_a",
-        "src/structlint/configuration.py:2:function_b",
+        "src/structlint/cli.py:001:ClassA.method1",
+        "src/structlint/cli.py:002:ClassA.method2",
+        "src/structlint/cli.py:003:ClassA.method3",
+        "src/structlint/cli.py:010:ClassB.method_b",
+        "src/structlint/cli.py:010:ClassB.method_a",
+        "src/structlint/configuration.py:001:function_a",
+        "src/structlint/configuration.py:002:function_b",
     ]
-    assert sort_on_path(pre) == post
+    assert list(map(str, sort_on_path(map(ObjectKey.from_string, pre)))) == post
 
 
 @pytest.mark.parametrize(
@@ -175,6 +226,33 @@ def test_deduplicate_ordered(duplicated_list: list[str], expected: list[str]):
     assert len(deduplicated) == len(set(duplicated_list))
 
 
+class TestSubstringMatcher:
+    def test_search(self) -> None:
+        matcher = SubstringMatcher({"he", "she", "his", "hers", "pkg.sub"})
+
+        assert matcher.search("ushers")
+        assert matcher.search("this")
+        assert matcher.search("my.pkg.sub.mod")
+        assert not matcher.search("hi")
+        assert not matcher.search("pkg.su")
+        assert not matcher.search("")
+        assert SubstringMatcher({"", "x"}).search("anything")
+        assert not SubstringMatcher(set()).search("anything")
+
+        rng = random.Random(0)
+        names = ["".join(rng.choices("ab.", k=rng.randint(1, 8))) for _ in range(300)]
+        patterns = set(names[:40])
+        matcher = SubstringMatcher(patterns)
+        for name in names:
+            assert matcher.search(name) == any(p in name for p in patterns), name
+
+
+def test_substring_matcher() -> None:
+    matcher = substring_matcher(frozenset({"a", "b"}))
+    assert matcher.patterns == {"a", "b"}
+    assert substring_matcher(frozenset({"b", "a"})) is matcher
+
+
 @pytest.mark.parametrize(
     "unfiltered, criterion, expected",
     [
@@ -205,16 +283,11 @@ def test_filter_without(unfiltered: set[str], criterion: str | set[str], expecte
     assert filter_without(unfiltered, criterion) == expected
 
 
-@pytest.mark.parametrize(
-    "pre, post",
-    [
-        ("/path/to/file.py:1:Class.method", "/path/to/file.py:Class.method"),
-        ("/path/to/file.py:Class.method", "/path/to/file.py:Class.method"),
-        ("file.py:456:Class.method", "file.py:Class.method"),
-    ],
-)
-def test_remove_ordering_index(pre: str, post: str):
-    assert remove_ordering_index(pre) == post
+@pytest.mark.parametrize("jobs", [0, 1, 2, 3])
+def test_parallel_map(jobs: int):
+    items = [f"mod{i}" for i in range(50)]
+    assert parallel_map(str.upper, items, jobs) == list(map(str.upper, items))
+    assert parallel_map(str.upper, [], jobs) == []
 
 
 @pytest.mark.parametrize(
@@ -357,6 +430,81 @@ def test_get_method_name(source: str, name: str):
     assert get_method_name(source) == name
 
 
+def reference_path_matches(p: Path | str, path_pattern: re.Pattern) -> Path | bool:
+    """`path_matches` as a search of each ancestor, `.` excepted, then of the path itself."""
+    for parent in sorted((p := Path(p)).parents):
+        if parent == Path("."):
+            continue
+        if re.search(path_pattern, str(parent)):
+            return parent
+    if re.search(path_pattern, str(p)):
+        return p
+    return False
+
+
+MATCHER_PATHS = [
+    "file.py",
+    "pkg/file.py",
+    "pkg/sub/file.py",
+    "pkg/sub/deeper/file.py",
+    "pkg/other/file.py",
+    "pkg/utils/helpers/file.py",
+    "pkg/utils.py",
+    "src/pkg/__init__.py",
+    "src/pkg/sub/__init__.py",
+    "/abs/pkg/sub/file.py",
+    "/abs/pkg/utils/file.py",
+    "/file.py",
+    "tests/unit/pkg/sub/file_test.py",
+]
+MATCHER_PATTERNS = [
+    r"(?!)",
+    r".+",
+    r"utils",
+    r"/[^/]*?utils",
+    r"sub|other",
+    r"^pkg$",
+    r"^pkg/sub",
+    r"sub/deeper$",
+    r"^/$",
+    r"^/abs",
+    r"\.py$",
+    r"__init__",
+    r"pkg/(?!sub)",
+    r"(?<=/)sub(?=/|$)",
+    r"^[^/]*$",
+]
+
+
+class TestPathMatcher:
+    @pytest.mark.parametrize("pattern", MATCHER_PATTERNS)
+    def test_match(self, pattern: str) -> None:
+        compiled = re.compile(pattern)
+        matcher = PathMatcher(compiled)
+        for path in MATCHER_PATHS * 2:  # the second round is answered from the trie
+            expected = reference_path_matches(path, compiled)
+            assert matcher.match(path) == expected, path
+            assert matcher.match(Path(path)) == expected, path
+
+    def test_match__edgecases(self) -> None:
+        rng = random.Random(0)
+        paths = [
+            "/" * rng.randint(0, 1) + "/".join(rng.choices("abc", k=rng.randint(1, 5)))
+            for _ in range(300)
+        ]
+        for pattern in (r"a/b", r"^c", r"b$", r"(^|/)a(/|$)", r"c/a/", r"^/b"):
+            matcher = PathMatcher(re.compile(pattern))
+            for path in paths:
+                assert matcher.match(path) == reference_path_matches(path, re.compile(pattern))
+
+
+def test_path_matcher() -> None:
+    pattern = re.compile(r"utils")
+    assert path_matcher(pattern) is path_matcher(re.compile(r"utils"))
+    assert path_matcher(pattern).path_pattern is pattern
+    assert path_matcher(pattern) is not path_matcher(re.compile(r"other"))
+
+
 @pytest.mark.parametrize(
     "path, pattern, success",
     [
@@ -0,0 +1,92 @@
+import os
+from pathlib import Path
+from unittest.mock import patch
+
+from structlint.watch import changed_files, poll, scan_files, snapshot_workspace, watch
+from structlint.workspace import CHECKS, Workspace
+
+
+class FakeWorkspace:
+    def __init__(self) -> None:
+        self.cycle = 0
+        self.saved = 0
+        self.refreshed: list[set[str]] = []
+
+    def refresh(self, changed: set[str]) -> list[str]:
+        self.refreshed.append(changed)
+        self.cycle += bool(changed)
+        return ["tests"] if changed else []
+
+    def run(self, check: str) -> tuple[str, bool]:
+        return f"{check} report {self.cycle}", self.cycle == 0
+
+    def save(self) -> None:
+        self.saved += 1
+
+
+def test_scan_files(tmp_path: Path) -> None:
+    (tmp_path / "src" / "sub").mkdir(parents=True)
+    (tmp_path / "src" / "a.py").write_text("x = 1\n")
+    (tmp_path / "src" / "sub" / "b.py").write_text("")
+    (tmp_path / "src" / "notes.md").write_text("")
+    (tmp_path / "docs").mkdir()
+    (tmp_path / "docs" / "a.md").write_text("# a\n")
+
+    snapshot = scan_files(tmp_path, [(Path("src"), ".py"), (Path("docs"), ".md")])
+    assert sorted(snapshot) == ["docs/a.md", "src/a.py", "src/sub/b.py"]
+    stat = (tmp_path / "src" / "a.py").stat()
+    assert snapshot["src/a.py"] == (stat.st_mtime_ns, 6)
+    assert scan_files(tmp_path, [(Path("missing"), ".py")]) == {}
+
+
+def test_changed_files() -> None:
+    before = {"a.py": (1, 1), "b.py": (1, 1), "c.py": (1, 1)}
+    after = {"a.py": (1, 1), "b.py": (2, 1), "d.py": (1, 1)}
+    assert changed_files(before, after) == {"b.py", "c.py", "d.py"}
+    assert changed_files(after, after) == set()
+
+
+def test_snapshot_workspace() -> None:
+    snapshot = snapshot_workspace(Workspace(use_cache=False))
+    assert "pyproject.toml" in snapshot
+    assert os.path.join("src", "structlint", "watch.py") in snapshot
+    assert os.path.join("tests", "unit", "watch_test.py") in snapshot
+    assert os.path.join("docs", "md", "api", "watch.md") in snapshot
+
+
+def test_poll() -> None:
+    workspace = FakeWorkspace()
+    with patch("structlint.watch.snapshot_workspace", return_value={"a.py": (1, 1)}):
+        assert poll(workspace, {"a.py": (1, 1)}) == ({"a.py": (1, 1)}, [])  # type: ignore[arg-type]
+        assert poll(workspace, {}) == ({"a.py": (1, 1)}, ["tests"])  # type: ignore[arg-type]
+    assert workspace.refreshed == [set(), {"a.py"}]
+
+    snapshots = [{"pyproject.toml": (2, 1)}, {"pyproject.toml": (2, 1), "b.py": (1, 1)}]
+    with patch("structlint.watch.snapshot_workspace", side_effect=snapshots):
+        snapshot, _ = poll(workspace, {"pyproject.toml": (1, 1)})  # type: ignore[arg-type]
+    assert snapshot == snapshots[1]
+
+
+def test_watch() -> None:
+    workspace, echoed = FakeWorkspace(), []
+    snapshots = [{"a.py": (1, 1)}, {"a.py": (1, 1)}, {"a.py": (2, 1)}]
+    with (
+        patch("structlint.watch.snapshot_workspace", side_effect=snapshots),
+        patch("structlint.watch.time.sleep") as sleep,
+    ):
+        assert watch(workspace, echoed.append, interval=0.5, cycles=2)  # type: ignore[arg-type]
+    sleep.assert_called_with(0.5)
+    assert len(echoed) == 2
+    assert all(f"{check} report 0" in echoed[0] for check in CHECKS)
+    assert "- tests report 0" in echoed[1]
+    assert "+ tests report 1" in echoed[1]
+    assert "methods" not in echoed[1]
+    assert workspace.saved == 2
+
+    workspace, echoed = FakeWorkspace(), []
+    with (
+        patch("structlint.watch.snapshot_workspace", return_value={}),
+        patch("structlint.watch.time.sleep", side_effect=KeyboardInterrupt),
+    ):
+        assert watch(workspace, echoed.append)  # type: ignore[arg-type]
+    assert len(echoed) == 1
@@ -0,0 +1,143 @@
+import re
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from structlint.cache import ParseCache
+from structlint.collection import Objects
+from structlint.configuration import Configuration
+from structlint.utils import path_matcher
+from structlint.workspace import CHECKS, Workspace
+
+
+class TestWorkspace:
+    def test_cfg(self) -> None:
+        workspace = Workspace(use_cache=False, jobs=3)
+        assert workspace.cfg is workspace.cfg
+        assert workspace.cfg.jobs == 3
+        assert workspace.cfg.cache_dir == ""
+        assert Workspace().cfg.cache_dir
+
+    def test_cache(self) -> None:
+        workspace = Workspace(use_cache=False)
+        assert isinstance(workspace.cache, ParseCache)
+        assert workspace.cache is workspace.cache
+        assert workspace.cache.path is None
+        cfg = workspace.cfg
+        assert workspace.cache.salt == f"{cfg.parser}:{cfg.module_root_dir}:{cfg.tests.unit_dir}"
+
+        workspace.source_objects
+        source = workspace.cfg.module_root_dir / "workspace.py"
+        assert workspace.cache.get(source) is not None  # kept in memory without a cache path
+
+    def test_source_objects(self) -> None:
+        workspace = Workspace(use_cache=False)
+        assert workspace.source_objects is workspace.source_objects
+        assert any(str(k.path).endswith("workspace.py") for k in workspace.source_objects.keys())
+
+    def test_tests_objects(self) -> None:
+        workspace = Workspace(use_cache=False)
+        assert workspace.tests_objects is workspace.tests_objects
+        assert "TestWorkspace" in {k.name for k in workspace.tests_objects.classes_only}
+
+    def test_docs_objects(self) -> None:
+        workspace = Workspace(use_cache=False)
+        assert workspace.docs_objects is workspace.docs_objects
+        assert "Workspace" in {k.name for k in workspace.docs_objects.keys()}
+
+    def test_source_syntax(self) -> None:
+        workspace = Workspace(use_cache=False)
+        workspace.cfg.parser = "regex"
+        assert workspace.source_syntax is None
+        assert "source_objects" not in workspace._values
+
+        workspace.cfg.parser = "ast"
+        syntax = workspace.source_syntax
+        assert syntax is workspace.source_objects.syntax
+        assert any(m.module == "structlint.workspace" for m in syntax or ())
+
+    def test_module_syntax(self) -> None:
+        workspace = Workspace(use_cache=False)
+        workspace.cfg.parser = "ast"
+        assert workspace.module_syntax is workspace.source_syntax
+
+        workspace = Workspace(use_cache=False)
+        workspace.cfg.parser = "regex"
+        syntax = workspace.module_syntax
+        assert syntax is workspace.module_syntax
+        assert any(m.module == "structlint.workspace" for m in syntax)
+        assert workspace._values["syntax_cache"].get(workspace.cfg.module_root_dir / "cli.py")
+
+        assert workspace.refresh(["src/structlint/keys.py"]) == list(CHECKS)
+        assert workspace.module_syntax is not syntax
+
+    def test_graph(self) -> None:
+        workspace = Workspace(use_cache=False)
+        assert workspace.graph is workspace.graph
+        assert "structlint.workspace" in workspace.graph.modules
+
+    def test_closure_cache(self, tmp_path: Path) -> None:
+        workspace = Workspace(use_cache=False)
+        workspace.cfg.parser = "regex"
+        assert workspace.closure_cache is None
+
+        workspace = Workspace(use_cache=False)
+        workspace.cfg.parser = "ast"
+        cache = workspace.closure_cache
+        assert cache is workspace.closure_cache
+        assert cache is not None and cache.path is None
+        source = workspace.cfg.module_root_dir / "workspace.py"
+        assert cache.digests["structlint.workspace"] == workspace.cache.digest(source)
+
+        assert workspace.run("imports")[0]
+        assert workspace.refresh(["src/structlint/keys.py"]) == list(CHECKS)
+        assert "closure_cache" not in workspace._values
+
+    def test_refresh(self) -> None:
+        workspace = Workspace(use_cache=False)
+        objects = (workspace.source_objects, workspace.tests_objects, workspace.docs_objects)
+        matcher = path_matcher(re.compile("utils"))
+        assert workspace.refresh([]) == []
+        assert path_matcher(re.compile("utils")) is matcher
+        assert workspace.refresh(["README.md", "tests/unit/data.json"]) == []
+        assert workspace.source_objects is objects[0]
+        assert path_matcher(re.compile("utils")) is not matcher
+
+        assert workspace.refresh(["docs/md/api/keys.md"]) == ["docs"]
+        assert workspace.docs_objects is not objects[2]
+        assert workspace.refresh(["tests/unit/keys_test.py"]) == ["tests"]
+        assert workspace.tests_objects is not objects[1]
+
+        cfg = workspace.cfg
+        assert workspace.refresh(["src/structlint/keys.py"]) == list(CHECKS)
+        assert workspace.source_objects is not objects[0]
+        assert workspace.cfg is cfg
+        assert workspace.refresh(["pyproject.toml"]) == list(CHECKS)
+        assert workspace.cfg is not cfg
+
+    def test_run(self) -> None:
+        workspace = Workspace(use_cache=False)
+        for check, heading in zip(CHECKS, ("METHOD ORDER", "DOCUMENTATION", "TESTS")):
+            assert heading in workspace.run(check)[0]
+        report, problems = workspace.run("cycles")
+        assert "No problems detected." in report
+        assert not problems
+
+        with pytest.raises(ValueError, match="Unknown check 'nope'"):
+            workspace.run("nope")
+
+    def test_save(self, tmp_path: Path) -> None:
+        workspace = Workspace(use_cache=False)
+        workspace.save()  # nothing collected, nothing to save
+
+        cfg = Configuration.read(use_cache=False).merge(cache_dir=tmp_path)
+        with patch.object(Configuration, "read", return_value=cfg):
+            workspace = Workspace()
+            workspace.source_objects
+            workspace.cfg.parser = "regex"
+            workspace.module_syntax
+            workspace.save()
+        assert (tmp_path / "parse.json").exists()
+        assert (tmp_path / "syntax.json").exists()
+        assert isinstance(workspace.source_objects, Objects)